@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from benchmarks.cases import CASES
+
+
+def commit():
+    """Returns the current git commit, or None outside of a git checkout."""
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, params, repeat):
+    """Runs a benchmark, returning its best throughput and the peak memory of one run."""
+    setup = func(**params)
+
+    best = None
+    operations = 0
+    for _ in range(repeat):
+        run = setup()
+        start = time.perf_counter()
+        operations = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    run = setup()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "operations": operations,
+        "ops_per_second": operations / best if best else None,
+        "peak_bytes": peak,
+    }
+
+
+def key(result):
+    """Returns a key identifying a benchmark and its parameters."""
+    return (result["name"],) + tuple(sorted(result["params"].items()))
+
+
+def label(result):
+    """Returns a readable name for a benchmark and its parameters."""
+    params = ",".join(
+        "{}={}".format(name, value) for name, value in sorted(result["params"].items())
+    )
+    return "{}[{}]".format(result["name"], params)
+
+
+def run(args):
+    results = []
+    for name, params, func in CASES:
+        if args.filter and args.filter not in name:
+            continue
+        sizes = func.params.get("size", ())
+        if args.quick and len(sizes) > 1 and params["size"] == max(sizes):
+            continue
+        result = dict(name=name, params=params, **measure(func, params, args.repeat))
+        results.append(result)
+        print(
+            "{:<60} {:>14,.0f} ops/s {:>12,} bytes".format(
+                label(result), result["ops_per_second"], result["peak_bytes"]
+            )
+        )
+
+    os.makedirs(args.output, exist_ok=True)
+    revision = commit() or "working"
+    path = os.path.join(args.output, "{}.json".format(revision))
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "commit": revision,
+                "python": platform.python_version(),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print("Results written to {}".format(path))
+
+
+def compare(args):
+    with open(args.compare[0]) as file:
+        base = {key(result): result for result in json.load(file)["results"]}
+    with open(args.compare[1]) as file:
+        head = json.load(file)["results"]
+
+    regressions = 0
+    for result in head:
+        previous = base.get(key(result))
+        if previous is None or not previous["ops_per_second"]:
+            continue
+        ratio = result["ops_per_second"] / previous["ops_per_second"]
+        regressed = ratio < 1 - args.threshold
+        regressions += regressed
+        print(
+            "{:<60} {:>8.2f}x speed {:>8.2f}x memory{}".format(
+                label(result),
+                ratio,
+                result["peak_bytes"] / max(previous["peak_bytes"], 1),
+                "  REGRESSION" if regressed else "",
+            )
+        )
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks for the gridable hot paths."
+    )
+    parser.add_argument("--output", default=".benchmarks", help="results directory")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark")
+    parser.add_argument("--filter", help="only run benchmarks containing this name")
+    parser.add_argument(
+        "--quick", action="store_true", help="skip the largest grid sizes"
+    )
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two result files"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown reported as a regression when comparing",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(args)
+    run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
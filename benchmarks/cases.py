@@ -0,0 +1,214 @@
+import itertools
+import random
+import threading
+
+from gridable import Grid
+
+CASES = []
+
+
+def benchmark(**params):
+    """Registers a benchmark to be run with every combination of the given parameter values.
+    The decorated function receives the parameters and returns a setup function, which
+    prepares state and returns a callable running the measured work and returning its
+    number of operations."""
+
+    def register(func):
+        func.params = params
+        names = sorted(params)
+        for values in itertools.product(*[params[name] for name in names]):
+            CASES.append((func.__name__, dict(zip(names, values)), func))
+        return func
+
+    return register
+
+
+def populated(size, dimensions, density, seed=0):
+    """Returns distinct coordinates spread over a hypercube filled to the given density."""
+    side = max(int(round((size / density) ** (1 / dimensions))), 1)
+    while side**dimensions < size:
+        side += 1
+    generator = random.Random(seed)
+    coordinates = set()
+    while len(coordinates) < size:
+        coordinates.add(tuple(generator.randrange(side) for _ in range(dimensions)))
+    return sorted(coordinates)
+
+
+def filled(coordinates, **kwargs):
+    """Returns a grid holding a value at each of the coordinates."""
+    grid = Grid(**kwargs)
+    grid.update((location, 1) for location in coordinates)
+    return grid
+
+
+def cell(grid, coordinates):
+    """Returns the cell at the coordinates, indexing one dimension at a time."""
+    for index in coordinates:
+        grid = grid[index]
+    return grid
+
+
+SHAPES = dict(size=(1000, 10000), dimensions=(1, 2, 3), density=(1.0, 0.01))
+
+
+@benchmark(**SHAPES)
+def setitem(size, dimensions, density):
+    coordinates = populated(size, dimensions, density)
+
+    def setup():
+        grid = Grid()
+
+        def run():
+            for location in coordinates:
+                cell(grid, location[:-1])[location[-1]] = 1
+            return len(coordinates)
+
+        return run
+
+    return setup
+
+
+@benchmark(**SHAPES)
+def update(size, dimensions, density):
+    coordinates = populated(size, dimensions, density)
+
+    def setup():
+        grid = Grid()
+
+        def run():
+            grid.update((location, 1) for location in coordinates)
+            return len(coordinates)
+
+        return run
+
+    return setup
+
+
+@benchmark(**SHAPES)
+def value(size, dimensions, density):
+    coordinates = populated(size, dimensions, density)
+    grid = filled(coordinates)
+
+    def setup():
+        def run():
+            for location in coordinates:
+                cell(grid, location).value()
+            return len(coordinates)
+
+        return run
+
+    return setup
+
+
+@benchmark(**SHAPES)
+def iterate(size, dimensions, density):
+    grid = filled(populated(size, dimensions, density))
+
+    def setup():
+        def run():
+            count = 0
+            for item in grid:
+                item.value()
+                count += 1
+            return count
+
+        return run
+
+    return setup
+
+
+@benchmark(size=(1000, 10000), density=(1.0, 0.01))
+def slicing(size, density):
+    coordinates = populated(size, 2, density)
+    grid = filled(coordinates)
+    rows = sorted({location[0] for location in coordinates})
+
+    def setup():
+        def run():
+            count = 0
+            for row in rows:
+                for item in grid[row][0:]:
+                    count += 1
+            return count
+
+        return run
+
+    return setup
+
+
+@benchmark(**SHAPES)
+def query(size, dimensions, density):
+    grid = filled(populated(size, dimensions, density))
+
+    def setup():
+        def run():
+            query = grid.where(lambda value: value > 0).map(lambda value: value * 2)
+            return sum(1 for _ in query)
+
+        return run
+
+    return setup
+
+
+@benchmark(**SHAPES)
+def overlay(size, dimensions, density):
+    first = filled(populated(size, dimensions, density))
+    second = filled(populated(size, dimensions, density, seed=1))
+
+    def setup():
+        def run():
+            return sum(1 for _ in first + second)
+
+        return run
+
+    return setup
+
+
+@benchmark(size=(1000,), dimensions=(2, 3), density=(1.0, 0.01))
+def neighbors(size, dimensions, density):
+    coordinates = populated(size, dimensions, density)
+    grid = filled(coordinates)
+
+    def setup():
+        def run():
+            count = 0
+            for location in coordinates:
+                count += len(list(cell(grid, location).neighbors()))
+            return count
+
+        return run
+
+    return setup
+
+
+@benchmark(threads=(1, 4), stripes=(1, 16), writers=(0.1, 0.9))
+def contention(threads, stripes, writers):
+    operations = 20000 // threads
+
+    def setup():
+        grid = filled(populated(1000, 2, 1.0), stripes=stripes)
+        rows = list(range(32))
+
+        def work(seed):
+            generator = random.Random(seed)
+            for _ in range(operations):
+                row = generator.choice(rows)
+                if generator.random() < writers:
+                    grid[row][generator.randrange(32)] = seed
+                else:
+                    grid[row][generator.randrange(32)].value()
+
+        def run():
+            workers = [
+                threading.Thread(target=work, args=(seed,)) for seed in range(threads)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            return operations * threads
+
+        return run
+
+    return setup
@@ -1,3 +1,11 @@
-from gridable.threadlock import GridModifyLock, GridReadLock
-
-from gridable.grid import Grid
+from gridable.grid import Grid, Snapshot
+from gridable.aio import AsyncGrid
+from gridable.storage import FlatStorage, NestedStorage
+from gridable.tiled import TiledStorage
+from gridable.typed import TypedStorage
+from gridable.threadlock import (
+    GridLock,
+    GridModifyItemLock,
+    GridModifyLock,
+    GridReadLock,
+)
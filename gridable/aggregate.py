@@ -0,0 +1,123 @@
+import numbers
+import threading
+
+OPERATIONS = ("sum", "count", "mean", "min", "max")
+
+
+def _numeric(value):
+    """Returns a boolean indicating if a value is included in aggregations. Only real numbers
+    can be ordered, and booleans are treated as flags rather than numbers."""
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+class Summary:
+    """Running count, total, minimum and maximum of numeric values. Removing the minimum or
+    maximum marks the summary stale until it is rebuilt from the values."""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "stale")
+
+    def __init__(self, values=()):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.stale = False
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        """Includes a value in the summary, ignoring values that aren't numeric."""
+        if not _numeric(value):
+            return
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def remove(self, value):
+        """Excludes a value previously included in the summary."""
+        if not _numeric(value):
+            return
+        self.count -= 1
+        self.total -= value
+        if self.count == 0:
+            self.total = 0
+            self.minimum = self.maximum = None
+            self.stale = False
+        elif value == self.minimum or value == self.maximum:
+            self.stale = True
+
+    def merge(self, other):
+        """Includes the values of another summary in the summary."""
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.total += other.total
+        if self.minimum is None or other.minimum < self.minimum:
+            self.minimum = other.minimum
+        if self.maximum is None or other.maximum > self.maximum:
+            self.maximum = other.maximum
+
+    def result(self, operation):
+        """Returns the result of an operation over the summarized values, or None for the
+        mean, minimum and maximum of no values."""
+        if operation == "sum":
+            return self.total
+        if operation == "count":
+            return self.count
+        if operation == "mean":
+            return self.total / self.count if self.count else None
+        if operation == "min":
+            return self.minimum
+        if operation == "max":
+            return self.maximum
+        raise Exception("Unknown aggregation {}".format(operation))
+
+
+class RowAggregates:
+    """Summaries of the numeric values below each top-level index of a grid, maintained as
+    the grid is modified."""
+
+    def __init__(self, storage=None):
+        self._rows = {}
+        self._mutex = threading.Lock()
+        if storage is not None:
+            for coordinates, value in storage.items():
+                self._set(coordinates, None, value)
+
+    def _set(self, coordinates, old, value):
+        """Records a value stored at the coordinates, replacing the old value."""
+        with self._mutex:
+            summary = self._rows.get(coordinates[0])
+            if summary is None:
+                summary = self._rows[coordinates[0]] = Summary()
+            if old is not None:
+                summary.remove(old)
+            summary.add(value)
+
+    def _delete(self, coordinates, removed):
+        """Records the coordinate and value pairs being deleted."""
+        with self._mutex:
+            for location, value in removed:
+                summary = self._rows.get(location[0])
+                if summary is not None:
+                    summary.remove(value)
+
+    def summary(self, index, storage):
+        """Returns the summary of a top-level index, rebuilding it from the storage if stale."""
+        with self._mutex:
+            summary = self._rows.get(index)
+            if summary is None:
+                return Summary()
+            if summary.stale:
+                summary = self._rows[index] = Summary(
+                    value for _, value in storage.items((index,))
+                )
+            return summary
+
+    def indices(self):
+        """Returns the top-level indices holding summaries."""
+        with self._mutex:
+            return list(self._rows)
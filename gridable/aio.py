@@ -0,0 +1,163 @@
+import asyncio
+from gridable.export import chunks
+from gridable.grid import Cell, Grid, _as_coordinates
+
+try:
+    _current_task = asyncio.current_task
+except AttributeError:
+    _current_task = asyncio.Task.current_task
+
+
+class AsyncGridLock:
+    """Reader/writer lock for coroutines sharing a grid, waiting on the event loop rather than
+    blocking its thread. Waiting writers take preference over new readers, and locks are
+    reentrant for the task holding them."""
+
+    def __init__(self):
+        self._condition = None
+        self._readers = {}
+        self._writer = None
+        self._writes = 0
+        self._waiting_writers = 0
+
+    def _waiter(self):
+        """Returns the condition coroutines wait on, created within the running event loop."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire_read(self):
+        """Acquires the lock for reading, waiting while writers are active or waiting."""
+        task = _current_task()
+        if task is self._writer or task in self._readers:
+            self._readers[task] = self._readers.get(task, 0) + 1
+            return
+
+        async with self._waiter():
+            await self._condition.wait_for(
+                lambda: self._writer is None and not self._waiting_writers
+            )
+            self._readers[task] = 1
+
+    async def release_read(self):
+        """Releases the lock for reading."""
+        task = _current_task()
+        self._readers[task] -= 1
+        if self._readers[task]:
+            return
+
+        del self._readers[task]
+        async with self._waiter():
+            self._condition.notify_all()
+
+    async def acquire_write(self):
+        """Acquires the lock for writing, waiting while readers or another writer are active."""
+        task = _current_task()
+        if task is self._writer:
+            self._writes += 1
+            return
+        if task in self._readers:
+            raise Exception("Cannot modify the grid while reading it")
+
+        async with self._waiter():
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: self._writer is None and not self._readers
+                )
+            finally:
+                self._waiting_writers -= 1
+            self._writer = task
+            self._writes = 1
+
+    async def release_write(self):
+        """Releases the lock for writing."""
+        self._writes -= 1
+        if self._writes:
+            return
+
+        self._writer = None
+        async with self._waiter():
+            self._condition.notify_all()
+
+
+class _Held:
+    """Asynchronous context manager holding an async grid lock for reading or writing."""
+
+    def __init__(self, grid, acquire, release):
+        self._grid = grid
+        self._acquire = acquire
+        self._release = release
+
+    async def __aenter__(self):
+        await self._acquire()
+        return self._grid
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._release()
+        return False
+
+
+class AsyncGrid:
+    """Wraps a grid for use from coroutines. Coroutines wait for each other on the event
+    loop, and each operation runs on an executor thread, taking the grid's own lock there,
+    so the grid can still be shared with threads outside of the loop without blocking it.
+    Grids held through read() and write() are used directly on the loop thread."""
+
+    def __init__(self, grid=None, batch=1000):
+        self.grid = grid if grid is not None else Grid()
+        self._lock = AsyncGridLock()
+        self._batch = batch
+
+    def read(self):
+        """Holds the lock for reading, so that other coroutines can't modify the grid."""
+        return _Held(self.grid, self._lock.acquire_read, self._lock.release_read)
+
+    def write(self):
+        """Holds the lock for writing, so that other coroutines can't read or modify the
+        grid."""
+        return _Held(self.grid, self._lock.acquire_write, self._lock.release_write)
+
+    def _run(self, func, *args):
+        """Returns a future running a function on an executor thread, so that waiting for the
+        grid's own lock doesn't block the event loop."""
+        return asyncio.get_event_loop().run_in_executor(None, func, *args)
+
+    async def aget(self, coordinates):
+        """Returns the value stored at the coordinates, or None."""
+        async with self.read():
+            return await self._run(Cell(self.grid, _as_coordinates(coordinates)).value)
+
+    async def aset(self, coordinates, value):
+        """Stores a value at the coordinates."""
+        async with self.write():
+            await self._run(self.grid.update, [(_as_coordinates(coordinates), value)])
+
+    async def adelete(self, coordinates):
+        """Deletes the value or nested cells at the coordinates."""
+        coordinates = _as_coordinates(coordinates)
+        async with self.write():
+            await self._run(
+                Cell(self.grid, coordinates[:-1]).__delitem__, coordinates[-1]
+            )
+
+    async def aupdate(self, items):
+        """Stores an iterable of coordinate and value pairs in batches, giving other tasks
+        a turn between batches while holding the lock for writing."""
+        async with self.write():
+            for batch in chunks(items, self._batch):
+                await self._run(self.grid.update, batch)
+
+    async def aiter(self, coordinates=()):
+        """Creates an asynchronous generator of the cells with values at or below the
+        coordinates. Cells are read from a snapshot, giving other tasks a turn between
+        batches without holding any lock."""
+        async with self.read():
+            snapshot = await self._run(self.grid.snapshot)
+
+        for count, cell in enumerate(
+            Cell(snapshot, _as_coordinates(coordinates)), start=1
+        ):
+            yield cell
+            if count % self._batch == 0:
+                await asyncio.sleep(0)
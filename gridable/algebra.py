@@ -0,0 +1,47 @@
+import operator
+
+_MISSING = object()
+
+
+def identity(value):
+    """Returns a value unchanged."""
+    return value
+
+
+# Functions applied to the values held by both grids, by only the first grid, and by only
+# the second grid for each arithmetic operator. Cells missing from one grid are treated as
+# zero by addition and subtraction, while multiplication and division only keep the cells
+# held by both grids.
+OPERATORS = {
+    "add": (operator.add, identity, identity),
+    "sub": (operator.sub, identity, operator.neg),
+    "mul": (operator.mul, None, None),
+    "truediv": (operator.truediv, None, None),
+    "floordiv": (operator.floordiv, None, None),
+}
+
+
+def merge(items, other, both=None, left=None, right=None):
+    """Creates a generator of coordinate and value pairs merging an iterable of pairs with a
+    dict of coordinates to values, which is consumed. Functions map the values held by both,
+    by the first only or by the second only, and other cells are dropped."""
+    for coordinates, value in items:
+        match = other.pop(coordinates, _MISSING)
+        if match is _MISSING:
+            if left is not None:
+                yield (coordinates, left(value))
+        elif both is not None:
+            yield (coordinates, both(value, match))
+    if right is not None:
+        for coordinates, value in other.items():
+            yield (coordinates, right(value))
+
+
+def first(value, other):
+    """Returns the first of two values."""
+    return value
+
+
+def masked(value, mask):
+    """Returns a value when its mask is truthy, or None."""
+    return value if mask else None
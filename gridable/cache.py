@@ -0,0 +1,144 @@
+import collections
+import threading
+
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "invalidations", "size", "maxsize"]
+)
+
+# Regions no wider than this along the first dimension are registered with each of their
+# top-level indices, so that a write only checks the entries that may depend on it.
+_NARROW = 64
+
+
+def freeze(bounds):
+    """Returns bounds as nested tuples, so that they can be part of a key."""
+    if bounds is None:
+        return None
+    return tuple(tuple(bound) if bound is not None else None for bound in bounds)
+
+
+class Region:
+    """The cells a cached result depends on, below a coordinate prefix and within inclusive
+    (start, stop) bounds of the following dimensions, which may be None."""
+
+    __slots__ = ("prefix", "bounds")
+
+    def __init__(self, prefix=(), bounds=()):
+        self.prefix = prefix
+        self.bounds = bounds or ()
+
+    def contains(self, coordinates):
+        """Returns a boolean indicating if a write at the coordinates, replacing any cells
+        nested below them, may change the cells of the region."""
+        prefix = self.prefix
+        depth = min(len(coordinates), len(prefix))
+        if coordinates[:depth] != prefix[:depth]:
+            return False
+        for dimension, bound in enumerate(self.bounds, start=len(prefix)):
+            if dimension >= len(coordinates):
+                break
+            if bound is not None and not bound[0] <= coordinates[dimension] <= bound[1]:
+                return False
+        return True
+
+    def rows(self):
+        """Returns the top-level indices of the region, or None when there are too many."""
+        if self.prefix:
+            return (self.prefix[0],)
+        if self.bounds and self.bounds[0] is not None:
+            start, stop = self.bounds[0]
+            if isinstance(start, int) and isinstance(stop, int):
+                if stop - start < _NARROW:
+                    return range(start, stop + 1)
+        return None
+
+
+class QueryCache:
+    """Least recently used cache of query results, each invalidated by writes to the region
+    of the grid it was computed from."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = max(maxsize, 1)
+        self._entries = collections.OrderedDict()
+        self._rows = {}
+        self._wide = set()
+        self._mutex = threading.Lock()
+        self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    def get(self, key, default=None):
+        """Returns the cached result of a query, or the default."""
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key, result, region):
+        """Caches the result of a query, evicting the least recently used results."""
+        with self._mutex:
+            if key in self._entries:
+                return
+            self._entries[key] = (result, region)
+            rows = region.rows()
+            if rows is None:
+                self._wide.add(key)
+            else:
+                for row in rows:
+                    self._rows.setdefault(row, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key):
+        """Removes a cached result."""
+        _, region = self._entries.pop(key)
+        rows = region.rows()
+        if rows is None:
+            self._wide.discard(key)
+            return
+        for row in rows:
+            keys = self._rows[row]
+            keys.discard(key)
+            if not keys:
+                del self._rows[row]
+
+    def _invalidate(self, coordinates):
+        """Removes the cached results whose region holds the coordinates."""
+        with self._mutex:
+            candidates = list(self._wide)
+            candidates.extend(self._rows.get(coordinates[0], ()))
+            for key in candidates:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1].contains(coordinates):
+                    self._remove(key)
+                    self._invalidations += 1
+
+    def _set(self, coordinates, old, value):
+        """Invalidates the results depending on a value stored at the coordinates."""
+        self._invalidate(coordinates)
+
+    def _delete(self, coordinates, removed):
+        """Invalidates the results depending on the cells deleted at the coordinates."""
+        self._invalidate(coordinates)
+
+    def clear(self):
+        """Removes every cached result."""
+        with self._mutex:
+            self._entries.clear()
+            self._rows.clear()
+            self._wide.clear()
+
+    def info(self):
+        """Returns the hits, misses, evictions, invalidations and size of the cache."""
+        with self._mutex:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._invalidations,
+                len(self._entries),
+                self.maxsize,
+            )
@@ -0,0 +1,175 @@
+import numbers
+import weakref
+from gridable.storage import Storage
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class DenseRegion:
+    """A rectangular block of cells stored contiguously in a NumPy array."""
+
+    def __init__(self, bounds, dtype=float, fill=0):
+        if numpy is None:
+            raise ImportError("NumPy is required for dense regions")
+        self.bounds = tuple((start, stop) for (start, stop) in bounds)
+        if any(stop < start for (start, stop) in self.bounds):
+            raise Exception("Invalid region bounds")
+        self.array = numpy.full(
+            [stop - start + 1 for (start, stop) in self.bounds], fill, dtype=dtype
+        )
+        self._sharing = weakref.WeakSet()
+
+    def share(self):
+        """Returns a region with the same bounds sharing the array, until this region is next
+        modified through its storage."""
+        region = DenseRegion.__new__(DenseRegion)
+        region.bounds = self.bounds
+        region.array = self.array
+        region._sharing = weakref.WeakSet()
+        self._sharing.add(region)
+        return region
+
+    def unshare(self):
+        """Gives the regions sharing the array a copy of it, before the array is modified."""
+        if self._sharing:
+            array = self.array.copy()
+            for region in self._sharing:
+                region.array = array
+            self._sharing = weakref.WeakSet()
+
+    def contains(self, coordinates):
+        """Returns a boolean indicating if the coordinates address a cell of the region."""
+        return len(coordinates) == len(self.bounds) and self.covers(coordinates)
+
+    def covers(self, coordinates):
+        """Returns a boolean indicating if the coordinates fall within the region bounds."""
+        if len(coordinates) > len(self.bounds):
+            return False
+        for index, (start, stop) in zip(coordinates, self.bounds):
+            if not isinstance(index, numbers.Integral) or not start <= index <= stop:
+                return False
+        return True
+
+    def overlaps(self, other):
+        """Returns a boolean indicating if the bounds of two regions intersect."""
+        return all(
+            start <= other_stop and other_start <= stop
+            for (start, stop), (other_start, other_stop) in zip(
+                self.bounds, other.bounds
+            )
+        )
+
+    def offset(self, coordinates):
+        """Returns the array index of the cell at the coordinates."""
+        return tuple(
+            index - start for index, (start, _) in zip(coordinates, self.bounds)
+        )
+
+    def keys(self, coordinates):
+        """Returns the indices of the region nested directly below the coordinates."""
+        start, stop = self.bounds[len(coordinates)]
+        return range(start, stop + 1)
+
+
+class MixedStorage(Storage):
+    """Stores dense regions in NumPy arrays, and all other values in a sparse storage.
+
+    Snapshots share the arrays of the dense regions, each copied for the snapshots on the
+    first write to the region while they are alive."""
+
+    def __init__(self, sparse):
+        self._sparse = sparse
+        self._regions = []
+
+    @property
+    def shares_snapshots(self):
+        return self._sparse.shares_snapshots
+
+    def add_region(self, bounds, dtype=float, fill=0):
+        """Creates a dense region, moving any values already stored within it into its array
+        once they have all been converted to its dtype."""
+        region = DenseRegion(bounds, dtype, fill)
+        if any(region.overlaps(other) for other in self._regions):
+            raise Exception("Dense regions cannot overlap")
+
+        existing = [
+            (coordinates, value)
+            for coordinates, value in self._sparse.items()
+            if region.covers(coordinates[: len(region.bounds)])
+        ]
+        for coordinates, value in existing:
+            if not region.contains(coordinates):
+                raise Exception("Not subscriptable")
+        for coordinates, value in existing:
+            region.array[region.offset(coordinates)] = value
+        for coordinates, value in existing:
+            self._sparse.delete(coordinates)
+
+        self._regions.append(region)
+        return region
+
+    def snapshot(self):
+        snapshot = MixedStorage(self._sparse.snapshot())
+        snapshot._regions = [region.share() for region in self._regions]
+        return snapshot
+
+    def _region(self, coordinates):
+        """Returns the region covering the coordinates, or None."""
+        for region in self._regions:
+            if region.covers(coordinates):
+                return region
+        return None
+
+    def value(self, coordinates):
+        region = self._region(coordinates)
+        if region is None:
+            return self._sparse.value(coordinates)
+        if not region.contains(coordinates):
+            return None
+        return region.array[region.offset(coordinates)].item()
+
+    def is_node(self, coordinates):
+        region = self._region(coordinates)
+        if region is None:
+            return self._sparse.is_node(coordinates)
+        return not region.contains(coordinates)
+
+    def keys(self, coordinates):
+        keys = dict.fromkeys(self._sparse.keys(coordinates))
+        for region in self._regions:
+            if len(coordinates) < len(region.bounds) and region.covers(coordinates):
+                keys.update(dict.fromkeys(region.keys(coordinates)))
+        return keys.keys()
+
+    def content(self, coordinates):
+        if self.is_node(coordinates):
+            return {
+                index: self.content(coordinates + (index,))
+                for index in self.keys(coordinates)
+            }
+        return self.value(coordinates)
+
+    def set(self, coordinates, value):
+        region = self._region(coordinates)
+        if region is None:
+            if any(
+                other.covers(coordinates[: len(other.bounds)])
+                for other in self._regions
+            ):
+                raise Exception("Not subscriptable")
+            self._sparse.set(coordinates, value)
+        elif region.contains(coordinates):
+            if value is None:
+                raise Exception("Dense regions cannot store None")
+            region.unshare()
+            region.array[region.offset(coordinates)] = value
+        else:
+            raise Exception("Cannot replace the cells of a dense region")
+
+    def delete(self, coordinates):
+        if self._region(coordinates) is not None:
+            raise Exception("Cannot delete the cells of a dense region")
+        self._sparse.delete(coordinates)
@@ -0,0 +1,161 @@
+import contextlib
+import csv
+import itertools
+import json
+import os
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+# Exports are streams of rows holding the coordinates and value of each stored cell. Rows
+# are written and read in chunks, so memory use is bounded by the chunk size rather than
+# the size of the grid.
+
+
+def chunks(items, size):
+    """Creates a generator of lists holding up to size items each."""
+    if size < 1:
+        raise Exception("Invalid chunk size")
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parse(text):
+    """Returns text read from a CSV file as an integer or float, when possible."""
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def write_csv(items, file, chunk_size):
+    """Writes rows of coordinates followed by the value to a text file."""
+    writer = csv.writer(file)
+    for chunk in chunks(items, chunk_size):
+        writer.writerows(coordinates + (value,) for coordinates, value in chunk)
+
+
+def read_csv(file, chunk_size):
+    """Creates a generator of chunks of coordinate and value pairs read from a text file."""
+    rows = (
+        (tuple(_parse(index) for index in row[:-1]), _parse(row[-1]))
+        for row in csv.reader(file)
+        if row
+    )
+    yield from chunks(rows, chunk_size)
+
+
+def write_ndjson(items, file, chunk_size):
+    """Writes a JSON object holding the coordinates and value of each item per line."""
+    for chunk in chunks(items, chunk_size):
+        file.write(
+            "".join(
+                json.dumps({"coordinates": coordinates, "value": value}) + "\n"
+                for coordinates, value in chunk
+            )
+        )
+
+
+def read_ndjson(file, chunk_size):
+    """Creates a generator of chunks of coordinate and value pairs read from JSON lines."""
+    rows = (json.loads(line) for line in file if line.strip())
+    yield from chunks(
+        ((tuple(row["coordinates"]), row["value"]) for row in rows), chunk_size
+    )
+
+
+def write_arrow(items, file, chunk_size):
+    """Writes record batches with coordinates and value columns to an Arrow IPC stream."""
+    if pyarrow is None:
+        raise ImportError("PyArrow is required for Arrow exports")
+    writer = schema = None
+    try:
+        for chunk in chunks(items, chunk_size):
+            coordinates = [list(coordinates) for coordinates, _ in chunk]
+            values = [value for _, value in chunk]
+            if writer is None:
+                batch = pyarrow.record_batch(
+                    [pyarrow.array(coordinates), pyarrow.array(values)],
+                    names=["coordinates", "value"],
+                )
+                schema = batch.schema
+                writer = pyarrow.ipc.new_stream(file, schema)
+            else:
+                batch = pyarrow.record_batch(
+                    [
+                        pyarrow.array(coordinates, schema.field(0).type),
+                        pyarrow.array(values, schema.field(1).type),
+                    ],
+                    schema=schema,
+                )
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def read_arrow(file, chunk_size):
+    """Creates a generator of chunks of coordinate and value pairs read from an Arrow IPC
+    stream."""
+    if pyarrow is None:
+        raise ImportError("PyArrow is required for Arrow imports")
+    for batch in pyarrow.ipc.open_stream(file):
+        for start in range(0, batch.num_rows, chunk_size):
+            part = batch.slice(start, chunk_size)
+            yield [
+                (tuple(coordinates), value)
+                for coordinates, value in zip(
+                    part.column(0).to_pylist(), part.column(1).to_pylist()
+                )
+            ]
+
+
+FORMATS = {
+    "csv": (write_csv, read_csv, ""),
+    "ndjson": (write_ndjson, read_ndjson, ""),
+    "arrow": (write_arrow, read_arrow, "b"),
+}
+
+
+def _format(name):
+    """Returns the writer, reader and file mode of a format."""
+    if name not in FORMATS:
+        raise Exception("Unknown format {}".format(name))
+    return FORMATS[name]
+
+
+@contextlib.contextmanager
+def _unclosed(file):
+    """Context yielding an open file object, which is left open."""
+    yield file
+
+
+def _open(file, mode):
+    """Returns a context opening a path, or leaving an open file object as is."""
+    if isinstance(file, (str, bytes, os.PathLike)):
+        return open(file, mode, newline="" if "b" not in mode else None)
+    return _unclosed(file)
+
+
+def export(items, file, format="csv", chunk_size=10000):
+    """Writes coordinate and value pairs to a path or file object in the given format."""
+    write, _, binary = _format(format)
+    with _open(file, "w" + binary) as output:
+        write(items, output, chunk_size)
+
+
+def load(file, format="csv", chunk_size=10000):
+    """Creates a generator of chunks of coordinate and value pairs read from a path or file
+    object in the given format."""
+    _, read, binary = _format(format)
+    with _open(file, "r" + binary) as source:
+        yield from read(source, chunk_size)
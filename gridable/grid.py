@@ -1,59 +1,122 @@
-from gridable.threadlock import GridModifyLock, GridReadLock
+from gridable.threadlock import (
+    GridLock,
+    GridModifyItemLock,
+    GridModifyLock,
+    GridReadLock,
+    NullLock,
+)
 import functools
-from collections.abc import Iterable
+import itertools
+import operator
+from collections.abc import Iterable, Sized
+from gridable.storage import NestedStorage
+from gridable.typed import TypedStorage
+from gridable.dense import MixedStorage
+from gridable.index import SpatialIndex
+from gridable.aggregate import OPERATIONS, RowAggregates, Summary
+from gridable.query import Query
+from gridable.journal import Journal
+from gridable.transaction import DELETED, Transaction
+from gridable.cache import QueryCache, Region, freeze
+from gridable.values import ValueIndex, hashable
+from gridable.stats import InstrumentedLock, InstrumentedStorage, Stats
+from gridable import algebra, export, interop, parallel, path, persist, stencil
+
+_MISSING = object()
+
+
+def _flatten(coordinates, value):
+    """Creates a generator of coordinate and value pairs, placing the items of iterable values
+    into an inner dimension."""
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    if isinstance(value, Iterable) and not isinstance(value, (str, bytes)):
+        for index, inner in enumerate(value):
+            yield from _flatten(coordinates + (index,), inner)
+    else:
+        yield (coordinates, value)
+
+
+def _as_coordinates(index):
+    """Returns a coordinate tuple from a tuple, an iterable of indices, or a single index."""
+    if isinstance(index, tuple):
+        return index
+    if hasattr(index, "tolist"):
+        index = index.tolist()
+    return tuple(index) if isinstance(index, Iterable) else (index,)
+
+
+def _location(cell):
+    """Returns the coordinates of a cell, or coordinates given in any supported form."""
+    return cell._coordinates if isinstance(cell, Cell) else _as_coordinates(cell)
+
+
+def _build(items):
+    """Returns a new grid holding an iterable of coordinate and value pairs, skipping values
+    of None."""
+    grid = Grid()
+    grid._storage.update(item for item in items if item[1] is not None)
+    return grid
 
 
 class Cell:
-    """Class representing a location or span in the grid."""
+    """Class representing a location or span in the grid. Cells keep the storage node of
+    their parent, so repeated reads skip resolving it from the root."""
 
-    def __init__(self, _root, _coordinates=()):
-        self._root = _root
+    __slots__ = ("_grid", "_coordinates", "_parent")
+
+    def __init__(self, _grid, _coordinates=(), _parent=None):
+        self._grid = _grid
         self._coordinates = _coordinates
+        self._parent = _parent
 
-    @GridModifyLock
+    @GridModifyItemLock
     def __setitem__(self, index, value):
         """Sets the content of a grid cell."""
-        if isinstance(value, Iterable):
+        if not isinstance(value, Iterable) or isinstance(value, (str, bytes)):
+            self._grid._set(self._coordinates + (index,), value)
 
-            if isinstance(index, slice):
-                step = index.step or 1
-                start = index.start or index.stop - (len(value) * step) + 1
-                stop = index.stop or index.start + (len(value) * step) - 1
+        elif isinstance(index, slice):
+            step = index.step or 1
+            start = (
+                index.start
+                if index.start is not None
+                else index.stop - (len(value) * step) + 1
+            )
+            stop = (
+                index.stop
+                if index.stop is not None
+                else start + (len(value) * step) - 1
+            )
 
-                if (stop - start) / step + 1 != len(value):
-                    raise Exception(
-                        "Invalid slice size",
-                    )
+            if (stop - start) / step + 1 != len(value):
+                raise Exception(
+                    "Invalid slice size",
+                )
 
-                for (source_index, destination_index) in enumerate(
-                    range(
-                        start,
-                        stop + 1,
-                        step,
-                    )
-                ):
-                    self[destination_index] = value[source_index]
-            else:
-                for (value_index, value) in enumerate(value):
-                    self[index][value_index] = value
+            self._grid._update(
+                item
+                for destination_index, inner in zip(range(start, stop + 1, step), value)
+                for item in _flatten(self._coordinates + (destination_index,), inner)
+            )
 
         else:
-            self._persist()
-            self._get_content()[index] = value
+            self._grid._update(_flatten(self._coordinates + (index,), value))
 
-    @GridModifyLock
+    @GridModifyItemLock
     def __delitem__(self, index):
         """Deletes the contents of a grid cell."""
-        del self._get_content()[index]
-        self._prune()
+        self._grid._delete(self._coordinates + (index,))
 
     def __getitem__(self, index):
         """Get the contents of a grid cell."""
-        content = self._get_content()
+        storage = self._grid._storage
         if isinstance(index, slice):
             step = index.step or 1
-            start = index.start or min(content.keys())
-            stop = index.stop or max(content.keys())
+            if index.start is None or index.stop is None:
+                bounds = self._grid._key_bounds(self._coordinates)
+            start = index.start if index.start is not None else bounds[0]
+            stop = index.stop if index.stop is not None else bounds[1]
 
             @GridReadLock
             def generator():
@@ -62,42 +125,118 @@ class Cell:
 
             return generator()
         else:
-            if content is not None and not isinstance(content, dict):
-                raise Exception("Not subscriptable")
-            return Cell(self._root, self._coordinates + (index,))
+            generation = storage.generation
+            node = self._node()
+            if node is None:
+                if self._value() is not None:
+                    raise Exception("Not subscriptable")
+                return Cell(self._grid, self._coordinates + (index,))
+            return Cell(
+                self._grid,
+                self._coordinates + (index,),
+                (storage, generation, node),
+            )
 
     @GridReadLock
     def __iter__(self):
         """Creates a generator that returns nested grid cells"""
 
-        def generator(root, value, location):
-            if isinstance(value, dict):
-                for index in value:
-                    yield from generator(root, value[index], location + (index,))
-            else:
-                yield Cell(root, location)
+        storage = self._grid._storage
+        generation = storage.generation
+        for coordinates, parent, _ in storage.leaves(self._coordinates):
+            yield Cell(self._grid, coordinates, (storage, generation, parent))
 
-        yield from generator(self._root, self._get_content(), self._coordinates)
+    @GridReadLock
+    def query(self, bounds):
+        """Returns the cells holding values within the inclusive (start, stop) bounds of each
+        dimension below the current cell. None leaves a dimension unbounded."""
+        grid = self._grid
+        bounds = freeze(bounds)
+
+        def compute():
+            return tuple(
+                coordinates
+                for coordinates in grid._within(self._coordinates, bounds)
+                if grid._storage.value(coordinates) is not None
+            )
+
+        return [
+            Cell(grid, coordinates)
+            for coordinates in grid._cached(
+                ("query", self._coordinates, bounds),
+                Region(self._coordinates, bounds),
+                compute,
+            )
+        ]
+
+    def where(self, predicate):
+        """Returns a lazy query of the values below the current cell matching the predicate."""
+        return Query(self).where(predicate)
+
+    def within(self, bounds):
+        """Returns a lazy query of the values below the current cell within the inclusive
+        (start, stop) bounds of each dimension."""
+        return Query(self).within(bounds)
+
+    def map(self, func):
+        """Returns a lazy query of the values below the current cell passed through a
+        function."""
+        return Query(self).map(func)
 
     @GridReadLock
     def __len__(self):
         """Returns the number of included values. Specifically does not count None values."""
-        content = self._get_content()
+        storage = self._grid._storage
         return (
-            len(content)
-            if isinstance(content, dict)
-            else 1
-            if content is not None
-            else 0
+            len(storage.keys(self._coordinates))
+            if storage.is_node(self._coordinates)
+            else 1 if storage.value(self._coordinates) is not None else 0
         )
 
     @GridReadLock
     def __contains__(self, index):
         """Returns a boolean indicating if the provided value is within nested grid cells"""
-        content = self._get_content()
-        if not isinstance(content, dict):
+        storage = self._grid._storage
+        if not storage.is_node(self._coordinates):
             return False
-        return (index in content) or (index in content.values())
+        keys = storage.keys(self._coordinates)
+        if index in keys:
+            return True
+        values = self._grid._values
+        if values is not None and hashable(index):
+            return values.holds(self._coordinates, index)
+        return any(storage.value(self._coordinates + (key,)) == index for key in keys)
+
+    @GridReadLock
+    def find(self, value):
+        """Returns the cells at or below the current cell holding a value."""
+        return [Cell(self._grid, coordinates) for coordinates in self._find(value)]
+
+    @GridReadLock
+    def count(self, value):
+        """Returns the number of cells at or below the current cell holding a value. Counting
+        from the root of a grid with a value index takes constant time."""
+        values = self._grid._values
+        if values is not None and not self._coordinates and hashable(value):
+            return values.count(value)
+        return len(self._find(value))
+
+    def _find(self, value):
+        """Returns the coordinates at or below the current cell holding a value, using the
+        value index of the grid when it has one."""
+        values = self._grid._values
+        if values is None or not hashable(value):
+            return [
+                coordinates
+                for coordinates, stored in self._grid._storage.items(self._coordinates)
+                if stored == value
+            ]
+        depth = len(self._coordinates)
+        return [
+            coordinates
+            for coordinates in values.locations(value)
+            if coordinates[:depth] == self._coordinates
+        ]
 
     @GridReadLock
     def __str__(self):
@@ -174,70 +313,784 @@ class Cell:
 
     def _get_content(self):
         """Get the inner persisted value at the current cell location, or None if it isn't persisted."""
-        return functools.reduce(
-            lambda a, b: a[b] if a is not None and b in a else None,
-            (self._root,) + self._coordinates,
-        )
+        return self._grid._storage.content(self._coordinates)
 
     @GridModifyLock
-    def _persist(self):
-        """Persist the location of the current cell to enable storing its value."""
-        cursor = self._root
-        for value in self._coordinates:
-            if value not in cursor:
-                cursor[value] = {}
-            cursor = cursor[value]
+    def update(self, items, values=None):
+        """Sets many values under a single lock, given a mapping or iterable of coordinate and
+        value pairs, or an iterable of coordinates and an iterable of values. Coordinates are
+        relative to the current cell."""
+        if values is not None:
+            if hasattr(items, "tolist"):
+                items = items.tolist()
+            if hasattr(values, "tolist"):
+                values = values.tolist()
+            items = zip(items, values)
+        elif hasattr(items, "items"):
+            items = items.items()
+
+        self._grid._update(
+            item
+            for index, value in items
+            for item in _flatten(self._coordinates + _as_coordinates(index), value)
+        )
 
     @GridModifyLock
-    def _prune(self):
-        """Prune any unneccessary storage locations"""
-        cursor = self._root
-        for value in self._coordinates:
-            if len(cursor[value]) == 0:
-                del cursor[value]
-                return
+    def fill(self, region, values):
+        """Sets values in row-major order into the block of cells within the inclusive
+        (start, stop) bounds of each dimension, relative to the current cell."""
+        if hasattr(values, "ravel"):
+            values = values.ravel()
+        if hasattr(values, "tolist"):
+            values = values.tolist()
+
+        ranges = [range(start, stop + 1) for (start, stop) in region]
+        size = functools.reduce(lambda a, b: a * len(b), ranges, 1)
+        if isinstance(values, Sized) and len(values) != size:
+            raise Exception("Invalid region size")
+
+        def generator():
+            for coordinates, value in itertools.zip_longest(
+                itertools.product(*ranges), values, fillvalue=_MISSING
+            ):
+                if coordinates is _MISSING or value is _MISSING:
+                    raise Exception("Invalid region size")
+                yield (self._coordinates + coordinates, value)
+
+        self._grid._update(generator())
+
+    @GridReadLock
+    def aggregate(self, region=None, operation="sum"):
+        """Returns the sum, count, mean, min or max of the numeric values below the current
+        cell, within the inclusive (start, stop) bounds of each dimension of the region, or
+        everywhere when the region is None. Values are read in a single locked pass, unless
+        the grid maintains aggregates for the row."""
+        if operation not in OPERATIONS:
+            raise Exception("Unknown aggregation {}".format(operation))
+        region = freeze(region)
+        return self._grid._cached(
+            ("aggregate", self._coordinates, region, operation),
+            Region(self._coordinates, region),
+            lambda: self._summary(region).result(operation),
+        )
+
+    def sum(self):
+        """Returns the sum of the numeric values at or below the current cell."""
+        return self.aggregate(None, "sum")
+
+    def mean(self):
+        """Returns the mean of the numeric values at or below the current cell, or None."""
+        return self.aggregate(None, "mean")
+
+    def min(self):
+        """Returns the lowest numeric value at or below the current cell, or None."""
+        return self.aggregate(None, "min")
+
+    def max(self):
+        """Returns the highest numeric value at or below the current cell, or None."""
+        return self.aggregate(None, "max")
+
+    @GridReadLock
+    def group_by(self, dimension=0, operation="sum"):
+        """Returns a mapping of each index along a dimension below the current cell to an
+        aggregation of the numeric values sharing it."""
+        if operation not in OPERATIONS:
+            raise Exception("Unknown aggregation {}".format(operation))
+        grid = self._grid
+        if grid._aggregates is not None and not self._coordinates and dimension == 0:
+            summaries = {
+                index: grid._aggregates.summary(index, grid._storage)
+                for index in grid._aggregates.indices()
+            }
+        else:
+            depth = len(self._coordinates) + dimension
+            summaries = {}
+            for coordinates, value in grid._storage.items(self._coordinates):
+                if len(coordinates) > depth:
+                    summary = summaries.get(coordinates[depth])
+                    if summary is None:
+                        summary = summaries[coordinates[depth]] = Summary()
+                    summary.add(value)
+
+        return {
+            index: summary.result(operation)
+            for index, summary in summaries.items()
+            if summary.count
+        }
+
+    def _summary(self, region):
+        """Returns a summary of the numeric values below the current cell within a region."""
+        grid = self._grid
+        if region is not None:
+            return Summary(value for _, value in Query(self).within(region))
+        if grid._aggregates is not None and len(self._coordinates) == 1:
+            return grid._aggregates.summary(self._coordinates[0], grid._storage)
+        if grid._aggregates is not None and not self._coordinates:
+            summary = Summary()
+            for index in grid._aggregates.indices():
+                summary.merge(grid._aggregates.summary(index, grid._storage))
+            return summary
+        return Summary(value for _, value in grid._storage.items(self._coordinates))
+
+    @GridReadLock
+    def to_arrays(self, dtype=None):
+        """Returns a NumPy array of the coordinates of each value below the current cell, one
+        row per value and relative to the cell, and an array of the values."""
+        depth = len(self._coordinates)
+        return interop.to_arrays(
+            (
+                (coordinates[depth:], value)
+                for coordinates, value in self._grid._storage.items(self._coordinates)
+            ),
+            dtype,
+        )
+
+    @GridReadLock
+    def to_coo(self, shape=None, dtype=None):
+        """Returns a SciPy COO matrix of the two dimensions below the current cell."""
+        depth = len(self._coordinates)
+        return interop.to_coo(
+            (
+                (coordinates[depth:], value)
+                for coordinates, value in self._grid._storage.items(self._coordinates)
+            ),
+            shape,
+            dtype,
+        )
+
+    def to_csr(self, shape=None, dtype=None):
+        """Returns a SciPy CSR matrix of the two dimensions below the current cell."""
+        return self.to_coo(shape, dtype).tocsr()
+
+    def export(self, file, format="csv", chunk_size=10000):
+        """Streams the coordinates and value of each cell below the current cell to a path or
+        file object, as csv, ndjson or arrow rows, written in chunks to bound memory use.
+        Rows are read from a snapshot when the storage shares them, so the grid isn't
+        locked while exporting, and otherwise while holding the grid's read lock."""
+        source = self
+        if self._grid._storage.shares_snapshots:
+            source = Cell(self._grid.snapshot(), self._coordinates)
+        source._export(file, format, chunk_size)
+
+    @GridReadLock
+    def _export(self, file, format, chunk_size):
+        """Streams the rows below the current cell, reading them from the grid's storage."""
+        depth = len(self._coordinates)
+        export.export(
+            (
+                (coordinates[depth:], value)
+                for coordinates, value in self._grid._storage.items(self._coordinates)
+            ),
+            file,
+            format,
+            chunk_size,
+        )
+
+    def load(self, file, format="csv", chunk_size=10000):
+        """Stores the rows of an export below the current cell, as a bulk update per chunk.
+        Values in csv files are read as integers, floats or strings."""
+        for chunk in export.load(file, format, chunk_size):
+            self.update(chunk)
+
+    def _parent_node(self):
+        """Returns the storage node holding the current cell, resolving it from the root only
+        when the cached node may be stale."""
+        storage = self._grid._storage
+        parent = self._parent
+        if (
+            parent is not None
+            and parent[0] is storage
+            and parent[1] == storage.generation
+        ):
+            return parent[2]
+
+        generation = storage.generation
+        node = storage.node(self._coordinates[:-1])
+        self._parent = (storage, generation, node) if node is not None else None
+        return node
+
+    def _node(self):
+        """Returns the storage node of the cells nested in the current cell, or None."""
+        if not self._coordinates:
+            return self._grid._storage.node(())
+        parent = self._parent_node()
+        if parent is None:
+            return None
+        return self._grid._storage.child_node(parent, self._coordinates[-1])
+
+    def _value(self):
+        """Returns the value stored in the current cell without locking, or None."""
+        if not self._coordinates:
+            return None
+        parent = self._parent_node()
+        if parent is None:
+            return None
+        return self._grid._storage.child_value(parent, self._coordinates[-1])
 
     @GridReadLock
     def value(self):
         """Returns the value stored in the current cell, or None."""
-        content = self._get_content()
-        return content if not isinstance(content, dict) else None
+        return self._value()
 
     def coordinates(self):
         """Returns the coordinates of the current cell, or None."""
         return self._coordinates
 
-    def distance(self, cell):
-        """Returns the grid distance between coordinates of the current and provided cell."""
-        if not len(self._coordinates) == len(cell._coordinates):
-            raise Exception("Unequal number of dimensions")
-        return sum(
-            [
-                abs(self._coordinates[index] - cell._coordinates[index])
-                for index, value in enumerate(self._coordinates)
-            ]
-        )
+    def distance(self, cell, metric="manhattan"):
+        """Returns the grid distance between coordinates of the current and provided cell,
+        using the manhattan, chebyshev or euclidean metric."""
+        return path.distance(self._coordinates, cell._coordinates, metric)
 
-    def neighbors(self, include_empty=True, distance=1):
+    def neighbors(self, include_empty=True, distance=1, metric="chebyshev"):
         """Returns a generator that provides all neighboring cells at the given distance"""
+        return iter(
+            self._grid.neighbors_of(
+                [self._coordinates], distance, include_empty, metric
+            )[self._coordinates]
+        )
 
-        def _neighbors(cell, location, index):
-            if index > len(location) - 1:
-                if cell.value() is not None or include_empty:
-                    yield cell
-            else:
-                for delta in range(-distance, distance + 1):
-                    new_coordinates = list(location)
-                    new_coordinates[index] += delta
-                    yield from _neighbors(
-                        cell[new_coordinates[index]], new_coordinates, index + 1
+
+class Grid(Cell):
+    """Class representing the grid. Writers are serialized per stripe of top-level
+    coordinates, so a grid with several stripes allows writes to disjoint rows to
+    proceed together."""
+
+    def __init__(
+        self,
+        storage=None,
+        stripes=1,
+        index=False,
+        aggregates=False,
+        journal=False,
+        stats=None,
+        dtype=None,
+        cache=False,
+        value_index=False,
+    ):
+        self._coordinates = ()
+        if dtype is not None:
+            if storage is not None:
+                raise Exception("A dtype can't be given with a storage")
+            storage = TypedStorage(dtype)
+        self._storage = storage if storage is not None else NestedStorage()
+        self._lock = GridLock(stripes)
+        self._stats = None
+        if stats:
+            self._stats = stats if isinstance(stats, Stats) else Stats()
+            self._lock = InstrumentedLock(self._stats, stripes)
+            self._storage = InstrumentedStorage(self._storage, self._stats)
+        self._listeners = []
+        self._index = None
+        self._aggregates = None
+        if index:
+            self._index = SpatialIndex(self._storage)
+            self._listeners.append(self._index)
+        if aggregates:
+            self._aggregates = RowAggregates(self._storage)
+            self._listeners.append(self._aggregates)
+        self._journal = None
+        if journal:
+            self._journal = Journal(100000 if journal is True else journal)
+            self._listeners.append(self._journal)
+        self._values = None
+        if value_index:
+            self._values = ValueIndex(self._storage)
+            self._listeners.append(self._values)
+        self._cache = None
+        if cache:
+            self._cache = QueryCache(1024 if cache is True else cache)
+            self._listeners.append(self._cache)
+
+    @property
+    def _grid(self):
+        """The grid itself, held as a property to avoid a reference cycle."""
+        return self
+
+    def _set(self, coordinates, value):
+        """Stores a value at the coordinates, notifying any listeners. Nested cells replaced
+        by the value are reported as deleted, while the value keeps their position."""
+        if not self._listeners:
+            self._storage.set(coordinates, value)
+            return
+
+        storage = self._storage
+        removed = None
+        if storage.is_node(coordinates):
+            removed = list(storage.items(coordinates))
+        old = storage.value(coordinates)
+        storage.set(coordinates, value)
+        if removed is not None:
+            self._notify("_delete", coordinates, removed)
+        self._notify("_set", coordinates, old, value)
+
+    def _update(self, items):
+        """Stores each value of an iterable of coordinate and value pairs."""
+        if not self._listeners:
+            self._storage.update(items)
+            return
+
+        for coordinates, value in items:
+            self._set(coordinates, value)
+
+    def _delete(self, coordinates):
+        """Deletes the value or nested cells at the coordinates, notifying any listeners."""
+        if not self._listeners:
+            self._storage.delete(coordinates)
+            return
+
+        removed = list(self._storage.items(coordinates))
+        self._storage.delete(coordinates)
+        self._notify("_delete", coordinates, removed)
+
+    def _notify(self, event, *args):
+        """Passes a change already applied to the storage to every listener. An exception
+        raised by a listener is raised once all of them have been notified, so that one
+        failing listener doesn't leave the others out of sync with the storage."""
+        error = None
+        for listener in self._listeners:
+            try:
+                getattr(listener, event)(*args)
+            except Exception as exception:
+                if error is None:
+                    error = exception
+        if error is not None:
+            raise error
+
+    @property
+    def stats(self):
+        """The counters and histograms recorded by an instrumented grid, or None."""
+        return self._stats
+
+    @property
+    def version(self):
+        """The number of changes made to the grid since it was created, when journaled."""
+        if self._journal is None:
+            raise Exception("The grid has no journal")
+        return self._journal.version
+
+    def changes_since(self, version):
+        """Returns the version, coordinates and new value of each change made after a
+        version, oldest first. Deleted values are reported as None."""
+        if self._journal is None:
+            raise Exception("The grid has no journal")
+        return self._journal.changes_since(version)
+
+    def subscribe(self, target, batch=1):
+        """Returns a subscription delivering lists of changes to a callback, or to a queue
+        through its put method, once batch changes have been made. Changes are delivered
+        while the grid is locked for writing."""
+        if self._journal is None:
+            raise Exception("The grid has no journal")
+        return self._journal.subscribe(target, batch)
+
+    def _cached(self, key, region, compute):
+        """Returns the result of a query from the cache, computing and caching it if needed."""
+        if self._cache is None:
+            return compute()
+        result = self._cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = compute()
+            self._cache.put(key, result, region)
+        return result
+
+    def cache_info(self):
+        """Returns the hits, misses, evictions, invalidations and size of the query cache."""
+        if self._cache is None:
+            raise Exception("The grid has no query cache")
+        return self._cache.info()
+
+    def cache_clear(self):
+        """Removes every result from the query cache."""
+        if self._cache is None:
+            raise Exception("The grid has no query cache")
+        self._cache.clear()
+
+    @GridReadLock
+    def _key_bounds(self, coordinates):
+        """Returns the lowest and highest indices nested directly below the coordinates."""
+        if self._index is not None:
+            return self._index.bounds(coordinates)
+
+        def compute():
+            keys = self._storage.keys(coordinates)
+            return (min(keys), max(keys))
+
+        return self._cached(("bounds", coordinates), Region(coordinates), compute)
+
+    def _within(self, coordinates, bounds):
+        """Creates a generator of the coordinates stored below the coordinates, within the
+        inclusive (start, stop) bounds of each following dimension."""
+        if self._index is not None:
+            yield from self._index.within(coordinates, bounds)
+            return
+
+        for location, _ in self._storage.within(coordinates, bounds):
+            yield location
+
+    @GridReadLock
+    def neighbors_of(
+        self, cells, distance=1, include_empty=True, metric="chebyshev", values=False
+    ):
+        """Returns a mapping of the coordinates of each of many cells to a list of its
+        neighboring cells, or of coordinate and value pairs when values is set. Neighborhoods
+        include the cell itself, and are chebyshev (square) or manhattan (diamond)."""
+        cells = tuple(_location(cell) for cell in cells)
+        region = Region()
+        if self._cache is not None and cells:
+            dimensions = min(len(coordinates) for coordinates in cells)
+            region = Region(
+                (),
+                tuple(
+                    (
+                        min(coordinates[dimension] for coordinates in cells) - distance,
+                        max(coordinates[dimension] for coordinates in cells) + distance,
                     )
+                    for dimension in range(dimensions)
+                ),
+            )
+        neighbors = self._cached(
+            ("neighbors", cells, distance, include_empty, metric),
+            region,
+            lambda: stencil.neighbors_of(
+                self._storage, cells, distance, include_empty, metric
+            ),
+        )
+        if values:
+            return {
+                coordinates: list(pairs) for coordinates, pairs in neighbors.items()
+            }
+        return {
+            coordinates: [Cell(self, neighbor) for (neighbor, _) in pairs]
+            for coordinates, pairs in neighbors.items()
+        }
 
-        yield from _neighbors(self._root, self._coordinates, 0)
+    @GridReadLock
+    def convolve(self, kernel, include_empty=False):
+        """Returns a new grid holding, for each cell with a value, the sum of the kernel weights
+        multiplied by the values at their offsets from the cell. Kernels are nested lists
+        centered on the cell, or mappings of offsets to weights. With include_empty, results
+        are also kept for empty cells reached by the kernel."""
+        grid = Grid()
+        grid._storage.update(
+            stencil.convolve(self._storage, kernel, include_empty).items()
+        )
+        return grid
 
+    @GridReadLock
+    def shortest_path(self, start, goal, metric="manhattan", passable=None, cost=None):
+        """Returns the coordinates of the cheapest path between two cells, stepping between
+        neighboring cells holding values accepted by passable, or None. Steps along a
+        single dimension for manhattan, or also diagonally for chebyshev and euclidean.
+        Entering a cell costs the step length, multiplied by the cost of its value."""
+        return path.astar(
+            self._storage, _location(start), _location(goal), metric, passable, cost
+        )
 
-class Grid(Cell):
-    """Class representing the grid."""
+    @GridReadLock
+    def distance_field(
+        self, sources, metric="manhattan", passable=None, cost=None, limit=None
+    ):
+        """Returns a mapping of the coordinates of each cell reachable from any of the
+        sources to the cost of the cheapest path from them, up to an optional limit."""
+        return path.distance_field(
+            self._storage,
+            [_location(source) for source in sources],
+            metric,
+            passable,
+            cost,
+            limit,
+        )
+
+    @GridReadLock
+    def components(self, metric="manhattan", passable=None):
+        """Returns a mapping of the coordinates of each cell holding a value accepted by
+        passable to the label of the group of such cells connected to it."""
+        return path.components(self._storage, metric, passable)
+
+    @GridReadLock
+    def save(self, path):
+        """Saves the grid to a compact binary file, holding columns of coordinates and values
+        for each top-level index. Coordinates must be integers. The file is only replaced
+        once the grid has been written in full."""
+        persist.save(self._storage.items(), path)
+
+    @classmethod
+    def open(cls, path, mmap=True):
+        """Opens a grid saved to a file. When memory mapped, values beneath each top-level index
+        are loaded only once they are first accessed. Files may hold pickled values, so only
+        open files from trusted sources."""
+        if mmap:
+            return cls(storage=persist.MappedStorage(path))
+        grid = cls()
+        with open(path, "rb") as file:
+            grid._storage.update(persist.read(file.read()))
+        return grid
+
+    def map_regions(self, func, partition=None, workers=None):
+        """Runs a function over partitions of the grid by ranges of top-level indices in a
+        pool of worker processes, returning the results in partition order. Partitions are
+        an int count, defaulting to the number of workers, or a list of disjoint inclusive
+        (start, stop) bounds. A grid returned by the function replaces the rows of its
+        partition. Coordinates must be integers, and the function must be picklable."""
+        return parallel.map_regions(self, func, partition, workers)
+
+    @GridModifyLock
+    def _replace(self, bounds, items):
+        """Replaces the rows within the inclusive (start, stop) bounds with new values."""
+        start, stop = bounds
+        for index in list(self._storage.keys(())):
+            if start <= index <= stop:
+                self._delete((index,))
+        self._update(items)
+
+    def transaction(self, optimistic=False):
+        """Returns a transaction buffering writes and deletes, to be applied together when
+        it ends. Optimistic transactions fail if the values they read have changed."""
+        return Transaction(self, optimistic)
+
+    @GridModifyLock
+    def _commit(self, operations, reads):
+        """Applies the writes and deletes of a transaction, restoring the rows it modified if
+        any of them fails. Journal subscribers only receive the changes once all of them
+        have been applied."""
+        storage = self._storage
+        for coordinates, value in reads.items():
+            if storage.value(coordinates) != value:
+                raise Exception("The grid was modified during the transaction")
+
+        if self._journal is not None:
+            self._journal._hold()
+        rows = {}
+        order = None
+        try:
+            for coordinates, value in operations:
+                row = coordinates[:1]
+                if row not in rows:
+                    rows[row] = self._cells(row)
+                if value is DELETED:
+                    if order is None:
+                        order = list(storage.keys(()))
+                    self._delete(coordinates)
+                else:
+                    self._update(_flatten(coordinates, value))
+        except BaseException:
+            for row, cells in rows.items():
+                self._restore(row, cells)
+            if order is not None:
+                self._reorder(order)
+            if self._journal is not None:
+                self._journal._release(keep=False)
+            raise
+        if self._journal is not None:
+            self._journal._release()
+
+    def _cells(self, coordinates):
+        """Returns the coordinate and value pairs at or below the coordinates, including
+        values of None, or None if nothing is stored there."""
+        storage = self._storage
+        if not storage.is_node(coordinates) and storage.value(coordinates) is None:
+            if coordinates[-1] not in storage.keys(coordinates[:-1]):
+                return None
+
+        def generator(location, content):
+            if isinstance(content, dict):
+                for index, inner in content.items():
+                    yield from generator(location + (index,), inner)
+            else:
+                yield (location, content)
+
+        return list(generator(coordinates, storage.content(coordinates)))
+
+    def _restore(self, coordinates, cells):
+        """Restores the cells at or below the coordinates to pairs returned by _cells."""
+        storage = self._storage
+        if cells is None:
+            if coordinates[-1] in storage.keys(coordinates[:-1]):
+                self._delete(coordinates)
+            return
+        # The cells of dense regions can't be replaced, but always hold a value, so
+        # restoring each of their values is enough.
+        if not self._dense(coordinates):
+            self._set(coordinates, None)
+        self._update(cells)
+
+    def _reorder(self, order):
+        """Restores the order of the top-level indices, moving the rows after the first one
+        out of place to the end in their original order. Dense rows never move."""
+        keys = [key for key in self._storage.keys(()) if not self._dense((key,))]
+        order = [key for key in order if not self._dense((key,))]
+        position = 0
+        while position < len(keys) and keys[position] == order[position]:
+            position += 1
+        for key in order[position:]:
+            cells = self._cells((key,))
+            self._delete((key,))
+            self._update(cells)
+
+    def _dense(self, coordinates):
+        """Returns a boolean indicating if the coordinates fall within a dense region."""
+        storage = self._storage
+        return (
+            isinstance(storage, MixedStorage)
+            and storage._region(coordinates) is not None
+        )
+
+    @GridReadLock
+    def apply(self, func):
+        """Returns a new grid holding the result of a function applied to each value. Empty
+        cells are skipped, and results of None are left empty."""
+        return _build(
+            (coordinates, func(value)) for coordinates, value in self._storage.items()
+        )
+
+    @GridReadLock
+    def _mapping(self):
+        """Returns a dict of the coordinates and values of the grid."""
+        return dict(self._storage.items())
+
+    def _combine(self, other, both=None, left=None, right=None):
+        """Returns a new grid merging the values of the grid with those of another grid, in
+        a single pass over each. See algebra.merge."""
+        if not isinstance(other, Grid):
+            raise Exception("Grids can only be combined with grids")
+        values = other._mapping()
+        return self._merge(values, both, left, right)
+
+    @GridReadLock
+    def _merge(self, values, both, left, right):
+        """Returns a new grid merging the values of the grid with a dict of values."""
+        return _build(algebra.merge(self._storage.items(), values, both, left, right))
+
+    def _arithmetic(self, other, name, reflected=False):
+        """Returns a new grid combining the values of the grid with those of another grid, or
+        with a single value."""
+        both, left, right = algebra.OPERATORS[name]
+        if isinstance(other, Cell):
+            return self._combine(other, both, left, right)
+        if reflected:
+            return self.apply(lambda value: both(other, value))
+        return self.apply(lambda value: both(value, other))
+
+    def __add__(self, other):
+        return self._arithmetic(other, "add")
+
+    def __radd__(self, other):
+        return self._arithmetic(other, "add", reflected=True)
+
+    def __sub__(self, other):
+        return self._arithmetic(other, "sub")
+
+    def __rsub__(self, other):
+        return self._arithmetic(other, "sub", reflected=True)
+
+    def __mul__(self, other):
+        return self._arithmetic(other, "mul")
+
+    def __rmul__(self, other):
+        return self._arithmetic(other, "mul", reflected=True)
+
+    def __truediv__(self, other):
+        return self._arithmetic(other, "truediv")
+
+    def __rtruediv__(self, other):
+        return self._arithmetic(other, "truediv", reflected=True)
+
+    def __floordiv__(self, other):
+        return self._arithmetic(other, "floordiv")
+
+    def __rfloordiv__(self, other):
+        return self._arithmetic(other, "floordiv", reflected=True)
+
+    def __neg__(self):
+        return self.apply(operator.neg)
+
+    def union(self, other):
+        """Returns a new grid holding the values of either grid, preferring the values of
+        this grid where both hold one."""
+        return self._combine(other, algebra.first, algebra.identity, algebra.identity)
+
+    def intersection(self, other):
+        """Returns a new grid holding the values of this grid at the cells held by both."""
+        return self._combine(other, algebra.first)
+
+    def difference(self, other):
+        """Returns a new grid holding the values of this grid at the cells the other grid
+        doesn't hold."""
+        return self._combine(other, left=algebra.identity)
+
+    def mask(self, other):
+        """Returns a new grid holding the values of this grid at the cells where the other
+        grid holds a truthy value."""
+        return self._combine(other, algebra.masked)
+
+    @classmethod
+    def from_arrays(cls, coordinates, values, **kwargs):
+        """Creates a grid from an array of coordinates, one row per value, and an array of
+        values, storing them in a single bulk update."""
+        grid = cls(**kwargs)
+        grid.update(coordinates, values)
+        return grid
+
+    @classmethod
+    def from_coo(cls, matrix, **kwargs):
+        """Creates a grid holding the entries of a SciPy sparse matrix, storing them in a
+        single bulk update."""
+        grid = cls(**kwargs)
+        grid.update(*interop.from_coo(matrix))
+        return grid
+
+    @GridModifyLock
+    def snapshot(self):
+        """Returns an immutable view of the grid's current values, which can be read without
+        locking while the grid continues to be modified. Storages that don't share snapshots
+        copy every value."""
+        return Snapshot(self._storage.snapshot())
+
+    @GridModifyLock
+    def dense(self, *bounds, dtype=float, fill=0):
+        """Stores a rectangular block of cells in a NumPy array, given the inclusive
+        (start, stop) bounds of each dimension. Writes made directly to the array of the
+        returned region bypass the grid, so they aren't seen by its cache, value index,
+        journal or listeners, and may show up in snapshots sharing the array."""
+        if not isinstance(self._storage, MixedStorage):
+            self._storage = MixedStorage(self._storage)
+        if not self._listeners:
+            return self._storage.add_region(bounds, dtype, fill)
+
+        populated = [
+            coordinates
+            for coordinates in itertools.product(
+                *[range(start, stop + 1) for (start, stop) in bounds]
+            )
+            if self._storage.value(coordinates) is None
+        ]
+        region = self._storage.add_region(bounds, dtype, fill)
+        for coordinates in populated:
+            self._notify("_set", coordinates, None, self._storage.value(coordinates))
+        return region
+
+
+class Snapshot(Grid):
+    """Class representing an immutable view of a grid at a point in time."""
+
+    def __init__(self, storage):
+        super().__init__(storage=storage)
+        self._lock = NullLock()
+
+    def _set(self, coordinates, value):
+        raise Exception("Snapshots are read only")
+
+    def _update(self, items):
+        raise Exception("Snapshots are read only")
+
+    def _delete(self, coordinates):
+        raise Exception("Snapshots are read only")
+
+    def dense(self, *bounds, dtype=float, fill=0):
+        raise Exception("Snapshots are read only")
+
+    def transaction(self, optimistic=False):
+        raise Exception("Snapshots are read only")
 
-    def __init__(self):
-        super().__init__(_root={})
+    def snapshot(self):
+        return self
@@ -0,0 +1,105 @@
+import bisect
+import threading
+
+
+class _Node:
+    """Sorted indices populated below a location, and the nodes of those holding nested cells."""
+
+    __slots__ = ("keys", "children")
+
+    def __init__(self):
+        self.keys = []
+        self.children = {}
+
+
+def _insert(keys, index):
+    """Inserts an index into a sorted list, unless already present."""
+    position = bisect.bisect_left(keys, index)
+    if position == len(keys) or keys[position] != index:
+        keys.insert(position, index)
+
+
+def _remove(keys, index):
+    """Removes an index from a sorted list, if present."""
+    position = bisect.bisect_left(keys, index)
+    if position < len(keys) and keys[position] == index:
+        del keys[position]
+
+
+class SpatialIndex:
+    """Sorted index of the populated indices along each dimension of a grid, maintained as
+    the grid is modified. Indices must be orderable, such as integers."""
+
+    def __init__(self, storage=None):
+        self._root = _Node()
+        self._mutex = threading.Lock()
+        if storage is not None:
+            for coordinates, _, value in storage.leaves():
+                self._set(coordinates, None, value)
+
+    def _node(self, coordinates):
+        """Returns the node at the coordinates, or None."""
+        node = self._root
+        for index in coordinates:
+            node = node.children.get(index)
+            if node is None:
+                return None
+        return node
+
+    def _set(self, coordinates, old, value):
+        """Records a value stored at the coordinates."""
+        with self._mutex:
+            node = self._root
+            for index in coordinates[:-1]:
+                child = node.children.get(index)
+                if child is None:
+                    _insert(node.keys, index)
+                    child = node.children[index] = _Node()
+                node = child
+            _insert(node.keys, coordinates[-1])
+            node.children.pop(coordinates[-1], None)
+
+    def _delete(self, coordinates, removed):
+        """Records the value or nested cells at the coordinates being deleted."""
+        with self._mutex:
+            path = [self._root]
+            for index in coordinates[:-1]:
+                path.append(path[-1].children[index])
+            _remove(path[-1].keys, coordinates[-1])
+            path[-1].children.pop(coordinates[-1], None)
+
+            for depth in range(len(coordinates) - 1, 0, -1):
+                if path[depth].keys:
+                    break
+                _remove(path[depth - 1].keys, coordinates[depth - 1])
+                del path[depth - 1].children[coordinates[depth - 1]]
+
+    def bounds(self, coordinates):
+        """Returns the lowest and highest indices nested directly below the coordinates."""
+        node = self._node(coordinates)
+        if node is None or not node.keys:
+            raise ValueError("No indices below {}".format(coordinates))
+        return (node.keys[0], node.keys[-1])
+
+    def within(self, coordinates, bounds):
+        """Creates a generator of the coordinates of values below the coordinates, within the
+        inclusive (start, stop) bounds of each following dimension. None leaves a dimension
+        unbounded."""
+
+        def generator(node, location, depth):
+            keys = node.keys
+            if depth < len(bounds) and bounds[depth] is not None:
+                start, stop = bounds[depth]
+                keys = keys[
+                    bisect.bisect_left(keys, start) : bisect.bisect_right(keys, stop)
+                ]
+            for index in keys:
+                child = node.children.get(index)
+                if child is not None:
+                    yield from generator(child, location + (index,), depth + 1)
+                elif depth + 1 >= len(bounds):
+                    yield location + (index,)
+
+        node = self._node(coordinates)
+        if node is not None:
+            yield from generator(node, coordinates, 0)
@@ -0,0 +1,65 @@
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import scipy.sparse
+except ImportError:
+    scipy = None
+
+
+def to_arrays(items, dtype=None):
+    """Returns an array of the coordinates of each coordinate and value pair, one row per
+    pair, and an array of their values. Coordinates must be integers, and all have the same
+    number of dimensions."""
+    if numpy is None:
+        raise ImportError("NumPy is required for array conversions")
+    flat = array.array("q")
+    values = []
+    dimensions = None
+    for coordinates, value in items:
+        if dimensions is None:
+            dimensions = len(coordinates)
+        elif len(coordinates) != dimensions:
+            raise Exception("Unequal number of dimensions")
+        flat.extend(coordinates)
+        values.append(value)
+
+    coordinates = numpy.frombuffer(flat, dtype=numpy.int64) if flat else None
+    if coordinates is None:
+        coordinates = numpy.empty((0, dimensions or 0), dtype=numpy.int64)
+    return (
+        coordinates.reshape(len(values), dimensions or 0),
+        numpy.array(values, dtype=dtype),
+    )
+
+
+def to_coo(items, shape=None, dtype=None):
+    """Returns a SciPy COO matrix holding two dimensional coordinate and value pairs. The
+    shape defaults to one past the highest row and column."""
+    if scipy is None:
+        raise ImportError("SciPy is required for sparse matrix conversions")
+    coordinates, values = to_arrays(items, dtype)
+    if len(values) and coordinates.shape[1] != 2:
+        raise Exception("Sparse matrices require two dimensions")
+    if len(values) and coordinates.min() < 0:
+        raise Exception("Sparse matrices require non-negative coordinates")
+    if shape is None:
+        shape = tuple(coordinates.max(axis=0) + 1) if len(values) else (0, 0)
+    rows, columns = (coordinates[:, 0], coordinates[:, 1]) if len(values) else ([], [])
+    return scipy.sparse.coo_matrix((values, (rows, columns)), shape=shape)
+
+
+def from_coo(matrix):
+    """Returns the coordinates and values of the entries of a SciPy sparse matrix."""
+    matrix = matrix.tocoo()
+    if not matrix.has_canonical_format:
+        matrix = matrix.copy()
+        matrix.sum_duplicates()
+    return (
+        zip(matrix.row.tolist(), matrix.col.tolist()),
+        matrix.data.tolist(),
+    )
@@ -0,0 +1,101 @@
+import collections
+import itertools
+import threading
+
+
+class Subscription:
+    """Delivers batches of journal entries to a callback, or to a queue through its put
+    method."""
+
+    def __init__(self, journal, target, batch=1):
+        self._journal = journal
+        self._target = target
+        self._batch = max(batch, 1)
+        self._pending = []
+
+    def _receive(self, entry):
+        """Queues an entry, delivering the pending entries once a batch is complete."""
+        self._pending.append(entry)
+        if len(self._pending) >= self._batch:
+            self.flush()
+
+    def flush(self):
+        """Delivers any pending entries, even if the batch isn't complete."""
+        with self._journal._mutex:
+            entries, self._pending = self._pending, []
+            if not entries:
+                return
+            if hasattr(self._target, "put"):
+                self._target.put(entries)
+            else:
+                self._target(entries)
+
+    def cancel(self):
+        """Delivers any pending entries and stops the subscription."""
+        with self._journal._mutex:
+            self.flush()
+            if self in self._journal._subscriptions:
+                self._journal._subscriptions.remove(self)
+
+
+class Journal:
+    """Log of the changes made to a grid, holding the version, coordinates and new value of
+    each change, or None for deleted values. Only the most recent changes are kept."""
+
+    def __init__(self, capacity=100000):
+        self.version = 0
+        self._entries = collections.deque(maxlen=capacity)
+        self._mutex = threading.RLock()
+        self._subscriptions = []
+        self._held = None
+
+    def _hold(self):
+        """Holds back the changes recorded from now on, until they are released."""
+        with self._mutex:
+            self._held = []
+
+    def _release(self, keep=True):
+        """Appends the changes held back to the log, notifying subscriptions, or discards
+        them."""
+        with self._mutex:
+            changes, self._held = self._held, None
+            if keep:
+                self._record(changes)
+
+    def _record(self, changes):
+        """Appends coordinate and value pairs to the log, notifying subscriptions."""
+        with self._mutex:
+            if self._held is not None:
+                self._held.extend(changes)
+                return
+            for coordinates, value in changes:
+                self.version += 1
+                entry = (self.version, coordinates, value)
+                self._entries.append(entry)
+                for subscription in self._subscriptions:
+                    subscription._receive(entry)
+
+    def _set(self, coordinates, old, value):
+        """Records a value stored at the coordinates."""
+        self._record([(coordinates, value)])
+
+    def _delete(self, coordinates, removed):
+        """Records the deletion of the coordinate and value pairs being removed."""
+        self._record([(location, None) for location, _ in removed])
+
+    def changes_since(self, version):
+        """Returns the entries of the changes made after a version, oldest first."""
+        with self._mutex:
+            oldest = self.version - len(self._entries)
+            if version < oldest:
+                raise Exception(
+                    "Changes since version {} are no longer available".format(version)
+                )
+            return list(itertools.islice(self._entries, max(version - oldest, 0), None))
+
+    def subscribe(self, target, batch=1):
+        """Returns a subscription delivering lists of new entries to a callback or queue."""
+        subscription = Subscription(self, target, batch)
+        with self._mutex:
+            self._subscriptions.append(subscription)
+        return subscription
@@ -0,0 +1,77 @@
+import concurrent.futures
+import io
+import os
+from gridable import persist
+
+# Partitions are shipped to worker processes in the binary grid format rather than as
+# pickled storage, and grids returned by workers are shipped back the same way.
+
+
+def _encode(items):
+    """Returns the bytes of coordinate and value pairs in the binary grid format."""
+    buffer = io.BytesIO()
+    persist.write(items, buffer)
+    return buffer.getvalue()
+
+
+def partitions(keys, count):
+    """Returns the inclusive (start, stop) bounds of up to count ranges of sorted top-level
+    indices, holding similar numbers of indices."""
+    keys = sorted(keys)
+    count = max(min(count, len(keys)), 1)
+    size, extra = divmod(len(keys), count)
+    bounds = []
+    start = 0
+    for partition in range(count):
+        stop = start + size + (1 if partition < extra else 0)
+        if stop > start:
+            bounds.append((keys[start], keys[stop - 1]))
+        start = stop
+    return bounds
+
+
+def _run(func, payload):
+    """Runs a function over a grid decoded from a partition, encoding any grid it returns."""
+    from gridable.grid import Grid
+
+    grid = Grid()
+    grid._storage.update(persist.read(payload))
+    result = func(grid)
+    if isinstance(result, Grid):
+        return (True, _encode(result._storage.items()))
+    return (False, result)
+
+
+def map_regions(grid, func, partition=None, workers=None):
+    """Runs a function over partitions of a grid by ranges of top-level indices, returning
+    the results in partition order. Grids returned replace their partition's rows."""
+    from gridable.grid import Grid
+
+    snapshot = grid.snapshot()
+    workers = workers or os.cpu_count() or 1
+    if partition is None or isinstance(partition, int):
+        bounds = partitions(snapshot._storage.keys(()), partition or workers)
+    else:
+        bounds = [(start, stop) for (start, stop) in partition]
+        ordered = sorted(bounds)
+        for (_, stop), (start, _) in zip(ordered, ordered[1:]):
+            if start <= stop:
+                raise Exception("Partitions must not overlap")
+
+    payloads = (_encode(snapshot._storage.within((), [region])) for region in bounds)
+    if workers == 1:
+        outputs = [_run(func, payload) for payload in payloads]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run, func, payload) for payload in payloads]
+            outputs = [future.result() for future in futures]
+
+    results = []
+    for region, (returned, output) in zip(bounds, outputs):
+        if returned:
+            result = Grid()
+            result._storage.update(persist.read(output))
+            grid._replace(region, result._storage.items())
+            output = result
+        results.append(output)
+    return results
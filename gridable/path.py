@@ -0,0 +1,189 @@
+import collections
+import functools
+import heapq
+import itertools
+import math
+from gridable import stencil
+
+METRICS = ("manhattan", "chebyshev", "euclidean")
+
+_BLOCKED = object()
+
+
+def distance(first, second, metric="manhattan"):
+    """Returns the distance between two coordinate tuples, using the given metric."""
+    if len(first) != len(second):
+        raise Exception("Unequal number of dimensions")
+    deltas = [abs(a - b) for a, b in zip(first, second)]
+    if metric == "manhattan":
+        return sum(deltas)
+    if metric == "chebyshev":
+        return max(deltas, default=0)
+    if metric == "euclidean":
+        return math.sqrt(sum(delta * delta for delta in deltas))
+    raise Exception("Unknown metric {}".format(metric))
+
+
+@functools.lru_cache(maxsize=64)
+def moves(dimensions, metric="manhattan"):
+    """Returns the offset and length of each step to a neighboring cell. Manhattan steps
+    move along a single dimension, while Chebyshev and Euclidean steps also move
+    diagonally, with Euclidean diagonal steps being longer."""
+    if metric not in METRICS:
+        raise Exception("Unknown metric {}".format(metric))
+    shape = "manhattan" if metric == "manhattan" else "chebyshev"
+    metric = "euclidean" if metric == "euclidean" else "chebyshev"
+    return tuple(
+        (offset, distance(offset, (0,) * dimensions, metric))
+        for offset in stencil.offsets(dimensions, 1, shape)
+        if any(offset)
+    )
+
+
+def _walkable(storage, passable):
+    """Returns a function returning the value of a cell that can be walked through, or
+    _BLOCKED. Cells are walkable when they hold a value accepted by passable."""
+
+    def walkable(coordinates):
+        value = storage.value(coordinates)
+        if value is None or (passable is not None and not passable(value)):
+            return _BLOCKED
+        return value
+
+    return walkable
+
+
+def _neighbors(coordinates, steps):
+    """Creates a generator of the coordinates and step length of each neighbor."""
+    for offset, length in steps:
+        yield (
+            tuple(index + delta for index, delta in zip(coordinates, offset)),
+            length,
+        )
+
+
+def astar(storage, start, goal, metric="manhattan", passable=None, cost=None):
+    """Returns the coordinates of the cheapest path between two cells through walkable cells,
+    or None if there is no path. Entering a cell costs the step length, multiplied by the
+    cost of its value when given. Costs below 1 may lead to a more expensive path."""
+    if len(start) != len(goal):
+        raise Exception("Unequal number of dimensions")
+    walkable = _walkable(storage, passable)
+    if walkable(start) is _BLOCKED or walkable(goal) is _BLOCKED:
+        return None
+
+    steps = moves(len(start), metric)
+    counter = itertools.count()
+    best = {start: 0}
+    previous = {start: None}
+    heap = [(distance(start, goal, metric), 0, next(counter), start)]
+    while heap:
+        _, spent, _, current = heapq.heappop(heap)
+        if current == goal:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = previous[current]
+            return path[::-1]
+        if spent > best[current]:
+            continue
+
+        for neighbor, length in _neighbors(current, steps):
+            value = walkable(neighbor)
+            if value is _BLOCKED:
+                continue
+            total = spent + (length * cost(value) if cost is not None else length)
+            if neighbor not in best or total < best[neighbor]:
+                best[neighbor] = total
+                previous[neighbor] = current
+                estimate = total + distance(neighbor, goal, metric)
+                heapq.heappush(heap, (estimate, total, next(counter), neighbor))
+    return None
+
+
+def dijkstra(
+    storage, sources, metric="manhattan", passable=None, cost=None, limit=None
+):
+    """Returns a mapping of the coordinates of each walkable cell reachable from any of the
+    sources to the cost of its cheapest path, up to an optional limit."""
+    walkable = _walkable(storage, passable)
+    counter = itertools.count()
+    best = {}
+    heap = []
+    for source in sources:
+        if walkable(source) is not _BLOCKED:
+            best[source] = 0
+            heap.append((0, next(counter), source))
+    if not heap:
+        return best
+
+    steps = moves(len(heap[0][2]), metric)
+    while heap:
+        spent, _, current = heapq.heappop(heap)
+        if spent > best[current]:
+            continue
+        for neighbor, length in _neighbors(current, steps):
+            value = walkable(neighbor)
+            if value is _BLOCKED:
+                continue
+            total = spent + (length * cost(value) if cost is not None else length)
+            if limit is not None and total > limit:
+                continue
+            if neighbor not in best or total < best[neighbor]:
+                best[neighbor] = total
+                heapq.heappush(heap, (total, next(counter), neighbor))
+    return best
+
+
+def distance_field(
+    storage, sources, metric="manhattan", passable=None, cost=None, limit=None
+):
+    """Returns a mapping of the coordinates of each walkable cell reachable from any of the
+    sources to the distance of the nearest one. Unweighted Manhattan and Chebyshev fields
+    count steps with a breadth first search."""
+    if cost is not None or metric == "euclidean":
+        return dijkstra(storage, sources, metric, passable, cost, limit)
+
+    walkable = _walkable(storage, passable)
+    field = {}
+    queue = collections.deque()
+    for source in sources:
+        if source not in field and walkable(source) is not _BLOCKED:
+            field[source] = 0
+            queue.append(source)
+    if not queue:
+        return field
+
+    steps = moves(len(queue[0]), metric)
+    while queue:
+        current = queue.popleft()
+        steps_taken = field[current] + 1
+        if limit is not None and steps_taken > limit:
+            continue
+        for neighbor, _ in _neighbors(current, steps):
+            if neighbor not in field and walkable(neighbor) is not _BLOCKED:
+                field[neighbor] = steps_taken
+                queue.append(neighbor)
+    return field
+
+
+def components(storage, metric="manhattan", passable=None):
+    """Returns a mapping of the coordinates of each walkable cell to the label of the group
+    of walkable cells connected to it, numbered from 0 in order of their first cell."""
+    walkable = _walkable(storage, passable)
+    labels = {}
+    label = 0
+    for coordinates, _ in storage.items():
+        if coordinates in labels or walkable(coordinates) is _BLOCKED:
+            continue
+        labels[coordinates] = label
+        queue = collections.deque([coordinates])
+        steps = moves(len(coordinates), metric)
+        while queue:
+            current = queue.popleft()
+            for neighbor, _ in _neighbors(current, steps):
+                if neighbor not in labels and walkable(neighbor) is not _BLOCKED:
+                    labels[neighbor] = label
+                    queue.append(neighbor)
+        label += 1
+    return labels
@@ -0,0 +1,262 @@
+import array
+import itertools
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+from gridable.storage import NestedStorage
+
+# Files hold a header, a chunk of columns per top-level index, a directory of the chunks,
+# and a footer locating the directory. Chunks hold the depth of each stored value, their
+# flattened coordinates, and their values as a typed column or a pickled list.
+
+_MAGIC = b"GRID"
+_HEADER = struct.Struct("<4sB3x")
+_ENTRY = struct.Struct("<qQQ")
+_FOOTER = struct.Struct("<QI4s")
+_CHUNK = struct.Struct("<Ic")
+_VERSION = 1
+
+_INT64 = (-(2**63), 2**63 - 1)
+
+
+def _column(typecode, values):
+    """Returns the little endian bytes of a typed column."""
+    column = array.array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_column(typecode, buffer):
+    """Returns a typed column read from little endian bytes."""
+    column = array.array(typecode)
+    column.frombytes(buffer)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _value_typecode(values):
+    """Returns the typecode of the column able to hold all values, or O for pickled values."""
+    if all(type(value) is int and _INT64[0] <= value <= _INT64[1] for value in values):
+        return "q"
+    if all(type(value) is float for value in values):
+        return "d"
+    return "O"
+
+
+def _encode_chunk(rows):
+    """Returns the bytes of a chunk holding a list of coordinate and value pairs."""
+    coordinates = []
+    for location, _ in rows:
+        for index in location:
+            if type(index) is not int or not _INT64[0] <= index <= _INT64[1]:
+                raise Exception("Only integer coordinates can be saved")
+        coordinates.extend(location)
+
+    values = [value for (_, value) in rows]
+    typecode = _value_typecode(values)
+    return b"".join(
+        [
+            _CHUNK.pack(len(rows), typecode.encode()),
+            _column("B", [len(location) for (location, _) in rows]),
+            _column("q", coordinates),
+            _column(typecode, values) if typecode != "O" else pickle.dumps(values),
+        ]
+    )
+
+
+def _decode_chunk(buffer):
+    """Creates a generator of the coordinate and value pairs of a chunk."""
+    count, typecode = _CHUNK.unpack_from(buffer)
+    typecode = typecode.decode()
+    position = _CHUNK.size
+
+    depths = _read_column("B", buffer[position : position + count])
+    position += count
+    size = sum(depths) * 8
+    coordinates = _read_column("q", buffer[position : position + size])
+    position += size
+
+    if typecode == "O":
+        values = pickle.loads(buffer[position:])
+    else:
+        values = _read_column(typecode, buffer[position : position + count * 8])
+
+    start = 0
+    for depth, value in zip(depths, values):
+        yield (tuple(coordinates[start : start + depth]), value)
+        start += depth
+
+
+def write(items, file):
+    """Writes coordinate and value pairs to a binary file object, chunked by top-level index.
+    Pairs sharing a top-level index must be consecutive, as produced by storages."""
+    file.write(_HEADER.pack(_MAGIC, _VERSION))
+    position = _HEADER.size
+    directory = []
+
+    for key, rows in itertools.groupby(items, lambda item: item[0][0]):
+        chunk = _encode_chunk(list(rows))
+        if type(key) is not int:
+            raise Exception("Only integer coordinates can be saved")
+        file.write(chunk)
+        directory.append(_ENTRY.pack(key, position, len(chunk)))
+        position += len(chunk)
+
+    file.write(b"".join(directory))
+    file.write(_FOOTER.pack(position, len(directory), _MAGIC))
+
+
+def save(items, path):
+    """Writes coordinate and value pairs to a file beside the path, which replaces the file
+    at the path once every pair has been written, so a failed save leaves it intact."""
+    temporary = "{}.{}-{}.tmp".format(path, os.getpid(), threading.get_ident())
+    descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            write(items, file)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def directory(buffer):
+    """Returns a mapping of each top-level index to the offset and length of its chunk."""
+    magic, version = _HEADER.unpack_from(buffer)
+    offset, count, footer = _FOOTER.unpack_from(buffer, len(buffer) - _FOOTER.size)
+    if magic != _MAGIC or footer != _MAGIC:
+        raise Exception("Not a grid file")
+    if version != _VERSION:
+        raise Exception("Unsupported grid file version {}".format(version))
+
+    chunks = {}
+    for entry in range(count):
+        key, start, length = _ENTRY.unpack_from(buffer, offset + entry * _ENTRY.size)
+        chunks[key] = (start, length)
+    return chunks
+
+
+def read(buffer):
+    """Creates a generator of the coordinate and value pairs held in the bytes of a file."""
+    buffer = memoryview(buffer)
+    for start, length in directory(buffer).values():
+        yield from _decode_chunk(buffer[start : start + length])
+
+
+class MappedStorage(NestedStorage):
+    """Stores values in nested dicts, loaded lazily from a memory mapped grid file. The chunk
+    of each top-level index is decoded when a cell beneath it is first accessed. Taking a
+    snapshot decodes every chunk."""
+
+    shares_snapshots = False
+
+    def __init__(self, path):
+        super().__init__()
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pending = directory(self._map)
+        self._loading = threading.Lock()
+        for key in self._pending:
+            self._root[key] = {}
+        if not self._pending:
+            self._close()
+
+    def _close(self):
+        """Releases the memory map once every chunk has been loaded."""
+        self._map.close()
+        self._file.close()
+
+    def _load(self, coordinates):
+        """Loads the chunk holding the values at or below the coordinates, or every chunk for
+        the root."""
+        if not self._pending:
+            return
+        if coordinates and coordinates[0] not in self._pending:
+            return
+
+        with self._loading:
+            for key in [coordinates[0]] if coordinates else list(self._pending):
+                if key not in self._pending:
+                    continue
+                start, length = self._pending[key]
+                view = memoryview(self._map)
+                try:
+                    for location, value in _decode_chunk(view[start : start + length]):
+                        if len(location) == 1:
+                            self._root[key] = value
+                            self.generation += 1
+                        else:
+                            NestedStorage.set(self, location, value)
+                finally:
+                    view.release()
+                del self._pending[key]
+            if not self._pending:
+                self._close()
+
+    def value(self, coordinates):
+        if coordinates:
+            self._load(coordinates)
+        return super().value(coordinates)
+
+    def is_node(self, coordinates):
+        if coordinates:
+            self._load(coordinates)
+        return super().is_node(coordinates)
+
+    def keys(self, coordinates):
+        if coordinates:
+            self._load(coordinates)
+        return super().keys(coordinates)
+
+    def content(self, coordinates):
+        self._load(coordinates)
+        return super().content(coordinates)
+
+    def node(self, coordinates):
+        if coordinates:
+            self._load(coordinates)
+        return super().node(coordinates)
+
+    def child_node(self, node, index):
+        if node is self._root:
+            self._load((index,))
+        return super().child_node(node, index)
+
+    def child_value(self, node, index):
+        if node is self._root:
+            self._load((index,))
+        return super().child_value(node, index)
+
+    def set(self, coordinates, value):
+        self._load(coordinates)
+        super().set(coordinates, value)
+
+    def update(self, items):
+        for coordinates, value in items:
+            self.set(coordinates, value)
+
+    def delete(self, coordinates):
+        self._load(coordinates)
+        super().delete(coordinates)
+
+    def leaves(self, coordinates=()):
+        self._load(coordinates)
+        return super().leaves(coordinates)
+
+    def within(self, coordinates, bounds):
+        if coordinates or not bounds or bounds[0] is None:
+            self._load(coordinates)
+        else:
+            start, stop = bounds[0]
+            for key in [key for key in list(self._pending) if start <= key <= stop]:
+                self._load((key,))
+        return super().within(coordinates, bounds)
+
+    def snapshot(self):
+        self._load(())
+        return super().snapshot()
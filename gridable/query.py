@@ -0,0 +1,100 @@
+import itertools
+
+
+class Query:
+    """A lazy query over the values stored below a cell. Each step returns a new query, and
+    all steps run together in a single traversal of the grid's storage once iterated."""
+
+    def __init__(self, cell, bounds=None, steps=(), limit=None):
+        self._cell = cell
+        self._bounds = bounds
+        self._steps = steps
+        self._limit = limit
+
+    def _extend(self, **changes):
+        """Returns a copy of the query with some of its steps replaced."""
+        options = dict(bounds=self._bounds, steps=self._steps, limit=self._limit)
+        options.update(changes)
+        return Query(self._cell, **options)
+
+    def where(self, predicate):
+        """Keeps only the values for which the predicate returns true."""
+        return self._extend(steps=self._steps + ((True, predicate),))
+
+    def map(self, func):
+        """Replaces each value with the result of a function applied to it."""
+        return self._extend(steps=self._steps + ((False, func),))
+
+    def within(self, bounds):
+        """Keeps only the values within the inclusive (start, stop) bounds of each dimension
+        below the cell. None leaves a dimension unbounded. Bounds are applied while
+        traversing the grid, skipping over cells outside of them entirely."""
+        bounds = list(bounds)
+        if self._bounds is not None:
+            for dimension, previous in enumerate(self._bounds):
+                if dimension >= len(bounds):
+                    bounds.append(previous)
+                elif previous is not None and bounds[dimension] is not None:
+                    bounds[dimension] = (
+                        max(previous[0], bounds[dimension][0]),
+                        min(previous[1], bounds[dimension][1]),
+                    )
+                elif previous is not None:
+                    bounds[dimension] = previous
+        return self._extend(bounds=tuple(bounds))
+
+    def limit(self, count):
+        """Stops after the given number of results."""
+        if self._limit is not None:
+            count = min(count, self._limit)
+        return self._extend(limit=count)
+
+    def _items(self):
+        """Creates a generator of the coordinate and value pairs passing every step."""
+        grid = self._cell._grid
+        coordinates = self._cell._coordinates
+        if self._bounds is None:
+            items = grid._storage.items(coordinates)
+        elif grid._index is not None:
+            storage = grid._storage
+            items = (
+                (location, storage.value(location))
+                for location in grid._index.within(coordinates, self._bounds)
+            )
+        else:
+            items = grid._storage.within(coordinates, self._bounds)
+
+        steps = self._steps
+        for location, value in items:
+            if value is None:
+                continue
+            for is_filter, func in steps:
+                if is_filter:
+                    if not func(value):
+                        break
+                else:
+                    value = func(value)
+            else:
+                yield (location, value)
+
+    def __iter__(self):
+        """Creates a generator of the coordinate and value pairs of the results."""
+        return itertools.islice(self._items(), self._limit)
+
+    def values(self):
+        """Creates a generator of the values of the results."""
+        return (value for _, value in self)
+
+    def coordinates(self):
+        """Creates a generator of the coordinates of the results."""
+        return (coordinates for coordinates, _ in self)
+
+    def cells(self):
+        """Creates a generator of the cells holding the results."""
+        from gridable.grid import Cell
+
+        return (Cell(self._cell._grid, coordinates) for coordinates, _ in self)
+
+    def first(self):
+        """Returns the first coordinate and value pair of the results, or None."""
+        return next(iter(self), None)
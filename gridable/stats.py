@@ -0,0 +1,236 @@
+import threading
+import time
+from gridable.storage import Storage
+from gridable.threadlock import GridLock
+
+
+class Histogram:
+    """Count, total and maximum of observed amounts, with counts in power of two buckets.
+    Durations are observed in seconds and bucketed by microsecond."""
+
+    __slots__ = ("count", "total", "maximum", "buckets", "_scale")
+
+    def __init__(self, scale=1):
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+        self.buckets = {}
+        self._scale = scale
+
+    def observe(self, amount):
+        """Records an observed amount."""
+        self.count += 1
+        self.total += amount
+        if amount > self.maximum:
+            self.maximum = amount
+        bucket = int(amount * self._scale).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def quantile(self, fraction):
+        """Returns the upper bound of the bucket holding a quantile of the observations."""
+        remaining = fraction * self.count
+        for bucket in sorted(self.buckets):
+            remaining -= self.buckets[bucket]
+            if remaining <= 0:
+                return min((2**bucket) / self._scale, self.maximum)
+        return self.maximum
+
+    def summary(self):
+        """Returns a dict of the count, total, maximum, median and 99th percentile."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.maximum,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Stats:
+    """Counters and histograms recorded by an instrumented grid, which can be passed to
+    exporter callbacks."""
+
+    def __init__(self, exporters=()):
+        self.counters = {}
+        self.histograms = {}
+        self._exporters = list(exporters)
+        self._mutex = threading.Lock()
+
+    def count(self, name, amount=1):
+        """Adds an amount to a counter."""
+        with self._mutex:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, amount, scale=10**6):
+        """Records an amount in a histogram, such as a duration in seconds."""
+        with self._mutex:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(scale)
+            histogram.observe(amount)
+
+    def snapshot(self):
+        """Returns a dict of the counters and a summary of each histogram."""
+        with self._mutex:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: histogram.summary()
+                    for name, histogram in self.histograms.items()
+                },
+            }
+
+    def reset(self):
+        """Clears the counters and histograms."""
+        with self._mutex:
+            self.counters = {}
+            self.histograms = {}
+
+    def add_exporter(self, exporter):
+        """Registers a callback receiving snapshots when the stats are exported."""
+        self._exporters.append(exporter)
+
+    def export(self):
+        """Passes a snapshot of the stats to each exporter, and returns it."""
+        snapshot = self.snapshot()
+        for exporter in self._exporters:
+            exporter(snapshot)
+        return snapshot
+
+
+class InstrumentedLock(GridLock):
+    """Grid lock recording the time spent waiting for and holding it."""
+
+    def __init__(self, stats, stripes=1):
+        super().__init__(stripes)
+        self._stats = stats
+
+    def _held(self):
+        held = super()._held()
+        if not hasattr(held, "since"):
+            held.since = None
+        return held
+
+    def acquire_read(self):
+        outermost = not self._held().reads and not self._held().writes
+        start = time.perf_counter()
+        super().acquire_read()
+        if outermost:
+            acquired = self._held().since = time.perf_counter()
+            self._stats.count("lock.read")
+            self._stats.observe("lock.read.wait", acquired - start)
+
+    def release_read(self):
+        held = self._held()
+        if held.reads == 1 and not held.writes:
+            self._stats.observe("lock.read.hold", time.perf_counter() - held.since)
+        super().release_read()
+
+    def acquire_write(self, key=None):
+        outermost = not self._held().writes
+        start = time.perf_counter()
+        super().acquire_write(key)
+        if outermost:
+            acquired = self._held().since = time.perf_counter()
+            self._stats.count("lock.write")
+            self._stats.observe("lock.write.wait", acquired - start)
+
+    def release_write(self):
+        held = self._held()
+        if held.writes == 1:
+            self._stats.observe("lock.write.hold", time.perf_counter() - held.since)
+        super().release_write()
+
+
+class InstrumentedStorage(Storage):
+    """Wraps a storage, counting the calls to each operation and recording the depth of the
+    coordinates read and the time taken by writes."""
+
+    def __init__(self, storage, stats):
+        self._storage = storage
+        self._stats = stats
+
+    @property
+    def generation(self):
+        return self._storage.generation
+
+    @property
+    def shares_snapshots(self):
+        return self._storage.shares_snapshots
+
+    def _read(self, name, coordinates):
+        """Records a read of the coordinates."""
+        self._stats.count("storage." + name)
+        self._stats.observe("storage.depth", len(coordinates), scale=1)
+
+    def _timed(self, name, func, *args):
+        """Calls a storage operation, recording its duration."""
+        self._stats.count("storage." + name)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._stats.observe("storage." + name, time.perf_counter() - start)
+
+    def node(self, coordinates):
+        self._read("node", coordinates)
+        return self._storage.node(coordinates)
+
+    def child_node(self, node, index):
+        self._stats.count("storage.child_node")
+        return self._storage.child_node(node, index)
+
+    def child_value(self, node, index):
+        self._stats.count("storage.child_value")
+        return self._storage.child_value(node, index)
+
+    def value(self, coordinates):
+        self._read("value", coordinates)
+        return self._storage.value(coordinates)
+
+    def is_node(self, coordinates):
+        self._read("is_node", coordinates)
+        return self._storage.is_node(coordinates)
+
+    def keys(self, coordinates):
+        self._read("keys", coordinates)
+        return self._storage.keys(coordinates)
+
+    def content(self, coordinates):
+        self._read("content", coordinates)
+        return self._storage.content(coordinates)
+
+    def set(self, coordinates, value):
+        return self._timed("set", self._storage.set, coordinates, value)
+
+    def update(self, items):
+        count = [0]
+
+        def counted():
+            for item in items:
+                count[0] += 1
+                yield item
+
+        try:
+            return self._timed("update", self._storage.update, counted())
+        finally:
+            self._stats.count("storage.update.items", count[0])
+
+    def delete(self, coordinates):
+        return self._timed("delete", self._storage.delete, coordinates)
+
+    def items(self, coordinates=()):
+        self._read("items", coordinates)
+        return self._storage.items(coordinates)
+
+    def leaves(self, coordinates=()):
+        self._read("leaves", coordinates)
+        return self._storage.leaves(coordinates)
+
+    def within(self, coordinates, bounds):
+        self._read("within", coordinates)
+        return self._storage.within(coordinates, bounds)
+
+    def snapshot(self):
+        self._stats.count("storage.snapshot")
+        return self._storage.snapshot()
@@ -0,0 +1,75 @@
+import functools
+import itertools
+
+
+@functools.lru_cache(maxsize=64)
+def offsets(dimensions, distance=1, metric="chebyshev"):
+    """Returns the offsets of all cells within a distance of a cell, including the cell
+    itself. Chebyshev neighborhoods are square, and Manhattan ones diamond shaped."""
+    if metric not in ("chebyshev", "manhattan"):
+        raise Exception("Unknown metric {}".format(metric))
+    return tuple(
+        offset
+        for offset in itertools.product(
+            range(-distance, distance + 1), repeat=dimensions
+        )
+        if metric == "chebyshev" or sum(abs(delta) for delta in offset) <= distance
+    )
+
+
+def kernel_offsets(kernel):
+    """Returns a mapping of offsets to weights from a mapping, or from nested lists of weights
+    with an odd size along each dimension and centered on the cell."""
+    if hasattr(kernel, "tolist"):
+        kernel = kernel.tolist()
+    if hasattr(kernel, "items"):
+        return dict(kernel)
+
+    weights = {}
+
+    def crawl(content, offset):
+        if not isinstance(content, (list, tuple)):
+            weights[offset] = content
+            return
+        if len(content) % 2 == 0:
+            raise Exception("Kernel dimensions must have an odd size")
+        for index, inner in enumerate(content):
+            crawl(inner, offset + (index - len(content) // 2,))
+
+    crawl(kernel, ())
+    return weights
+
+
+def neighbors_of(storage, cells, distance=1, include_empty=True, metric="chebyshev"):
+    """Returns a mapping of the coordinates of each cell to a list of the coordinate and value
+    pairs of its neighbors."""
+    result = {}
+    for coordinates in cells:
+        neighbors = result[coordinates] = []
+        for offset in offsets(len(coordinates), distance, metric):
+            neighbor = tuple(index + delta for index, delta in zip(coordinates, offset))
+            value = storage.value(neighbor)
+            if value is not None or include_empty:
+                neighbors.append((neighbor, value))
+    return result
+
+
+def convolve(storage, kernel, include_empty=False):
+    """Returns a mapping of coordinates to the sum of the kernel weights multiplied by the
+    values at each offset from them. Without include_empty, only coordinates holding values
+    are included."""
+    weights = list(kernel_offsets(kernel).items())
+    result = {}
+    for coordinates, value in storage.items():
+        for offset, weight in weights:
+            if len(offset) != len(coordinates):
+                raise Exception("Unequal number of dimensions")
+            target = tuple(index - delta for index, delta in zip(coordinates, offset))
+            result[target] = result.get(target, 0) + weight * value
+
+    if not include_empty:
+        result = {
+            coordinates: result.get(coordinates, 0)
+            for coordinates, _ in storage.items()
+        }
+    return result
@@ -0,0 +1,382 @@
+import threading
+import weakref
+
+
+class Storage:
+    """Base class for the engines storing grid values by coordinate tuple.
+
+    Nodes are opaque handles to the locations holding nested cells, letting cells skip
+    resolving their parent from the root. The generation changes whenever a node handed
+    out may have become stale."""
+
+    generation = 0
+
+    # Whether snapshots share structure with the live storage, so that taking one and then
+    # modifying the storage costs in proportion to the changes rather than to its size.
+    shares_snapshots = False
+
+    def node(self, coordinates):
+        """Returns the node holding nested cells at the coordinates, or None."""
+        return coordinates if self.is_node(coordinates) else None
+
+    def child_node(self, node, index):
+        """Returns the node nested at an index of a node, or None."""
+        return self.node(node + (index,))
+
+    def child_value(self, node, index):
+        """Returns the value stored at an index of a node, or None."""
+        return self.value(node + (index,))
+
+    def value(self, coordinates):
+        """Returns the value stored at the coordinates, or None."""
+        raise NotImplementedError()
+
+    def is_node(self, coordinates):
+        """Returns a boolean indicating if the coordinates hold nested cells."""
+        raise NotImplementedError()
+
+    def keys(self, coordinates):
+        """Returns the indices nested directly below the coordinates."""
+        raise NotImplementedError()
+
+    def content(self, coordinates):
+        """Returns the value at the coordinates, a nested dict of inner values, or None."""
+        raise NotImplementedError()
+
+    def set(self, coordinates, value):
+        """Stores a value at the coordinates, replacing any nested cells."""
+        raise NotImplementedError()
+
+    def update(self, items):
+        """Stores each value of an iterable of coordinate and value pairs."""
+        for coordinates, value in items:
+            self.set(coordinates, value)
+
+    def delete(self, coordinates):
+        """Deletes the value or nested cells at the coordinates, pruning empty parents."""
+        raise NotImplementedError()
+
+    def snapshot(self):
+        """Returns a storage holding the current values, which must not be modified. Storages
+        that don't share snapshots copy every value into memory."""
+        snapshot = NestedStorage()
+        for coordinates, value in self.items():
+            snapshot.set(coordinates, value)
+        return snapshot
+
+    def leaves(self, coordinates=()):
+        """Creates a generator of the coordinates, parent node and value of each cell at or
+        below the coordinates not holding nested cells, including cells below them storing
+        None."""
+        if not self.is_node(coordinates):
+            value = self.value(coordinates)
+            if value is not None:
+                yield (coordinates, self.node(coordinates[:-1]), value)
+            return
+        node = self.node(coordinates)
+        for index in list(self.keys(coordinates)):
+            location = coordinates + (index,)
+            if self.is_node(location):
+                yield from self.leaves(location)
+            else:
+                yield (location, node, self.value(location))
+
+    def items(self, coordinates=()):
+        """Creates a generator of coordinate and value pairs stored at or below the coordinates."""
+        if self.is_node(coordinates):
+            for index in list(self.keys(coordinates)):
+                yield from self.items(coordinates + (index,))
+        else:
+            value = self.value(coordinates)
+            if value is not None:
+                yield (coordinates, value)
+
+    def within(self, coordinates, bounds):
+        """Creates a generator of coordinate and value pairs stored below the coordinates,
+        within the inclusive (start, stop) bounds of each following dimension. None leaves a
+        dimension unbounded, and values above the last bounded dimension are skipped."""
+        depth = len(bounds)
+
+        def generator(location, level):
+            if not self.is_node(location):
+                value = self.value(location)
+                if value is not None and level >= depth:
+                    yield (location, value)
+                return
+            keys = self.keys(location)
+            if level < depth and bounds[level] is not None:
+                start, stop = bounds[level]
+                keys = [index for index in keys if start <= index <= stop]
+            for index in list(keys):
+                yield from generator(location + (index,), level + 1)
+
+        yield from generator(coordinates, 0)
+
+
+class NestedStorage(Storage):
+    """Stores values in nested dicts, one level per dimension.
+
+    Snapshots share the nested dicts with the live storage. While any snapshot is alive,
+    writes copy each shared dict on their path before modifying it."""
+
+    shares_snapshots = True
+
+    def __init__(self):
+        self._root = {}
+        self._snapshots = weakref.WeakSet()
+        self._sharing = threading.Lock()
+        self._owned = None
+
+    def _writable_root(self):
+        """Returns the root dict and the ids of dicts owned by the live storage, first
+        copying the root if shared with a snapshot. The ids are None when not shared."""
+        owned = self._owned
+        if owned is not None:
+            with self._sharing:
+                if not self._snapshots:
+                    self._owned = owned = None
+                elif id(self._root) not in owned:
+                    self._root = self._copy(self._root, owned)
+        return self._root, owned
+
+    def _writable(self, parent, index, owned):
+        """Returns the dict at an index of its parent, first copying it if it is shared with a snapshot."""
+        child = parent[index]
+        if owned is not None and id(child) not in owned:
+            child = parent[index] = self._copy(child, owned)
+        return child
+
+    def _copy(self, content, owned):
+        """Returns a copy of a dict, owned by the live storage."""
+        self.generation += 1
+        content = dict(content)
+        owned.add(id(content))
+        return content
+
+    def _path(self, coordinates):
+        """Returns the writable dict at the coordinates, creating any missing dicts."""
+        cursor, owned = self._writable_root()
+        for index in coordinates:
+            child = cursor.get(index)
+            if child is None:
+                child = cursor[index] = {}
+                if owned is not None:
+                    owned.add(id(child))
+            elif not isinstance(child, dict):
+                raise Exception("Not subscriptable")
+            elif owned is not None and id(child) not in owned:
+                child = cursor[index] = self._copy(child, owned)
+            cursor = child
+        return cursor
+
+    def _node(self, coordinates):
+        """Walks the nested dicts to the coordinates, returning None if they aren't persisted."""
+        content = self._root
+        for index in coordinates:
+            if not isinstance(content, dict) or index not in content:
+                return None
+            content = content[index]
+        return content
+
+    def value(self, coordinates):
+        content = self._node(coordinates)
+        return content if not isinstance(content, dict) else None
+
+    def is_node(self, coordinates):
+        return isinstance(self._node(coordinates), dict)
+
+    def keys(self, coordinates):
+        content = self._node(coordinates)
+        return content.keys() if isinstance(content, dict) else ()
+
+    def content(self, coordinates):
+        return self._node(coordinates)
+
+    def node(self, coordinates):
+        content = self._node(coordinates)
+        return content if isinstance(content, dict) else None
+
+    def child_node(self, node, index):
+        content = node.get(index)
+        return content if isinstance(content, dict) else None
+
+    def child_value(self, node, index):
+        content = node.get(index)
+        return content if not isinstance(content, dict) else None
+
+    def set(self, coordinates, value):
+        cursor = self._path(coordinates[:-1])
+        if isinstance(cursor.get(coordinates[-1]), dict):
+            self.generation += 1
+        cursor[coordinates[-1]] = value
+
+    def update(self, items):
+        parent = cursor = None
+        for coordinates, value in items:
+            if cursor is None or coordinates[:-1] != parent:
+                parent = coordinates[:-1]
+                cursor = self._path(parent)
+            if isinstance(cursor.get(coordinates[-1]), dict):
+                self.generation += 1
+            cursor[coordinates[-1]] = value
+
+    def delete(self, coordinates):
+        self.generation += 1
+        root, owned = self._writable_root()
+        path = [root]
+        for index in coordinates[:-1]:
+            path.append(self._writable(path[-1], index, owned))
+        del path[-1][coordinates[-1]]
+
+        for depth in range(len(coordinates) - 1, 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][coordinates[depth - 1]]
+
+    def items(self, coordinates=()):
+        for location, _, value in self.leaves(coordinates):
+            if value is not None:
+                yield (location, value)
+
+    def leaves(self, coordinates=()):
+        def generator(parent, content, location):
+            if isinstance(content, dict):
+                for index in list(content):
+                    if index in content:
+                        yield from generator(
+                            content, content[index], location + (index,)
+                        )
+            elif content is not None or location != coordinates:
+                yield (location, parent, content)
+
+        yield from generator(
+            self._node(coordinates[:-1]), self._node(coordinates), coordinates
+        )
+
+    def within(self, coordinates, bounds):
+        depth = len(bounds)
+
+        def generator(content, location, level):
+            if not isinstance(content, dict):
+                if content is not None and level >= depth:
+                    yield (location, content)
+                return
+            if level < depth and bounds[level] is not None:
+                start, stop = bounds[level]
+                keys = [index for index in content if start <= index <= stop]
+            else:
+                keys = list(content)
+            for index in keys:
+                yield from generator(content.get(index), location + (index,), level + 1)
+
+        yield from generator(self._node(coordinates), coordinates, 0)
+
+    def snapshot(self):
+        snapshot = NestedStorage()
+        snapshot._root = self._root
+        self._snapshots.add(snapshot)
+        self._owned = set()
+        return snapshot
+
+
+class FlatStorage(Storage):
+    """Stores values in one dict keyed by the full coordinate tuple, with an index of
+    the child indices below each coordinate prefix.
+
+    Snapshots share the dicts with the live storage, but the first write while any snapshot
+    is alive copies them in full, so snapshots aren't cheap for large grids."""
+
+    def __init__(self):
+        self._values = {}
+        self._children = {(): {}}
+        self._snapshots = weakref.WeakSet()
+        self._sharing = threading.Lock()
+
+    def _unshare(self):
+        """Copies the dicts shared with live snapshots before they are modified."""
+        if self._snapshots:
+            with self._sharing:
+                if self._snapshots:
+                    self._values = dict(self._values)
+                    self._children = {
+                        prefix: dict(children)
+                        for prefix, children in self._children.items()
+                    }
+                    self._snapshots = weakref.WeakSet()
+
+    def snapshot(self):
+        snapshot = FlatStorage()
+        snapshot._values = self._values
+        snapshot._children = self._children
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    def value(self, coordinates):
+        return self._values.get(coordinates)
+
+    def is_node(self, coordinates):
+        return coordinates in self._children
+
+    def keys(self, coordinates):
+        children = self._children.get(coordinates)
+        return children.keys() if children is not None else ()
+
+    def content(self, coordinates):
+        children = self._children.get(coordinates)
+        if children is None:
+            return self._values.get(coordinates)
+        return {index: self.content(coordinates + (index,)) for index in list(children)}
+
+    def set(self, coordinates, value):
+        self._unshare()
+        if coordinates in self._children:
+            self._remove(coordinates)
+        self._link(coordinates)
+        self._values[coordinates] = value
+
+    def delete(self, coordinates):
+        self._unshare()
+        if coordinates in self._children:
+            self._remove(coordinates)
+        else:
+            del self._values[coordinates]
+
+        while coordinates:
+            parent = coordinates[:-1]
+            siblings = self._children[parent]
+            del siblings[coordinates[-1]]
+            if siblings or not parent:
+                break
+            del self._children[parent]
+            coordinates = parent
+
+    def items(self, coordinates=()):
+        children = self._children.get(coordinates)
+        if children is None:
+            value = self._values.get(coordinates)
+            if value is not None:
+                yield (coordinates, value)
+        else:
+            for index in list(children):
+                yield from self.items(coordinates + (index,))
+
+    def _link(self, coordinates):
+        """Registers the coordinates with the index of their parent, creating missing parents."""
+        parent = coordinates[:-1]
+        children = self._children.get(parent)
+        if children is None:
+            if self._values.get(parent) is not None:
+                raise Exception("Not subscriptable")
+            self._values.pop(parent, None)
+            self._link(parent)
+            children = self._children[parent] = {}
+        children[coordinates[-1]] = None
+
+    def _remove(self, coordinates):
+        """Removes the nested cells below the coordinates, leaving the parent index untouched."""
+        for index in self._children.pop(coordinates):
+            child = coordinates + (index,)
+            if child in self._children:
+                self._remove(child)
+            else:
+                self._values.pop(child, None)
@@ -1,40 +1,162 @@
+import functools
 import threading
 
 
-_lock = threading.Condition(threading.Lock())
-_readers = 0
-_writers = 0
+class GridLock:
+    """Reader/writer lock for a single grid.
+
+    Waiting writers take preference over new readers, so a steady stream of readers
+    can't starve them. Writers are serialized per stripe of top-level coordinates,
+    allowing writers to disjoint stripes to proceed together. Locks are reentrant
+    for the thread holding them, though a thread writing to one stripe can't go on to
+    write to other stripes, as taking them while holding it could deadlock."""
+
+    def __init__(self, stripes=1):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers = 0
+        self._waiting_writers = 0
+        self._stripes = [threading.Lock() for _ in range(max(stripes, 1))]
+        self._local = threading.local()
+
+    def _held(self):
+        """Returns the thread local record of the locks held by the current thread."""
+        local = self._local
+        if not hasattr(local, "reads"):
+            local.reads = 0
+            local.writes = 0
+            local.stripes = ()
+        return local
+
+    def _stripes_for(self, key):
+        """Returns the stripe locks guarding a top-level coordinate, or all of them for None."""
+        if key is None or len(self._stripes) == 1:
+            return self._stripes
+        return (self._stripes[hash(key) % len(self._stripes)],)
+
+    def acquire_read(self):
+        """Acquires the lock for reading, blocking while writers are active or waiting."""
+        held = self._held()
+        if held.reads or held.writes:
+            held.reads += 1
+            return
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self._writers and not self._waiting_writers
+            )
+            self._readers += 1
+        held.reads += 1
+
+    def release_read(self):
+        """Releases the lock for reading."""
+        held = self._held()
+        held.reads -= 1
+        if held.reads or held.writes:
+            return
+
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self, key=None):
+        """Acquires the lock for writing to the stripe of a top-level coordinate, or the
+        whole grid when no coordinate is given."""
+        held = self._held()
+        if held.writes:
+            if any(stripe not in held.stripes for stripe in self._stripes_for(key)):
+                raise Exception(
+                    "Cannot modify the grid outside the stripe being written"
+                )
+            held.writes += 1
+            return
+        if held.reads:
+            raise Exception("Cannot modify the grid while reading it")
+
+        with self._condition:
+            self._waiting_writers += 1
+            self._condition.wait_for(lambda: not self._readers)
+            self._waiting_writers -= 1
+            self._writers += 1
+
+        held.stripes = self._stripes_for(key)
+        for stripe in held.stripes:
+            stripe.acquire()
+        held.writes += 1
+
+    def release_write(self):
+        """Releases the lock for writing."""
+        held = self._held()
+        held.writes -= 1
+        if held.writes:
+            return
+
+        for stripe in reversed(held.stripes):
+            stripe.release()
+        held.stripes = ()
+
+        with self._condition:
+            self._writers -= 1
+            if not self._writers:
+                self._condition.notify_all()
+
+
+class NullLock(GridLock):
+    """Lock for grids that are never modified, such as snapshots, which never blocks."""
+
+    def acquire_read(self):
+        pass
+
+    def release_read(self):
+        pass
+
+    def acquire_write(self, key=None):
+        pass
+
+    def release_write(self):
+        pass
+
+
+_lock = GridLock()
+
+
+def _lock_for(owner):
+    """Returns the lock of the grid owning a decorated method, or the shared module lock."""
+    lock = getattr(getattr(owner, "_grid", None), "_lock", None)
+    return lock if isinstance(lock, GridLock) else _lock
 
 
 def GridModifyLock(func):
     """Lock for modification, reading operations will block."""
 
+    @functools.wraps(func)
     def inner(*args, **kwargs):
-        global _lock
-        global _readers
-        global _writers
+        lock = _lock_for(args[0] if args else None)
+        lock.acquire_write()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            lock.release_write()
+
+    return inner
+
 
-        _lock.acquire()
-        _lock.wait_for(lambda: _readers == 0)
-        _writers += 1
-        _lock.release()
+def GridModifyItemLock(func):
+    """Lock for modification of a single item of a cell, reading operations and writers
+    to the same stripe of top-level coordinates will block."""
 
-        value = None
-        exception = None
+    @functools.wraps(func)
+    def inner(cell, index, *args, **kwargs):
+        coordinates = cell._coordinates
+        if not coordinates and not isinstance(index, slice):
+            coordinates = (index,)
+        lock = _lock_for(cell)
+        lock.acquire_write(coordinates[0] if coordinates else None)
         try:
-            value = func(*args, **kwargs)
-        except Exception as e:
-            exception = e
+            return func(cell, index, *args, **kwargs)
         finally:
-            _lock.acquire()
-            _writers -= 1
-            if not _writers:
-                _lock.notify_all()
-            _lock.release()
-
-            if exception:
-                raise exception
-            return value
+            lock.release_write()
 
     return inner
 
@@ -42,32 +164,13 @@ def GridModifyLock(func):
 def GridReadLock(func):
     """Lock for reading, modification operations will block."""
 
+    @functools.wraps(func)
     def inner(*args, **kwargs):
-        global _lock
-        global _readers
-        global _writers
-
-        _lock.acquire()
-        _lock.wait_for(lambda: _writers == 0)
-        _readers += 1
-        _lock.release()
-
-        value = None
-        exception = None
+        lock = _lock_for(args[0] if args else None)
+        lock.acquire_read()
         try:
-            value = func(*args, **kwargs)
-        except Exception as e:
-            exception = e
+            return func(*args, **kwargs)
         finally:
-
-            _lock.acquire()
-            _readers -= 1
-            if not _readers:
-                _lock.notify_all()
-            _lock.release()
-
-            if exception:
-                raise exception
-            return value
+            lock.release_read()
 
     return inner
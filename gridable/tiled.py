@@ -0,0 +1,168 @@
+import collections
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from gridable import persist
+from gridable.storage import NestedStorage, Storage
+
+# Rough memory held by each value of a tile in nested dicts, used to keep the values of
+# the tiles held in memory within the budget.
+_VALUE_BYTES = 100
+
+
+class TiledStorage(Storage):
+    """Stores values in tiles of consecutive top-level indices, each a nested dict storage.
+    Tiles are kept in memory within a budget of bytes, and the least recently used tiles
+    are spilled to files in a directory, to be loaded again when next accessed.
+
+    Coordinates must be integers. Snapshots copy every value into memory, including the
+    values of spilled tiles."""
+
+    def __init__(self, tile_size=1024, memory=256 * 2**20, directory=None):
+        if tile_size < 1:
+            raise Exception("Invalid tile size")
+        self._tile_size = tile_size
+        self._capacity = max(memory // _VALUE_BYTES, 1)
+        self._tiles = collections.OrderedDict()
+        self._counts = {}
+        self._resident = 0
+        self._spilled = set()
+        self._dirty = set()
+        self._rows = {}
+        self._mutex = threading.RLock()
+
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="gridable-")
+            weakref.finalize(self, shutil.rmtree, directory, True)
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+
+    def _key(self, coordinates):
+        """Returns the key of the tile holding the coordinates."""
+        if type(coordinates[0]) is not int:
+            raise Exception("Tiled storage requires integer coordinates")
+        return coordinates[0] // self._tile_size
+
+    def _file(self, key):
+        """Returns the path of the file holding a spilled tile."""
+        return os.path.join(self._directory, "{}.tile".format(key))
+
+    def _tile(self, coordinates, create=False):
+        """Returns the tile holding the coordinates, loading it if spilled, or None."""
+        key = self._key(coordinates)
+        with self._mutex:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+            if key in self._spilled:
+                tile = NestedStorage()
+                with open(self._file(key), "rb") as file:
+                    tile.update(persist.read(file.read()))
+                self._resident += self._counts[key]
+            elif create:
+                tile = NestedStorage()
+                self._counts[key] = 0
+            else:
+                return None
+            self._tiles[key] = tile
+            self._evict()
+            return tile
+
+    def _evict(self):
+        """Spills the least recently used tiles while over budget, keeping the newest."""
+        while self._resident > self._capacity and len(self._tiles) > 1:
+            key, tile = self._tiles.popitem(last=False)
+            if key in self._dirty or key not in self._spilled:
+                with open(self._file(key), "wb") as file:
+                    persist.write(
+                        ((location, value) for location, _, value in tile.leaves()),
+                        file,
+                    )
+                self._spilled.add(key)
+                self._dirty.discard(key)
+            self._resident -= self._counts[key]
+
+    def _count(self, tile, coordinates):
+        """Returns the number of cells stored at or below the coordinates of a tile, including
+        cells storing None."""
+        if tile.is_node(coordinates):
+            return sum(1 for _ in tile.leaves(coordinates))
+        return int(coordinates[-1] in tile.keys(coordinates[:-1]))
+
+    def _changed(self, coordinates, tile, delta):
+        """Records a change in the number of values of the tile holding the coordinates."""
+        key = self._key(coordinates)
+        self._counts[key] += delta
+        self._resident += delta
+        self._dirty.add(key)
+
+        if coordinates[0] in tile.keys(()):
+            self._rows[coordinates[0]] = None
+        else:
+            self._rows.pop(coordinates[0], None)
+
+        if not self._counts[key]:
+            del self._tiles[key]
+            del self._counts[key]
+            self._dirty.discard(key)
+            if key in self._spilled:
+                self._spilled.discard(key)
+                os.remove(self._file(key))
+        self._evict()
+
+    def value(self, coordinates):
+        if not coordinates:
+            return None
+        tile = self._tile(coordinates)
+        return tile.value(coordinates) if tile is not None else None
+
+    def is_node(self, coordinates):
+        if not coordinates:
+            return True
+        tile = self._tile(coordinates)
+        return tile is not None and tile.is_node(coordinates)
+
+    def keys(self, coordinates):
+        if not coordinates:
+            return list(self._rows)
+        tile = self._tile(coordinates)
+        return tile.keys(coordinates) if tile is not None else ()
+
+    def content(self, coordinates):
+        if not coordinates:
+            return {index: self.content((index,)) for index in list(self._rows)}
+        tile = self._tile(coordinates)
+        return tile.content(coordinates) if tile is not None else None
+
+    def set(self, coordinates, value):
+        with self._mutex:
+            tile = self._tile(coordinates, create=True)
+            removed = self._count(tile, coordinates)
+            tile.set(coordinates, value)
+            self._changed(coordinates, tile, 1 - removed)
+
+    def delete(self, coordinates):
+        with self._mutex:
+            if not coordinates:
+                for index in list(self._rows):
+                    self.delete((index,))
+                return
+            tile = self._tile(coordinates)
+            if tile is None:
+                raise KeyError(coordinates)
+            removed = self._count(tile, coordinates)
+            tile.delete(coordinates)
+            self._changed(coordinates, tile, -removed)
+
+    def items(self, coordinates=()):
+        if not coordinates:
+            for index in list(self._rows):
+                yield from self.items((index,))
+            return
+        tile = self._tile(coordinates)
+        if tile is not None:
+            yield from tile.items(coordinates)
@@ -0,0 +1,131 @@
+from collections.abc import Iterable
+
+# Marks a buffered delete, as None is stored like any other value.
+DELETED = object()
+
+
+def _lookup(value, indices):
+    """Returns the item of a nested iterable value at a sequence of indices, or None."""
+    for index in indices:
+        if not isinstance(value, Iterable) or isinstance(value, (str, bytes)):
+            return None
+        try:
+            value = value[index]
+        except (IndexError, KeyError, TypeError):
+            return None
+    if isinstance(value, Iterable) and not isinstance(value, (str, bytes)):
+        return None
+    return value
+
+
+class PendingCell:
+    """Location within a transaction, indexed like a cell."""
+
+    __slots__ = ("_transaction", "_coordinates")
+
+    def __init__(self, transaction, coordinates):
+        self._transaction = transaction
+        self._coordinates = coordinates
+
+    def __getitem__(self, index):
+        return PendingCell(self._transaction, self._coordinates + (index,))
+
+    def __setitem__(self, index, value):
+        self._transaction.set(self._coordinates + (index,), value)
+
+    def __delitem__(self, index):
+        self._transaction.delete(self._coordinates + (index,))
+
+    def value(self):
+        """Returns the value of the cell as seen by the transaction, or None."""
+        return self._transaction.value(self._coordinates)
+
+    def coordinates(self):
+        """Returns the coordinates of the cell."""
+        return self._coordinates
+
+
+class Transaction:
+    """Buffers writes and deletes to a grid, applying them under a single acquisition of
+    the grid's write lock when the transaction ends without an exception. The grid isn't
+    locked while buffering, so readers never block on an open transaction. If any change
+    fails, the rows modified so far are restored. Optimistic transactions also check that
+    the values they read haven't changed before applying their changes."""
+
+    def __init__(self, grid, optimistic=False):
+        self._grid = grid
+        self._operations = []
+        self._reads = {} if optimistic else None
+        self._open = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def __getitem__(self, index):
+        return PendingCell(self, (index,))
+
+    def __setitem__(self, index, value):
+        self.set((index,), value)
+
+    def __delitem__(self, index):
+        self.delete((index,))
+
+    def _check(self):
+        """Raises an exception once the transaction has ended."""
+        if not self._open:
+            raise Exception("The transaction has ended")
+
+    def set(self, coordinates, value):
+        """Buffers a value to store at the coordinates."""
+        self._check()
+        self._operations.append((tuple(coordinates), value))
+
+    def update(self, items):
+        """Buffers many values, given a mapping or iterable of coordinate and value pairs."""
+        if hasattr(items, "items"):
+            items = items.items()
+        for coordinates, value in items:
+            self.set(coordinates, value)
+
+    def delete(self, coordinates):
+        """Buffers the deletion of the value or nested cells at the coordinates."""
+        self._check()
+        self._operations.append((tuple(coordinates), DELETED))
+
+    def value(self, coordinates):
+        """Returns the value at the coordinates as seen by the transaction, including its
+        buffered changes, or None."""
+        coordinates = tuple(coordinates)
+        for pending, value in reversed(self._operations):
+            if coordinates[: len(pending)] == pending:
+                if value is DELETED:
+                    return None
+                return _lookup(value, coordinates[len(pending) :])
+            if pending[: len(coordinates)] == coordinates and value is not DELETED:
+                return None
+
+        from gridable.grid import Cell
+
+        value = Cell(self._grid, coordinates).value()
+        if self._reads is not None:
+            self._reads.setdefault(coordinates, value)
+        return value
+
+    def commit(self):
+        """Applies the buffered changes to the grid, and ends the transaction."""
+        self._check()
+        self._open = False
+        self._grid._commit(self._operations, self._reads or {})
+
+    def rollback(self):
+        """Discards the buffered changes, and ends the transaction."""
+        self._check()
+        self._open = False
+        self._operations = []
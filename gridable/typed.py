@@ -0,0 +1,282 @@
+import array
+import bisect
+import threading
+import weakref
+from gridable.storage import Storage
+
+TYPECODES = {
+    "int8": "b",
+    "uint8": "B",
+    "int16": "h",
+    "uint16": "H",
+    "int32": "i",
+    "uint32": "I",
+    "int64": "q",
+    "uint64": "Q",
+    "float32": "f",
+    "float64": "d",
+    "int": "q",
+    "float": "d",
+}
+
+
+def typecode(dtype):
+    """Returns the array typecode of a typecode, a type name, or a NumPy or Python type."""
+    if isinstance(dtype, str) and dtype in array.typecodes:
+        return dtype
+    name = dtype if isinstance(dtype, str) else getattr(dtype, "name", None)
+    if not isinstance(name, str):
+        name = getattr(dtype, "__name__", None)
+    if name not in TYPECODES:
+        raise Exception("Unsupported dtype {}".format(dtype))
+    return TYPECODES[name]
+
+
+# States of the slots of a row. Deleted slots are skipped until the row is compacted, while
+# empty slots hold None and nested slots mark locations holding nested cells.
+DELETED, VALUE, EMPTY, NESTED = 0, 1, 2, 3
+
+
+class Row:
+    """Cells directly below a location, kept in insertion order in a typed array of values,
+    an array of their indices and an array of slot states. A sorted array of the indices,
+    paired with their slots, finds the slot of an index. Deleting a cell marks its slot
+    instead of shifting the arrays."""
+
+    __slots__ = ("indices", "values", "states", "order", "slots", "count")
+
+    def __init__(self, typecode):
+        self.indices = array.array("i")
+        self.values = array.array(typecode)
+        self.states = bytearray()
+        self.order = array.array("i")
+        self.slots = array.array("i")
+        self.count = 0
+
+    def copy(self):
+        """Returns a row holding copies of the arrays."""
+        row = Row.__new__(Row)
+        row.indices = array.array(self.indices.typecode, self.indices)
+        row.values = array.array(self.values.typecode, self.values)
+        row.states = bytearray(self.states)
+        row.order = array.array(self.order.typecode, self.order)
+        row.slots = array.array("i", self.slots)
+        row.count = self.count
+        return row
+
+    def _slot(self, index):
+        """Returns the slot of an index, or None."""
+        position = bisect.bisect_left(self.order, index)
+        if position < len(self.order) and self.order[position] == index:
+            return self.slots[position]
+        return None
+
+    def state(self, index):
+        """Returns the state of the slot of an index, or DELETED."""
+        slot = self._slot(index)
+        return self.states[slot] if slot is not None else DELETED
+
+    def get(self, index):
+        """Returns the value at an index, or None."""
+        slot = self._slot(index)
+        if slot is None or self.states[slot] != VALUE:
+            return None
+        return self.values[slot]
+
+    def set(self, index, value, state=VALUE):
+        """Stores a value, None, or a nested marker at an index, keeping the slot of an index
+        already present. Indices are widened to 64 bits when needed."""
+        if value is None and state == VALUE:
+            state = EMPTY
+        order = self.order
+        position = len(order)
+        if order and index <= order[-1]:
+            position = bisect.bisect_left(order, index)
+            if position < len(order) and order[position] == index:
+                slot = self.slots[position]
+                if state == VALUE:
+                    self.values[slot] = value
+                self.states[slot] = state
+                return
+
+        if self.indices.typecode == "i" and not -(2**31) <= index < 2**31:
+            self.indices = array.array("q", self.indices)
+            order = self.order = array.array("q", order)
+        self.values.append(value if state == VALUE else 0)
+        self.indices.append(index)
+        self.states.append(state)
+        order.insert(position, index)
+        self.slots.insert(position, len(self.states) - 1)
+        self.count += 1
+
+    def delete(self, index):
+        """Deletes the cell at an index, compacting the arrays once mostly deleted."""
+        position = bisect.bisect_left(self.order, index)
+        if position == len(self.order) or self.order[position] != index:
+            raise KeyError(index)
+        self.states[self.slots[position]] = DELETED
+        del self.order[position]
+        del self.slots[position]
+        self.count -= 1
+        if self.count * 2 < len(self.states):
+            self._compact()
+
+    def _compact(self):
+        """Drops the deleted slots."""
+        kept = [slot for slot, state in enumerate(self.states) if state]
+        renumbered = {slot: position for position, slot in enumerate(kept)}
+        self.indices = array.array(
+            self.indices.typecode, [self.indices[s] for s in kept]
+        )
+        self.values = array.array(self.values.typecode, [self.values[s] for s in kept])
+        self.states = bytearray(self.states[s] for s in kept)
+        self.slots = array.array("i", [renumbered[s] for s in self.slots])
+
+    def entries(self):
+        """Creates a generator of the index, state and value of each cell, in the order the
+        indices were stored."""
+        for index, state, value in zip(self.indices, self.states, self.values):
+            if state:
+                yield (index, state, value if state == VALUE else None)
+
+    def keys(self):
+        """Returns the indices of the cells, in the order they were stored."""
+        return [index for index, state in zip(self.indices, self.states) if state]
+
+
+class TypedStorage(Storage):
+    """Stores values of a single type in typed arrays, one row for the cells directly below
+    each location holding nested cells. Coordinates must be integers. Cells keep the order
+    they were stored in, and None is stored as an empty slot, as with nested storage.
+
+    Writers to disjoint stripes of a grid share the rows above them, so rows are read and
+    modified under a mutex.
+
+    Snapshots share the rows with the live storage. While any snapshot is alive, the first
+    write copies the dict of rows, and each row is copied when first modified."""
+
+    shares_snapshots = True
+
+    def __init__(self, dtype):
+        self._typecode = typecode(dtype)
+        self._rows = {(): Row(self._typecode)}
+        self._snapshots = weakref.WeakSet()
+        self._sharing = threading.Lock()
+        self._owned = None
+        self._mutex = threading.RLock()
+
+    def _unshare(self):
+        """Copies the dict of rows if it is shared with a snapshot, before modifying it."""
+        owned = self._owned
+        if owned is not None:
+            with self._sharing:
+                if not self._snapshots:
+                    self._owned = None
+                elif id(self._rows) not in owned:
+                    self._rows = dict(self._rows)
+                    owned.add(id(self._rows))
+
+    def _writable(self, coordinates):
+        """Returns the row at the coordinates, first copying it if shared with a snapshot."""
+        row = self._rows[coordinates]
+        owned = self._owned
+        if owned is not None and id(row) not in owned:
+            row = self._rows[coordinates] = row.copy()
+            owned.add(id(row))
+        return row
+
+    def _row(self):
+        """Returns a new row owned by the live storage."""
+        row = Row(self._typecode)
+        if self._owned is not None:
+            self._owned.add(id(row))
+        return row
+
+    def snapshot(self):
+        snapshot = TypedStorage(self._typecode)
+        snapshot._rows = self._rows
+        self._snapshots.add(snapshot)
+        self._owned = set()
+        return snapshot
+
+    def value(self, coordinates):
+        with self._mutex:
+            row = self._rows.get(coordinates[:-1])
+            return row.get(coordinates[-1]) if row is not None and coordinates else None
+
+    def is_node(self, coordinates):
+        return coordinates in self._rows
+
+    def keys(self, coordinates):
+        with self._mutex:
+            row = self._rows.get(coordinates)
+            return row.keys() if row is not None else ()
+
+    def content(self, coordinates):
+        if coordinates not in self._rows:
+            return self.value(coordinates)
+        return {
+            index: self.content(coordinates + (index,))
+            for index in self.keys(coordinates)
+        }
+
+    def _link(self, coordinates):
+        """Creates the row at the coordinates, and any missing parents."""
+        if coordinates in self._rows:
+            return
+        if self.value(coordinates) is not None:
+            raise Exception("Not subscriptable")
+        self._link(coordinates[:-1])
+        self._writable(coordinates[:-1]).set(coordinates[-1], None, NESTED)
+        self._rows[coordinates] = self._row()
+
+    def _discard(self, coordinates):
+        """Drops the rows at and below the coordinates."""
+        for index, state, _ in list(self._rows.pop(coordinates).entries()):
+            if state == NESTED:
+                self._discard(coordinates + (index,))
+
+    def set(self, coordinates, value):
+        if any(type(index) is not int for index in coordinates):
+            raise Exception("Typed storage requires integer coordinates")
+        if value is not None:
+            array.array(self._typecode, (value,))
+        with self._mutex:
+            self._unshare()
+            if coordinates in self._rows:
+                self._discard(coordinates)
+            self._link(coordinates[:-1])
+            self._writable(coordinates[:-1]).set(coordinates[-1], value)
+
+    def delete(self, coordinates):
+        with self._mutex:
+            parent = coordinates[:-1]
+            row = self._rows.get(parent)
+            if row is None or not row.state(coordinates[-1]):
+                raise KeyError(coordinates[-1])
+            self._unshare()
+            if coordinates in self._rows:
+                self._discard(coordinates)
+            row = self._writable(parent)
+            row.delete(coordinates[-1])
+
+            while parent and not row.count:
+                del self._rows[parent]
+                coordinates, parent = parent, parent[:-1]
+                row = self._writable(parent)
+                row.delete(coordinates[-1])
+
+    def items(self, coordinates=()):
+        row = self._rows.get(coordinates)
+        if row is None:
+            value = self.value(coordinates)
+            if value is not None:
+                yield (coordinates, value)
+            return
+        with self._mutex:
+            entries = list(row.entries())
+        for index, state, value in entries:
+            if state == NESTED:
+                yield from self.items(coordinates + (index,))
+            elif state == VALUE:
+                yield (coordinates + (index,), value)
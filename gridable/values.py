@@ -0,0 +1,78 @@
+import threading
+
+
+def hashable(value):
+    """Returns a boolean indicating if a value can be indexed."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class ValueIndex:
+    """Index from each value stored in a grid to the coordinates holding it, and to the
+    number of cells holding it directly below each location, maintained as the grid is
+    modified. Values that can't be hashed aren't indexed."""
+
+    def __init__(self, storage=None):
+        self._locations = {}
+        self._parents = {}
+        self._mutex = threading.Lock()
+        if storage is not None:
+            for coordinates, value in storage.items():
+                self._add(coordinates, value)
+
+    def _add(self, coordinates, value):
+        """Records a value stored at the coordinates."""
+        if not hashable(value):
+            return
+        self._locations.setdefault(value, {})[coordinates] = None
+        parents = self._parents.setdefault(value, {})
+        parents[coordinates[:-1]] = parents.get(coordinates[:-1], 0) + 1
+
+    def _remove(self, coordinates, value):
+        """Records a value removed from the coordinates."""
+        if not hashable(value):
+            return
+        locations = self._locations.get(value)
+        if locations is None or coordinates not in locations:
+            return
+        del locations[coordinates]
+        if not locations:
+            del self._locations[value]
+        parents = self._parents[value]
+        parents[coordinates[:-1]] -= 1
+        if not parents[coordinates[:-1]]:
+            del parents[coordinates[:-1]]
+            if not parents:
+                del self._parents[value]
+
+    def _set(self, coordinates, old, value):
+        """Records a value stored at the coordinates, replacing the old value."""
+        with self._mutex:
+            if old is not None:
+                self._remove(coordinates, old)
+            if value is not None:
+                self._add(coordinates, value)
+
+    def _delete(self, coordinates, removed):
+        """Records the coordinate and value pairs being deleted."""
+        with self._mutex:
+            for location, value in removed:
+                self._remove(location, value)
+
+    def locations(self, value):
+        """Returns the coordinates holding a value, in the order they were stored."""
+        with self._mutex:
+            return list(self._locations.get(value, ()))
+
+    def count(self, value):
+        """Returns the number of cells holding a value."""
+        with self._mutex:
+            return len(self._locations.get(value, ()))
+
+    def holds(self, coordinates, value):
+        """Returns a boolean indicating if a cell directly below the coordinates holds a value."""
+        with self._mutex:
+            return coordinates in self._parents.get(value, ())
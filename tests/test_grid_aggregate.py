@@ -0,0 +1,85 @@
+import unittest
+from gridable import Grid
+
+
+class TestAggregate(unittest.TestCase):
+    def build(self, **kwargs):
+        grid = Grid(**kwargs)
+        grid.update(((x, y), x * 10 + y) for x in range(3) for y in range(4))
+        grid[1][9] = "label"
+        return grid
+
+    def test_row(self):
+        for aggregates in (False, True):
+            grid = self.build(aggregates=aggregates)
+            self.assertEqual(grid[1].sum(), 46)
+            self.assertEqual(grid[1].mean(), 11.5)
+            self.assertEqual(grid[1].min(), 10)
+            self.assertEqual(grid[1].max(), 13)
+            self.assertEqual(grid[1].aggregate(None, "count"), 4)
+            self.assertEqual(grid.sum(), 138)
+            self.assertEqual(grid[5].sum(), 0)
+            self.assertIsNone(grid[5].mean())
+
+    def test_region(self):
+        grid = self.build()
+        self.assertEqual(grid.aggregate([(1, 2), (2, 3)], "sum"), 12 + 13 + 22 + 23)
+        self.assertEqual(grid[2].aggregate([(0, 1)], "max"), 21)
+
+    def test_group_by(self):
+        for aggregates in (False, True):
+            grid = self.build(aggregates=aggregates)
+            self.assertEqual(grid.group_by(), {0: 6, 1: 46, 2: 86})
+            self.assertEqual(grid.group_by(1, "count"), {0: 3, 1: 3, 2: 3, 3: 3})
+            self.assertEqual(grid[2].group_by(0, "min"), {0: 20, 1: 21, 2: 22, 3: 23})
+
+    def test_incremental(self):
+        grid = self.build(aggregates=True)
+        grid[1][0] = 100
+        grid[1][3] = 5
+        self.assertEqual(grid[1].sum(), 100 + 11 + 12 + 5)
+        self.assertEqual(grid[1].min(), 5)
+        self.assertEqual(grid[1].max(), 100)
+
+        del grid[1][0]
+        self.assertEqual(grid[1].max(), 12)
+        self.assertEqual(grid[1].aggregate(None, "count"), 3)
+
+        grid[2] = 7
+        self.assertEqual(grid[2].sum(), 7)
+        del grid[0]
+        self.assertEqual(grid.group_by(), {1: 28, 2: 7})
+        self.assertEqual(grid.sum(), 35)
+
+    def test_non_real(self):
+        for aggregates in (False, True):
+            grid = Grid(aggregates=aggregates, journal=True)
+            grid[0][0] = 1j
+            grid[0][1] = 2j
+            grid[0][2] = True
+            grid[0][3] = 4
+
+            self.assertEqual(grid.version, 4)
+            self.assertEqual(grid.sum(), 4)
+            self.assertEqual(grid[0].max(), 4)
+
+    def test_failing_listener(self):
+        class Failing:
+            def _set(self, coordinates, old, value):
+                raise ValueError()
+
+            def _delete(self, coordinates, removed):
+                raise ValueError()
+
+        grid = Grid(journal=True)
+        grid._listeners.insert(0, Failing())
+        with self.assertRaises(ValueError):
+            grid[0] = 1
+        with self.assertRaises(ValueError):
+            del grid[0]
+        self.assertEqual(grid.version, 2)
+
+    def test_unknown(self):
+        grid = self.build()
+        with self.assertRaises(Exception):
+            grid.aggregate(None, "median")
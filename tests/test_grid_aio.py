@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import unittest
+from gridable import AsyncGrid, Grid
+
+
+class TestAsyncGrid(unittest.TestCase):
+    def run_async(self, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def test_get_set(self):
+        async def main():
+            grid = AsyncGrid()
+            await grid.aset((1, 2), 3)
+            await grid.aset(4, 5)
+            self.assertEqual(await grid.aget((1, 2)), 3)
+            self.assertEqual(await grid.aget(4), 5)
+            self.assertIsNone(await grid.aget((7, 7)))
+            await grid.adelete((1, 2))
+            self.assertIsNone(await grid.aget((1, 2)))
+
+        self.run_async(main())
+
+    def test_iterate(self):
+        async def main():
+            grid = AsyncGrid(batch=3)
+            await grid.aupdate(((x, x % 2), x) for x in range(10))
+            values = [cell.value() async for cell in grid.aiter()]
+            self.assertEqual(values, list(range(10)))
+            values = [cell.value() async for cell in grid.aiter(4)]
+            self.assertEqual(values, [4])
+
+        self.run_async(main())
+
+    def test_iterate_while_writing(self):
+        async def main():
+            grid = AsyncGrid(Grid(), batch=1)
+            await grid.aupdate(((x,), x) for x in range(5))
+            seen = []
+            async for cell in grid.aiter():
+                seen.append(cell.value())
+                await grid.aset(cell.coordinates()[0] + 10, 0)
+            self.assertEqual(seen, list(range(5)))
+            self.assertEqual(len(grid.grid), 10)
+
+        self.run_async(main())
+
+    def test_iterate_while_locked(self):
+        async def main():
+            grid = AsyncGrid()
+            await grid.aset(1, 2)
+            locked = threading.Event()
+            release = threading.Event()
+
+            def hold():
+                grid.grid._lock.acquire_write()
+                locked.set()
+                release.wait(5)
+                grid.grid._lock.release_write()
+
+            holder = threading.Thread(target=hold)
+            holder.start()
+            locked.wait(5)
+
+            async def tick():
+                await asyncio.sleep(0.01)
+                release.set()
+
+            ticker = asyncio.ensure_future(tick())
+            values = [cell.value() async for cell in grid.aiter()]
+            await ticker
+            holder.join(5)
+            self.assertEqual(values, [2])
+
+        self.run_async(main())
+
+    def test_operations_while_locked(self):
+        async def main():
+            grid = AsyncGrid()
+            await grid.aset(1, 2)
+            released = []
+
+            for operation in (
+                lambda: grid.aget(1),
+                lambda: grid.aset(2, 3),
+                lambda: grid.aupdate([((3,), 4)]),
+                lambda: grid.adelete(3),
+            ):
+                locked = threading.Event()
+                release = threading.Event()
+
+                def hold():
+                    grid.grid._lock.acquire_write()
+                    locked.set()
+                    released.append(release.wait(5))
+                    grid.grid._lock.release_write()
+
+                holder = threading.Thread(target=hold)
+                holder.start()
+                locked.wait(5)
+
+                async def tick():
+                    await asyncio.sleep(0.01)
+                    release.set()
+
+                ticker = asyncio.ensure_future(tick())
+                await operation()
+                await ticker
+                holder.join(5)
+
+            self.assertEqual(released, [True] * 4)
+            self.assertEqual(str(grid.grid), "[2,3]")
+
+        self.run_async(main())
+
+    def test_writer_excludes_readers(self):
+        async def main():
+            grid = AsyncGrid()
+            events = []
+
+            async def writer():
+                async with grid.write() as inner:
+                    events.append("write")
+                    await asyncio.sleep(0.01)
+                    inner[1] = 2
+                    self.assertEqual(await grid.aget(1), 2)
+                    events.append("written")
+
+            async def reader():
+                await asyncio.sleep(0)
+                events.append(await grid.aget(1))
+
+            await asyncio.gather(writer(), reader())
+            self.assertEqual(events, ["write", "written", 2])
+
+        self.run_async(main())
+
+    def test_upgrade(self):
+        async def main():
+            grid = AsyncGrid()
+            async with grid.read():
+                with self.assertRaises(Exception):
+                    await grid.aset(1, 2)
+
+        self.run_async(main())
@@ -0,0 +1,99 @@
+import unittest
+from gridable import Grid
+
+
+class TestGridAlgebra(unittest.TestCase):
+    def setUp(self):
+        self.first = Grid()
+        self.first[0][0] = 1
+        self.first[0][1] = 2
+        self.first[1][0] = 3
+        self.second = Grid()
+        self.second[0][1] = 10
+        self.second[1][0] = 0
+        self.second[2][2] = 5
+
+    def items(self, grid):
+        return sorted(grid._storage.items())
+
+    def test_arithmetic(self):
+        self.assertEqual(
+            self.items(self.first + self.second),
+            [((0, 0), 1), ((0, 1), 12), ((1, 0), 3), ((2, 2), 5)],
+        )
+        self.assertEqual(
+            self.items(self.first - self.second),
+            [((0, 0), 1), ((0, 1), -8), ((1, 0), 3), ((2, 2), -5)],
+        )
+        self.assertEqual(
+            self.items(self.first * self.second), [((0, 1), 20), ((1, 0), 0)]
+        )
+        self.assertEqual(
+            self.items(self.second / self.first), [((0, 1), 5.0), ((1, 0), 0.0)]
+        )
+        self.assertEqual(
+            self.items(self.second // self.first), [((0, 1), 5), ((1, 0), 0)]
+        )
+
+        self.assertEqual(self.first[0][1], 2)
+        self.assertEqual(self.second[2][2], 5)
+
+    def test_scalars(self):
+        self.assertEqual(
+            self.items(self.first * 2), [((0, 0), 2), ((0, 1), 4), ((1, 0), 6)]
+        )
+        self.assertEqual(
+            self.items(10 - self.first), [((0, 0), 9), ((0, 1), 8), ((1, 0), 7)]
+        )
+        self.assertEqual(
+            self.items(1 + self.first), [((0, 0), 2), ((0, 1), 3), ((1, 0), 4)]
+        )
+        self.assertEqual(
+            self.items(-self.first), [((0, 0), -1), ((0, 1), -2), ((1, 0), -3)]
+        )
+        self.assertEqual(self.items(Grid() + 1), [])
+
+        with self.assertRaises(Exception):
+            self.first + self.second[0]
+
+    def test_apply(self):
+        result = self.first.apply(lambda value: value * 10 if value > 1 else None)
+        self.assertIsInstance(result, Grid)
+        self.assertEqual(self.items(result), [((0, 1), 20), ((1, 0), 30)])
+        self.assertIsNone(result[0][0].value())
+
+        snapshot = self.first.snapshot()
+        self.assertEqual(
+            self.items(snapshot.apply(str)),
+            [((0, 0), "1"), ((0, 1), "2"), ((1, 0), "3")],
+        )
+
+    def test_sets(self):
+        self.assertEqual(
+            self.items(self.first.union(self.second)),
+            [((0, 0), 1), ((0, 1), 2), ((1, 0), 3), ((2, 2), 5)],
+        )
+        self.assertEqual(
+            self.items(self.first.intersection(self.second)), [((0, 1), 2), ((1, 0), 3)]
+        )
+        self.assertEqual(self.items(self.first.difference(self.second)), [((0, 0), 1)])
+        self.assertEqual(self.items(self.first.mask(self.second)), [((0, 1), 2)])
+        self.assertEqual(
+            self.items(self.first.union(self.first)), self.items(self.first)
+        )
+
+    def test_listeners(self):
+        indexed = Grid(index=True, aggregates=True)
+        indexed.update({(0, 0): 4, (3, 3): 6})
+        result = indexed + self.first
+
+        self.assertEqual(result.sum(), 16)
+        self.assertEqual(indexed.sum(), 10)
+        self.assertEqual(
+            self.items(result * 0.5),
+            [((0, 0), 2.5), ((0, 1), 1.0), ((1, 0), 1.5), ((3, 3), 3.0)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from gridable import Grid, FlatStorage
+from gridable.dense import numpy
+
+
+class TestBulk(unittest.TestCase):
+    def test_update_mapping(self):
+        grid = Grid()
+        grid.update({(1, 2): 3, (1, 3): 4, (2,): 5})
+
+        self.assertEqual(grid[1][2].value(), 3)
+        self.assertEqual(grid[1][3].value(), 4)
+        self.assertEqual(grid[2].value(), 5)
+
+    def test_update_pairs_generator(self):
+        grid = Grid(storage=FlatStorage())
+        grid.update(((x, y), x * y) for x in range(3) for y in range(3))
+
+        self.assertEqual(len(list(grid)), 9)
+        self.assertEqual(grid[2][2].value(), 4)
+
+    def test_update_relative(self):
+        grid = Grid()
+        grid[5].update({0: 1, 1: 2})
+
+        self.assertEqual(grid[5][0].value(), 1)
+        self.assertEqual(grid[5][1].value(), 2)
+
+    def test_update_coordinates_and_values(self):
+        grid = Grid()
+        grid.update([(0, 0), (0, 1)], [7, 8])
+
+        self.assertEqual(str(grid), "[[7,8]]")
+
+    def test_update_not_subscriptable(self):
+        grid = Grid()
+        grid[1] = 5
+
+        with self.assertRaises(Exception):
+            grid.update({(1, 2): 3})
+
+    def test_fill(self):
+        grid = Grid()
+        grid.fill(((0, 1), (5, 7)), range(6))
+
+        self.assertEqual(str(grid), "[[0,1,2],[3,4,5]]")
+        self.assertEqual(grid[1][5].value(), 3)
+
+    def test_fill_invalid_size(self):
+        grid = Grid()
+
+        with self.assertRaises(Exception):
+            grid.fill(((0, 1), (0, 1)), [1, 2, 3])
+        with self.assertRaises(Exception):
+            grid.fill(((0, 1), (0, 1)), (value for value in range(5)))
+
+    def test_set_string(self):
+        grid = Grid()
+        grid[0] = "value"
+
+        self.assertEqual(grid[0].value(), "value")
+
+    def test_set_slice_single_lock(self):
+        grid = Grid()
+        acquisitions = []
+        acquire_write = grid._lock.acquire_write
+        grid._lock.acquire_write = lambda *args: acquisitions.append(args) or (
+            acquire_write(*args)
+        )
+
+        grid[5][0:] = range(1000)
+
+        self.assertEqual(len(acquisitions), 1)
+        self.assertEqual(len(grid[5]), 1000)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_arrays(self):
+        grid = Grid()
+        grid.update(numpy.array([[0, 1], [2, 3]]), numpy.array([1.5, 2.5]))
+        grid.fill(((4, 5), (0, 1)), numpy.arange(4).reshape(2, 2))
+        grid[6] = numpy.array([7, 8])
+
+        self.assertEqual(grid[0][1].value(), 1.5)
+        self.assertIs(type(grid[2][3].value()), float)
+        self.assertEqual(grid[5][0].value(), 2)
+        self.assertEqual(grid[6][1].value(), 8)
@@ -0,0 +1,77 @@
+import unittest
+from gridable import Grid
+from gridable.cache import Region
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(cache=True)
+        self.grid.update(((x, y), x * 10 + y) for x in range(10) for y in range(10))
+
+    def values(self, cells):
+        return [cell.value() for cell in cells]
+
+    def test_hits(self):
+        first = self.values(self.grid.query([(1, 2), (0, 1)]))
+        second = self.values(self.grid.query([(1, 2), (0, 1)]))
+
+        self.assertEqual(first, [10, 11, 20, 21])
+        self.assertEqual(second, first)
+        info = self.grid.cache_info()
+        self.assertEqual((info.hits, info.misses, info.size), (1, 1, 1))
+
+    def test_invalidation(self):
+        self.grid.query([(1, 2), (0, 1)])
+        self.grid[5][5] = 0
+        self.grid[1][7] = 0
+        self.assertEqual(self.grid.cache_info().size, 1)
+
+        del self.grid[2][1]
+        self.assertEqual(self.grid.cache_info().invalidations, 1)
+        self.assertEqual(self.values(self.grid.query([(1, 2), (0, 1)])), [10, 11, 20])
+
+    def test_neighbors(self):
+        self.assertEqual(self.values(self.grid[5][5].neighbors())[4], 55)
+        self.grid[4][4] = -1
+        self.assertEqual(self.values(self.grid[5][5].neighbors())[0], -1)
+
+        self.grid.neighbors_of([(5, 5)], values=True)
+        self.grid[9][9] = 0
+        self.assertEqual(self.grid.cache_info().hits, 1)
+
+    def test_aggregate_and_slices(self):
+        self.assertEqual(self.grid[3].sum(), 345)
+        self.grid[3][0] = 100
+        self.assertEqual(self.grid[3].sum(), 415)
+
+        self.assertEqual(self.values(self.grid[3][8:]), [38, 39])
+        self.grid[3][10] = 1
+        self.assertEqual(self.values(self.grid[3][8:]), [38, 39, 1])
+
+    def test_eviction(self):
+        grid = Grid(cache=2)
+        grid[0][0] = 1
+        for row in range(3):
+            grid.query([(row, row)])
+
+        info = grid.cache_info()
+        self.assertEqual((info.evictions, info.size, info.maxsize), (1, 2, 2))
+
+    def test_clear(self):
+        self.grid.query([(1, 2), (0, 1)])
+        self.grid.cache_clear()
+        self.assertEqual(self.grid.cache_info().size, 0)
+        self.assertEqual(self.values(self.grid.query([(1, 1), (0, 0)])), [10])
+
+    def test_region(self):
+        region = Region((1,), ((0, 5), None))
+        self.assertTrue(region.contains((1, 3, 100)))
+        self.assertTrue(region.contains((1,)))
+        self.assertFalse(region.contains((1, 6)))
+        self.assertFalse(region.contains((2, 3)))
+
+    def test_no_cache(self):
+        with self.assertRaises(Exception):
+            Grid().cache_info()
+        with self.assertRaises(Exception):
+            Grid().cache_clear()
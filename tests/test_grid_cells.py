@@ -0,0 +1,86 @@
+import unittest
+from gridable import Grid, FlatStorage
+
+
+class TestCellHandles(unittest.TestCase):
+    def test_slotted(self):
+        grid = Grid()
+
+        with self.assertRaises(AttributeError):
+            grid[0].other = 1
+
+    def test_repeated_reads(self):
+        grid = Grid()
+        grid[1][2] = 3
+        cell = grid[1][2]
+
+        self.assertEqual(cell.value(), 3)
+        grid[1][2] = 4
+        self.assertEqual(cell.value(), 4)
+
+    def test_parent_deleted_and_recreated(self):
+        grid = Grid()
+        grid[1][2] = 3
+        cell = grid[1][2]
+        self.assertEqual(cell.value(), 3)
+
+        del grid[1][2]
+        self.assertEqual(cell.value(), None)
+
+        grid[1][2] = 5
+        self.assertEqual(cell.value(), 5)
+
+    def test_parent_replaced(self):
+        grid = Grid()
+        grid[1][2][3] = 3
+        cell = grid[1][2][3]
+        self.assertEqual(cell.value(), 3)
+
+        grid[1][2] = 4
+        self.assertEqual(cell.value(), None)
+        self.assertEqual(grid[1][2].value(), 4)
+
+    def test_created_before_parent(self):
+        grid = Grid()
+        cell = grid[1][2]
+        self.assertEqual(cell.value(), None)
+
+        grid[1][2] = 6
+        self.assertEqual(cell.value(), 6)
+
+    def test_after_snapshot(self):
+        grid = Grid()
+        grid[1][2] = 3
+        cell = grid[1][2]
+        self.assertEqual(cell.value(), 3)
+
+        snapshot = grid.snapshot()
+        grid[1][2] = 4
+
+        self.assertEqual(cell.value(), 4)
+        self.assertEqual(snapshot[1][2].value(), 3)
+
+    def test_iterated_cells(self):
+        grid = Grid(storage=FlatStorage())
+        grid[1] = [1, 2]
+        grid[2][0][0] = 3
+
+        cells = list(grid)
+
+        self.assertEqual([cell.value() for cell in cells], [1, 2, 3])
+        del grid[1]
+        self.assertEqual([cell.value() for cell in cells], [None, None, 3])
+
+    def test_copied_while_iterating(self):
+        grid = Grid()
+        grid[0] = [1, 2, 3]
+        snapshot = grid.snapshot()
+
+        cells = []
+        for cell in grid[0]:
+            if not cells:
+                grid[0][1] = 99
+            cells.append(cell)
+
+        self.assertEqual([cell.value() for cell in cells], [1, 99, 3])
+        self.assertEqual(snapshot[0][1].value(), 2)
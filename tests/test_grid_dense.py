@@ -0,0 +1,75 @@
+import unittest
+from gridable import Grid
+from gridable.dense import numpy
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestDenseRegion(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid()
+        self.grid[-5] = [1]
+        self.region = self.grid.dense((0, 3), (0, 2), dtype=float)
+
+    def test_read_write(self):
+        self.grid[1][2] = 5
+
+        self.assertEqual(self.grid[1][2].value(), 5.0)
+        self.assertEqual(self.region.array[1, 2], 5.0)
+        self.assertEqual(self.grid[0][0].value(), 0.0)
+        self.assertEqual(self.grid[-5][0].value(), 1)
+
+    def test_vectorized_array(self):
+        self.region.array += 2
+
+        self.assertEqual(self.grid[3][2].value(), 2.0)
+
+    def test_existing_values_moved(self):
+        self.grid[9][9] = 4
+        region = self.grid.dense((8, 9), (8, 9), dtype=int)
+
+        self.assertEqual(region.array[1, 1], 4)
+        self.assertEqual(self.grid[9][9].value(), 4)
+
+    def test_iterate_and_len(self):
+        self.assertEqual(len(self.grid), 5)
+        self.assertEqual(len(self.grid[2]), 3)
+        self.assertEqual(len(list(self.grid)), 13)
+        self.assertEqual(str(self.grid[2]), "[0.0,0.0,0.0]")
+
+    def test_slice(self):
+        self.region.array[1] = [4, 5, 6]
+
+        self.assertEqual([cell.value() for cell in self.grid[1][1:]], [5.0, 6.0])
+
+    def test_neighbors(self):
+        self.region.array[:] = 1
+
+        neighbors = list(self.grid[0][0].neighbors(include_empty=False))
+
+        self.assertEqual(len(neighbors), 4)
+
+    def test_overlap_fails(self):
+        with self.assertRaises(Exception):
+            self.grid.dense((3, 5), (2, 4))
+
+    def test_delete_fails(self):
+        with self.assertRaises(Exception):
+            del self.grid[1][1]
+
+    def test_nested_write_fails(self):
+        with self.assertRaises(Exception):
+            self.grid[1][1][1] = 4
+
+    def test_failed_conversion_keeps_values(self):
+        self.grid[9][8] = 1
+        self.grid[9][9] = "x"
+        with self.assertRaises(ValueError):
+            self.grid.dense((8, 9), (8, 9), dtype=int)
+
+        self.assertEqual(self.grid[9][8].value(), 1)
+        self.assertEqual(self.grid[9][9].value(), "x")
+
+    def test_none_fails(self):
+        with self.assertRaises(Exception):
+            self.grid[1][1] = None
+        self.assertEqual(self.grid[1][1].value(), 0.0)
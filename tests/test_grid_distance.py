@@ -33,3 +33,9 @@ class TestNode(unittest.TestCase):
         except:
             exception = True
         self.assertTrue(exception)
+
+    def test_distance_metrics(self):
+        grid = Grid()
+
+        self.assertEqual(grid[0][0].distance(grid[3][4], "chebyshev"), 4)
+        self.assertEqual(grid[0][0].distance(grid[3][4], "euclidean"), 5.0)
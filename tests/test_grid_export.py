@@ -0,0 +1,89 @@
+import io
+import os
+import tempfile
+import unittest
+from gridable import Grid, TiledStorage
+from gridable.export import chunks, pyarrow
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid()
+        self.grid[1][2] = 3
+        self.grid[1][4] = 5.5
+        self.grid[-2][0][1] = "value"
+        self.grid[7] = 8
+
+    def round_trip(self, format, binary=False):
+        file = io.BytesIO() if binary else io.StringIO()
+        self.grid.export(file, format, chunk_size=2)
+        file.seek(0)
+        grid = Grid()
+        grid.load(file, format, chunk_size=2)
+        return grid
+
+    def test_csv(self):
+        file = io.StringIO()
+        self.grid.export(file)
+        self.assertEqual(
+            file.getvalue().splitlines(), ["1,2,3", "1,4,5.5", "-2,0,1,value", "7,8"]
+        )
+
+        grid = self.round_trip("csv")
+        self.assertEqual(str(grid), str(self.grid))
+        self.assertEqual(grid[1][4].value(), 5.5)
+
+    def test_ndjson(self):
+        grid = self.round_trip("ndjson")
+        self.assertEqual(str(grid), str(self.grid))
+        self.assertEqual(grid[-2][0][1].value(), "value")
+
+    @unittest.skipIf(pyarrow is None, "PyArrow is not installed")
+    def test_arrow(self):
+        self.grid = Grid()
+        self.grid.update(((x, x % 3), float(x)) for x in range(10))
+        grid = self.round_trip("arrow", binary=True)
+        self.assertEqual(str(grid), str(self.grid))
+
+    def test_cell(self):
+        file = io.StringIO()
+        self.grid[1].export(file, "ndjson")
+        file.seek(0)
+
+        grid = Grid()
+        grid[9].load(file, "ndjson")
+        self.assertEqual(grid[9][2].value(), 3)
+        self.assertEqual(grid[9][4].value(), 5.5)
+        self.assertEqual(len(grid), 1)
+
+    def test_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.csv")
+            self.grid.export(path)
+            grid = Grid()
+            grid.load(path)
+        self.assertEqual(str(grid), str(self.grid))
+
+    def test_tiled(self):
+        storage = TiledStorage(tile_size=10, memory=2000)
+        grid = Grid(storage=storage)
+        grid.update(((x, 0), x) for x in range(100))
+        storage.snapshot = lambda: self.fail("Exports shouldn't copy the grid")
+
+        file = io.StringIO()
+        grid.export(file, chunk_size=7)
+        lines = file.getvalue().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertEqual(lines[42], "42,0,42")
+        self.assertLess(len(storage._tiles), 10)
+        self.assertLessEqual(storage._resident, 20)
+
+    def test_unknown_format(self):
+        with self.assertRaises(Exception):
+            self.grid.export(io.StringIO(), "xml")
+
+    def test_chunks(self):
+        self.assertEqual(list(chunks(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunks([], 2)), [])
+        with self.assertRaises(Exception):
+            list(chunks(range(5), 0))
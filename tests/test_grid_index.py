@@ -0,0 +1,79 @@
+import unittest
+from gridable import Grid, FlatStorage, NestedStorage
+from gridable.dense import numpy
+
+
+class TestSpatialIndex(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(index=True)
+        self.plain = Grid()
+        for grid in (self.grid, self.plain):
+            grid[5][5] = 1
+            grid[1][9] = 2
+            grid[3][4] = 3
+            grid[3][7] = 4
+            grid[8][2] = 5
+
+    def coordinates(self, cells):
+        return sorted(cell.coordinates() for cell in cells)
+
+    def test_query(self):
+        expected = [(3, 4), (5, 5)]
+
+        self.assertEqual(self.coordinates(self.grid.query([(2, 6), (3, 5)])), expected)
+        self.assertEqual(self.coordinates(self.plain.query([(2, 6), (3, 5)])), expected)
+
+    def test_query_unbounded(self):
+        expected = [(3, 4), (3, 7)]
+
+        self.assertEqual(self.coordinates(self.grid.query([(3, 3), None])), expected)
+        self.assertEqual(self.coordinates(self.plain.query([(3, 3), None])), expected)
+        self.assertEqual(self.coordinates(self.grid[3].query([(5, 9)])), [(3, 7)])
+
+    def test_slice_bounds(self):
+        self.assertEqual(self.grid._key_bounds(()), (1, 8))
+        self.assertEqual([cell.value() for cell in self.grid[3][5:]], [None, None, 4])
+
+    def test_delete(self):
+        del self.grid[3][4]
+        del self.grid[1]
+
+        self.assertEqual(self.grid._key_bounds(()), (3, 8))
+        self.assertEqual(self.grid._key_bounds((3,)), (7, 7))
+        self.assertEqual(
+            self.coordinates(self.grid.query([None, None])), [(3, 7), (5, 5), (8, 2)]
+        )
+
+        del self.grid[3][7]
+
+        self.assertEqual(self.grid._key_bounds(()), (5, 8))
+
+    def test_replace_nested(self):
+        self.grid[3] = 6
+
+        self.assertEqual(self.coordinates(self.grid.query([(3, 3)])), [(3,)])
+        self.assertEqual(self.grid.query([(3, 3), None]), [])
+
+    def test_existing_values(self):
+        grid = Grid(storage=FlatStorage())
+        grid[2][2] = 1
+        grid = Grid(storage=grid._storage, index=True)
+
+        self.assertEqual(self.coordinates(grid.query([(0, 5), (0, 5)])), [(2, 2)])
+
+    def test_existing_none_values(self):
+        storage = NestedStorage()
+        storage.set((0, 0), None)
+        storage.set((0, 5), 1)
+        grid = Grid(storage=storage, index=True)
+        del grid[0][0]
+
+        self.assertEqual([cell.value() for cell in grid[0][:]], [1])
+        self.assertEqual(self.coordinates(grid.query([(0, 0), (0, 9)])), [(0, 5)])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_dense_region(self):
+        self.grid.dense((10, 11), (0, 1))
+
+        self.assertEqual(len(self.grid.query([(10, 20), None])), 4)
+        self.assertEqual(self.grid._key_bounds(()), (1, 11))
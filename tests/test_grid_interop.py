@@ -0,0 +1,86 @@
+import unittest
+from gridable import Grid
+from gridable.interop import numpy, scipy
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestGridArrays(unittest.TestCase):
+    def test_to_arrays(self):
+        grid = Grid()
+        grid[1][2] = 5
+        grid[3][0] = 7
+        grid[3][4][1] = 9
+
+        with self.assertRaises(Exception):
+            grid.to_arrays()
+
+        del grid[3][4]
+
+        coordinates, values = grid.to_arrays(dtype=float)
+        self.assertEqual(coordinates.shape, (2, 2))
+        self.assertEqual(coordinates.tolist(), [[1, 2], [3, 0]])
+        self.assertEqual(values.tolist(), [5.0, 7.0])
+        self.assertEqual(values.dtype, numpy.float64)
+
+        coordinates, values = grid[3].to_arrays()
+        self.assertEqual(coordinates.tolist(), [[0]])
+        self.assertEqual(values.tolist(), [7])
+
+        coordinates, values = Grid().to_arrays()
+        self.assertEqual(coordinates.shape, (0, 0))
+        self.assertEqual(len(values), 0)
+
+    def test_from_arrays(self):
+        coordinates = numpy.array([[0, 1], [2, 3], [2, 4]])
+        values = numpy.array([1.5, 2.5, 3.5])
+        grid = Grid.from_arrays(coordinates, values, index=True)
+
+        self.assertEqual(grid[2][3], 2.5)
+        self.assertEqual(grid[0][1], 1.5)
+        self.assertIsNotNone(grid._index)
+
+        round_trip = Grid.from_arrays(*grid.to_arrays())
+        self.assertEqual(list(round_trip._storage.items()), list(grid._storage.items()))
+
+
+@unittest.skipIf(scipy is None, "SciPy is not installed")
+class TestGridSparse(unittest.TestCase):
+    def test_to_coo(self):
+        grid = Grid()
+        grid[0][1] = 4
+        grid[2][3] = 6
+
+        matrix = grid.to_coo()
+        self.assertEqual(matrix.shape, (3, 4))
+        self.assertEqual(
+            matrix.toarray().tolist(), [[0, 4, 0, 0], [0] * 4, [0, 0, 0, 6]]
+        )
+        self.assertEqual(grid.to_coo(shape=(5, 5)).shape, (5, 5))
+        self.assertEqual(grid.to_csr(dtype=float).format, "csr")
+        self.assertEqual(grid.to_csr()[2, 3], 6)
+
+        grid[1][2][0] = 1
+        with self.assertRaises(Exception):
+            grid.to_coo()
+        del grid[1]
+        grid[-1][0] = 1
+        with self.assertRaises(Exception):
+            grid.to_coo()
+
+    def test_from_coo(self):
+        matrix = scipy.sparse.coo_matrix(
+            ([1, 2, 3], ([0, 0, 2], [1, 1, 3])), shape=(3, 4)
+        )
+        grid = Grid.from_coo(matrix)
+
+        self.assertEqual(list(grid._storage.items()), [((0, 1), 3), ((2, 3), 3)])
+        self.assertEqual(matrix.nnz, 3)
+
+        grid = Grid.from_coo(scipy.sparse.csr_matrix([[0, 7], [8, 0]]))
+        self.assertEqual(list(grid._storage.items()), [((0, 1), 7), ((1, 0), 8)])
+        round_trip = Grid.from_coo(grid.to_coo())
+        self.assertEqual(list(round_trip._storage.items()), list(grid._storage.items()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import queue
+import unittest
+from gridable import Grid
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(journal=True)
+
+    def test_changes(self):
+        self.grid[1][2] = 3
+        version = self.grid.version
+        self.grid[1][4] = 5
+        self.grid.update({(2, 0): 6})
+        del self.grid[1]
+
+        self.assertEqual(self.grid.version, 5)
+        self.assertEqual(
+            self.grid.changes_since(version),
+            [(2, (1, 4), 5), (3, (2, 0), 6), (4, (1, 2), None), (5, (1, 4), None)],
+        )
+        self.assertEqual(self.grid.changes_since(5), [])
+
+    def test_replaced_container(self):
+        self.grid[1][2] = 3
+        self.grid[1] = 4
+        self.assertEqual(self.grid.changes_since(1), [(2, (1, 2), None), (3, (1,), 4)])
+
+    def test_replaced_container_order(self):
+        for kwargs in ({}, {"journal": True}, {"index": True, "aggregates": True}):
+            grid = Grid(**kwargs)
+            grid[1][0] = 1
+            grid[2] = 5
+            grid[1] = 3
+            self.assertEqual(str(grid), "[3,5]")
+            self.assertEqual(len(list(grid.query([(0, 9)]))), 2)
+
+    def test_capacity(self):
+        grid = Grid(journal=2)
+        for index in range(4):
+            grid[index] = index
+        self.assertEqual([entry[0] for entry in grid.changes_since(2)], [3, 4])
+        with self.assertRaises(Exception):
+            grid.changes_since(1)
+
+    def test_subscribe(self):
+        batches = []
+        subscription = self.grid.subscribe(batches.append, batch=2)
+        for index in range(3):
+            self.grid[index] = index
+        self.assertEqual(batches, [[(1, (0,), 0), (2, (1,), 1)]])
+
+        subscription.cancel()
+        self.grid[5] = 5
+        self.assertEqual(batches[1:], [[(3, (2,), 2)]])
+
+    def test_queue(self):
+        changes = queue.Queue()
+        self.grid.subscribe(changes)
+        self.grid[1] = 2
+        self.assertEqual(changes.get_nowait(), [(1, (1,), 2)])
+
+    def test_no_journal(self):
+        with self.assertRaises(Exception):
+            Grid().version
@@ -0,0 +1,44 @@
+import unittest
+from gridable import Grid
+from gridable.parallel import partitions
+
+
+def total(grid):
+    return grid.sum()
+
+
+def double(grid):
+    result = Grid()
+    result.update((cell.coordinates(), cell.value() * 2) for cell in grid)
+    return result
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid()
+        self.grid.update(((x, y), x * 10 + y) for x in range(6) for y in range(3))
+
+    def test_partitions(self):
+        self.assertEqual(partitions(range(5), 2), [(0, 2), (3, 4)])
+        self.assertEqual(partitions([4, 1], 5), [(1, 1), (4, 4)])
+        self.assertEqual(partitions([], 3), [])
+
+    def test_results(self):
+        for workers in (1, 2):
+            results = self.grid.map_regions(total, partition=3, workers=workers)
+            self.assertEqual(results, [3 + 33, 63 + 93, 123 + 153])
+
+    def test_explicit_partition(self):
+        results = self.grid.map_regions(total, partition=[(0, 0), (4, 9)], workers=2)
+        self.assertEqual(results, [3, 123 + 153])
+
+    def test_overlapping_partitions(self):
+        with self.assertRaises(Exception):
+            self.grid.map_regions(double, partition=[(3, 5), (0, 3)], workers=1)
+        self.assertEqual(self.grid[3][0].value(), 30)
+
+    def test_write_back(self):
+        self.grid.map_regions(double, partition=[(1, 2)], workers=2)
+        self.assertEqual(self.grid[1][2].value(), 24)
+        self.assertEqual(self.grid[2][0].value(), 40)
+        self.assertEqual(self.grid[3][0].value(), 30)
@@ -0,0 +1,83 @@
+import unittest
+from gridable import Grid
+
+MAZE = [
+    "....#",
+    ".##.#",
+    ".#...",
+    ".#.#.",
+    "...#.",
+]
+
+
+class TestPath(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid()
+        for x, row in enumerate(MAZE):
+            for y, tile in enumerate(row):
+                if tile == ".":
+                    self.grid[x][y] = 1
+
+    def test_shortest_path(self):
+        path = self.grid.shortest_path((0, 0), (4, 4))
+
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (4, 4))
+        self.assertEqual(len(path), 9)
+        for first, second in zip(path, path[1:]):
+            self.assertEqual(
+                self.grid[first[0]][first[1]].distance(self.grid[second[0]][second[1]]),
+                1,
+            )
+
+    def test_diagonal_path(self):
+        path = self.grid.shortest_path((0, 0), (4, 4), metric="chebyshev")
+        self.assertEqual(len(path), 7)
+
+    def test_no_path(self):
+        self.grid[9][9] = 1
+        self.assertIsNone(self.grid.shortest_path((0, 0), (9, 9)))
+        self.assertIsNone(self.grid.shortest_path((0, 0), (0, 4)))
+
+    def test_weighted_path(self):
+        grid = Grid()
+        grid.fill(((0, 2), (0, 2)), [1, 9, 1, 1, 9, 1, 1, 1, 1])
+
+        path = grid.shortest_path((0, 0), (0, 2), cost=lambda value: value)
+        self.assertEqual(path, [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (1, 2), (0, 2)])
+        path = grid.shortest_path((0, 0), (0, 2))
+        self.assertEqual(len(path), 3)
+
+    def test_distance_field(self):
+        field = self.grid.distance_field([(0, 0), self.grid[4][4]])
+
+        self.assertEqual(field[(0, 0)], 0)
+        self.assertEqual(field[(4, 0)], 4)
+        self.assertEqual(field[(2, 3)], 3)
+        self.assertNotIn((0, 4), field)
+        self.assertEqual(len(self.grid.distance_field([(0, 0)], limit=2)), 5)
+
+    def test_euclidean_field(self):
+        grid = Grid()
+        grid.fill(((0, 1), (0, 1)), [1, 1, 1, 1])
+
+        field = grid.distance_field([(0, 0)], metric="euclidean")
+        self.assertAlmostEqual(field[(1, 1)], 2**0.5)
+
+    def test_components(self):
+        grid = Grid()
+        grid.update({(0, 0): 1, (0, 1): 1, (5, 5): 1, (6, 6): 1, (9, 9): 0})
+
+        labels = grid.components()
+        self.assertEqual(labels[(0, 0)], labels[(0, 1)])
+        self.assertEqual(len(set(labels.values())), 4)
+        labels = grid.components("chebyshev", passable=bool)
+        self.assertEqual(labels, {(0, 0): 0, (0, 1): 0, (5, 5): 1, (6, 6): 1})
+
+    def test_three_dimensions(self):
+        grid = Grid()
+        grid.update(((x, 0, x), 1) for x in range(3))
+        self.assertEqual(
+            grid.shortest_path((0, 0, 0), (2, 0, 2), "chebyshev"),
+            [(0, 0, 0), (1, 0, 1), (2, 0, 2)],
+        )
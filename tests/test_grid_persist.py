@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from gridable import Grid, FlatStorage
+
+
+class TestPersist(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "grid.bin")
+
+        self.grid = Grid()
+        self.grid[1][2] = 3
+        self.grid[1][4] = 5
+        self.grid[-2][0][1] = 1.5
+        self.grid[7] = "seven"
+        self.grid[8][0] = True
+        self.grid.save(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        for mmap in (True, False):
+            grid = Grid.open(self.path, mmap=mmap)
+
+            self.assertEqual(str(grid), str(self.grid))
+            self.assertEqual(grid[1][4].value(), 5)
+            self.assertEqual(grid[-2][0][1].value(), 1.5)
+            self.assertEqual(grid[7].value(), "seven")
+            self.assertIs(grid[8][0].value(), True)
+
+    def test_lazy_loading(self):
+        grid = Grid.open(self.path)
+
+        self.assertEqual(len(grid), 4)
+        self.assertEqual(grid[1][2].value(), 3)
+        self.assertEqual(sorted(grid._storage._pending), [-2, 7, 8])
+
+        self.assertEqual(grid[7].value(), "seven")
+        self.assertEqual(sorted(grid._storage._pending), [-2, 8])
+
+    def test_modify_after_open(self):
+        grid = Grid.open(self.path)
+        grid[1][3] = 4
+        grid[9] = 9
+        del grid[-2]
+
+        self.assertEqual(str(grid), "[[3,5,4],seven,[True],9]")
+
+    def test_flat_storage(self):
+        grid = Grid(storage=FlatStorage())
+        grid[0] = range(100)
+        grid.save(self.path)
+
+        self.assertEqual(sum(cell.value() for cell in Grid.open(self.path)), 4950)
+
+    def test_non_integer_coordinates(self):
+        grid = Grid()
+        grid["a"] = 1
+
+        with self.assertRaises(Exception):
+            grid.save(self.path)
+        self.assertEqual(Grid.open(self.path)[1][4], 5)
+        self.assertEqual(os.listdir(self.directory.name), ["grid.bin"])
+
+    def test_save_over_opened_file(self):
+        grid = Grid.open(self.path)
+        grid[9] = 9
+        grid.save(self.path)
+        self.assertEqual(str(Grid.open(self.path, mmap=False)), str(grid))
+
+    def test_not_grid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a grid file at all")
+
+        with self.assertRaises(Exception):
+            Grid.open(self.path)
@@ -0,0 +1,48 @@
+import unittest
+from gridable import Grid, FlatStorage
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid()
+        self.grid.update(((x, y), x * 10 + y) for x in range(5) for y in range(5))
+
+    def test_where(self):
+        query = self.grid.where(lambda value: value > 40)
+        self.assertEqual(list(query.values()), [41, 42, 43, 44])
+        self.assertEqual(query.first(), ((4, 1), 41))
+
+    def test_map(self):
+        query = (
+            self.grid[1].map(lambda value: value * 2).where(lambda value: value > 25)
+        )
+        self.assertEqual(list(query), [((1, 3), 26), ((1, 4), 28)])
+
+    def test_within(self):
+        query = self.grid.within([(1, 2), (3, 9)])
+        self.assertEqual(list(query.coordinates()), [(1, 3), (1, 4), (2, 3), (2, 4)])
+        query = query.within([None, (0, 3)])
+        self.assertEqual(list(query.coordinates()), [(1, 3), (2, 3)])
+
+    def test_limit(self):
+        query = self.grid.where(lambda value: value % 2 == 0).limit(3)
+        self.assertEqual(list(query.values()), [0, 2, 4])
+        self.assertEqual(len(list(query.limit(10))), 3)
+
+    def test_cells(self):
+        cells = list(self.grid.within([(4, 4), (4, 4)]).map(str).cells())
+        self.assertEqual([cell.value() for cell in cells], [44])
+
+    def test_lazy(self):
+        seen = []
+        query = self.grid.where(lambda value: seen.append(value) or True)
+        self.assertEqual(seen, [])
+        query.first()
+        self.assertEqual(seen, [0])
+
+    def test_storages(self):
+        for grid in (Grid(index=True), Grid(storage=FlatStorage())):
+            grid.update(((x, y), x + y) for x in range(5) for y in range(5))
+            grid[9] = 1
+            self.assertEqual(list(grid.within([(3, 9), (4, 4)]).values()), [7, 8])
+            self.assertEqual(list(grid.within([(9, 9)]).values()), [1])
@@ -87,3 +87,20 @@ class TestNodeSlices(unittest.TestCase):
 
         self.assertEqual(grid[0][10].value(), 5)
         self.assertEqual(grid[0][11].value(), 6)
+
+    def test_get_slice_zero_start(self):
+        grid = Grid()
+        grid[0][1:] = [1, 2, 3]
+
+        out = list(grid[0][0:2])
+
+        self.assertEqual(len(out), 3)
+        self.assertEqual(out[0].value(), None)
+        self.assertEqual(out[2].value(), 2)
+
+    def test_put_slice_zero_start(self):
+        grid = Grid()
+        grid[0][0:] = [7, 8]
+
+        self.assertEqual(grid[0][0].value(), 7)
+        self.assertEqual(grid[0][1].value(), 8)
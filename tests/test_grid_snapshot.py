@@ -0,0 +1,103 @@
+import unittest, threading, queue
+from gridable import Grid, FlatStorage, TiledStorage
+from gridable.dense import numpy
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid()
+        self.grid[1][1] = 1
+        self.grid[2][1] = 2
+
+    def test_unchanged_by_writes(self):
+        snapshot = self.grid.snapshot()
+        self.grid[1][1] = 3
+        self.grid[3][1] = 4
+        del self.grid[2][1]
+
+        self.assertEqual(str(snapshot), "[[1],[2]]")
+        self.assertEqual(str(self.grid), "[[3],[4]]")
+
+    def test_shares_unchanged_rows(self):
+        snapshot = self.grid.snapshot()
+        self.grid[1][1] = 3
+
+        self.assertIs(snapshot._storage._root[2], self.grid._storage._root[2])
+        self.assertIsNot(snapshot._storage._root[1], self.grid._storage._root[1])
+
+    def test_successive_snapshots(self):
+        first = self.grid.snapshot()
+        self.grid[1][2] = 5
+        second = self.grid.snapshot()
+        self.grid[1][3] = 6
+
+        self.assertEqual(len(first[1]), 1)
+        self.assertEqual(len(second[1]), 2)
+        self.assertEqual(len(self.grid[1]), 3)
+
+    def test_read_without_lock(self):
+        snapshot = self.grid.snapshot()
+        self.grid._lock.acquire_write()
+        try:
+            out = queue.Queue()
+            threading.Thread(
+                target=lambda: out.put([cell.value() for cell in snapshot])
+            ).start()
+            self.assertEqual(out.get(timeout=1), [1, 2])
+        finally:
+            self.grid._lock.release_write()
+
+    def test_read_only(self):
+        snapshot = self.grid.snapshot()
+
+        with self.assertRaises(Exception):
+            snapshot[1][1] = 5
+        with self.assertRaises(Exception):
+            del snapshot[1]
+
+    def test_flat_storage(self):
+        grid = Grid(storage=FlatStorage())
+        grid[1][1] = 1
+        snapshot = grid.snapshot()
+        grid[1][2] = 2
+        del grid[1][1]
+
+        self.assertEqual(str(snapshot), "[[1]]")
+        self.assertEqual(str(grid), "[[2]]")
+
+    def test_typed_storage(self):
+        grid = Grid(dtype="int16")
+        grid[1] = [1, 2]
+        grid[2] = [3]
+        snapshot = grid.snapshot()
+        grid[1][0] = 5
+        grid[3][0] = 6
+        del grid[2][0]
+
+        self.assertEqual(str(snapshot), "[[1,2],[3]]")
+        self.assertEqual(str(grid), "[[5,2],[6]]")
+        self.assertTrue(grid._storage.shares_snapshots)
+
+        shared = grid.snapshot()
+        grid[3][1] = 7
+        self.assertIs(shared._storage._rows[(1,)], grid._storage._rows[(1,)])
+        self.assertIsNot(shared._storage._rows[(3,)], grid._storage._rows[(3,)])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_dense_regions(self):
+        self.grid.dense((5, 6), (0, 1))
+        self.grid[5][0] = 7
+        snapshot = self.grid.snapshot()
+        region = self.grid._storage._regions[0]
+        self.assertIs(snapshot._storage._regions[0].array, region.array)
+
+        array = region.array
+        self.grid[5][0] = 8
+        self.assertIs(region.array, array)
+        self.assertEqual(snapshot[5][0], 7)
+        self.assertEqual(self.grid[5][0], 8)
+
+    def test_shares_snapshots(self):
+        self.assertTrue(self.grid._storage.shares_snapshots)
+        self.assertFalse(FlatStorage().shares_snapshots)
+        self.assertFalse(TiledStorage().shares_snapshots)
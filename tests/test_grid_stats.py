@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+from gridable import Grid
+from gridable.stats import Histogram, Stats
+
+
+class TestStats(unittest.TestCase):
+    def test_disabled(self):
+        grid = Grid()
+        self.assertIsNone(grid.stats)
+
+    def test_counters(self):
+        grid = Grid(stats=True)
+        grid[1][2] = 3
+        grid.update({(1, 3): 4, (2, 0): 5})
+        grid[1][2].value()
+        del grid[2]
+
+        counters = grid.stats.snapshot()["counters"]
+        self.assertEqual(counters["storage.set"], 1)
+        self.assertEqual(counters["storage.update.items"], 2)
+        self.assertEqual(counters["storage.delete"], 1)
+        self.assertEqual(counters["lock.write"], 3)
+        self.assertEqual(counters["lock.read"], 1)
+
+        histograms = grid.stats.snapshot()["histograms"]
+        self.assertEqual(histograms["lock.write.hold"]["count"], 3)
+        self.assertEqual(histograms["storage.set"]["count"], 1)
+
+    def test_lock_wait(self):
+        grid = Grid(stats=True)
+        grid[1] = 1
+        acquired = threading.Event()
+
+        def writer():
+            grid._lock.acquire_write()
+            acquired.set()
+            time.sleep(0.05)
+            grid._lock.release_write()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        acquired.wait()
+        grid[1].value()
+        thread.join()
+
+        wait = grid.stats.snapshot()["histograms"]["lock.read.wait"]
+        self.assertGreaterEqual(wait["max"], 0.04)
+
+    def test_exporters(self):
+        exported = []
+        stats = Stats(exporters=[exported.append])
+        grid = Grid(stats=stats)
+        grid[0] = 1
+
+        self.assertIs(grid.stats, stats)
+        snapshot = stats.export()
+        self.assertEqual(exported, [snapshot])
+        stats.reset()
+        self.assertEqual(stats.snapshot()["counters"], {})
+
+    def test_histogram(self):
+        histogram = Histogram(scale=1)
+        for amount in range(1, 101):
+            histogram.observe(amount)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.maximum, 100)
+        self.assertEqual(histogram.quantile(0.5), 64)
+        self.assertEqual(histogram.quantile(1), 100)
@@ -0,0 +1,65 @@
+import unittest
+from gridable import Grid
+
+
+class TestStencil(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid()
+        self.grid[0][0] = 1
+        self.grid[0][1] = 2
+        self.grid[1][1] = 3
+        self.grid[2][2] = 4
+
+    def test_neighbors(self):
+        neighbors = list(self.grid[1][1].neighbors(include_empty=False))
+
+        self.assertEqual(
+            [cell.coordinates() for cell in neighbors],
+            [(0, 0), (0, 1), (1, 1), (2, 2)],
+        )
+        self.assertEqual(len(list(self.grid[1][1].neighbors())), 9)
+
+    def test_neighbors_manhattan(self):
+        neighbors = list(self.grid[1][1].neighbors(metric="manhattan"))
+
+        self.assertEqual(len(neighbors), 5)
+        self.assertEqual(
+            len(list(self.grid[1][1].neighbors(distance=2, metric="manhattan"))), 13
+        )
+
+    def test_neighbors_of(self):
+        neighbors = self.grid.neighbors_of(
+            [self.grid[0][0], (2, 2)], include_empty=False, values=True
+        )
+
+        self.assertEqual(neighbors[(0, 0)], [((0, 0), 1), ((0, 1), 2), ((1, 1), 3)])
+        self.assertEqual(neighbors[(2, 2)], [((1, 1), 3), ((2, 2), 4)])
+
+    def test_neighbors_of_cells(self):
+        neighbors = self.grid.neighbors_of([(0, 1)], include_empty=False)
+
+        self.assertEqual([cell.value() for cell in neighbors[(0, 1)]], [1, 2, 3])
+
+    def test_unknown_metric(self):
+        with self.assertRaises(Exception):
+            self.grid.neighbors_of([(0, 0)], metric="unknown")
+
+    def test_convolve(self):
+        out = self.grid.convolve([[0, 1, 0], [1, 1, 1], [0, 1, 0]])
+
+        self.assertEqual(out[0][0].value(), 3)
+        self.assertEqual(out[0][1].value(), 6)
+        self.assertEqual(out[1][1].value(), 5)
+        self.assertEqual(out[2][2].value(), 4)
+        self.assertEqual(len(list(out)), 4)
+
+    def test_convolve_include_empty(self):
+        out = self.grid.convolve({(0, 1): 1}, include_empty=True)
+
+        self.assertEqual(out[0][-1].value(), 1)
+        self.assertEqual(out[0][0].value(), 2)
+        self.assertEqual(out[0][1].value(), None)
+
+    def test_convolve_even_kernel(self):
+        with self.assertRaises(Exception):
+            self.grid.convolve([[1, 1], [1, 1]])
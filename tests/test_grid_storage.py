@@ -0,0 +1,110 @@
+import unittest
+from gridable import Grid, FlatStorage, NestedStorage, TiledStorage, TypedStorage
+
+
+class TestFlatStorage(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(storage=FlatStorage())
+
+    def test_three_dimensions(self):
+        self.grid[-10][-10][-10] = 5
+        self.grid[10][10][10] = 7
+
+        self.assertEqual(self.grid[-10][-10][-10].value(), 5)
+        self.assertEqual(self.grid[10][10][10].value(), 7)
+        self.assertEqual(self.grid[10][10][11].value(), None)
+
+    def test_partial_coordinates(self):
+        self.grid[6][1] = 3
+        self.grid[6][2] = 4
+        self.grid[7][1] = 5
+
+        self.assertEqual(len(self.grid), 2)
+        self.assertEqual(len(self.grid[6]), 2)
+        self.assertTrue(2 in self.grid[6])
+        self.assertTrue(5 in self.grid[7])
+        self.assertFalse(5 in self.grid[6])
+        self.assertEqual(str(self.grid), "[[3,4],[5]]")
+        self.assertEqual([cell.value() for cell in self.grid[6]], [3, 4])
+
+    def test_get_slice(self):
+        self.grid[0] = [1, 2, 3, 4, 5]
+
+        out = list(self.grid[0][::2])
+
+        self.assertEqual([cell.value() for cell in out], [1, 3, 5])
+
+    def test_delete_prunes(self):
+        self.grid[10][11][12] = 5
+        self.grid[9] = 4
+
+        del self.grid[10][11][12]
+
+        self.assertEqual(len(self.grid), 1)
+        self.assertEqual(self.grid[10], None)
+        self.assertEqual([cell.coordinates() for cell in self.grid], [(9,)])
+        self.assertFalse(self.grid._storage.is_node((10,)))
+
+    def test_replace_nested(self):
+        self.grid[5][1] = 1
+        self.grid[5][2] = 2
+        self.grid[5] = 3
+
+        self.assertEqual(self.grid[5].value(), 3)
+        self.assertEqual([cell.coordinates() for cell in self.grid], [(5,)])
+
+    def test_error_when_not_subscriptable(self):
+        self.grid[10] = 5
+
+        with self.assertRaises(Exception):
+            self.grid[10][1] = 4
+
+    def test_matches_nested_storage(self):
+        nested = Grid(storage=NestedStorage())
+        for grid in (self.grid, nested):
+            grid[1][2] = 3
+            grid[2] = [4, 5]
+            grid[3][1][0] = 6
+            del grid[2][0]
+
+        self.assertEqual(str(self.grid), str(nested))
+        self.assertEqual(
+            [(cell.coordinates(), cell.value()) for cell in self.grid],
+            [(cell.coordinates(), cell.value()) for cell in nested],
+        )
+
+
+class TestNoneValues(unittest.TestCase):
+    def test_iteration_matches_length(self):
+        storages = (
+            NestedStorage(),
+            FlatStorage(),
+            TypedStorage("int8"),
+            TiledStorage(tile_size=2),
+        )
+        for storage in storages:
+            grid = Grid(storage=storage)
+            grid[0] = [1, None, 3]
+            grid[1] = None
+
+            self.assertEqual(len(grid[0]), 3)
+            self.assertEqual(
+                [(cell.coordinates(), cell.value()) for cell in grid[0]],
+                [((0, 0), 1), ((0, 1), None), ((0, 2), 3)],
+            )
+            self.assertEqual(len(list(grid)), 4)
+            self.assertEqual(list(grid[1]), [])
+            self.assertEqual(list(grid[0][0]), [grid[0][0]])
+            self.assertEqual(grid.sum(), 4)
+
+    def test_spilled_tiles(self):
+        storage = TiledStorage(tile_size=1, memory=300)
+        grid = Grid(storage=storage)
+        for x in range(10):
+            grid[x] = [x, None]
+
+        self.assertTrue(storage._spilled)
+        self.assertEqual(len(grid), 10)
+        self.assertEqual(len(list(grid)), 20)
+        self.assertEqual(grid[0][1].value(), None)
+        self.assertEqual(len(grid[0]), 2)
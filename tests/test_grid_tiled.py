@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from gridable import Grid, TiledStorage
+
+
+class TestTiledStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = TiledStorage(
+            tile_size=10, memory=2000, directory=self.directory.name
+        )
+        self.grid = Grid(storage=self.storage)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_values(self):
+        self.grid[5][1] = 3
+        self.grid[5][2] = 4
+        self.grid[17] = "value"
+
+        self.assertEqual(self.grid[5][2].value(), 4)
+        self.assertEqual(self.grid[17].value(), "value")
+        self.assertEqual(len(self.grid), 2)
+        self.assertEqual(str(self.grid), "[[3,4],value]")
+
+    def test_spill_and_reload(self):
+        self.grid.update(((x, y), x * 10 + y) for x in range(50) for y in range(10))
+
+        self.assertLessEqual(len(self.storage._tiles), 2)
+        self.assertTrue(os.listdir(self.directory.name))
+        self.assertEqual(self.grid[3][4].value(), 34)
+        self.assertEqual(self.grid[49][9].value(), 499)
+        self.assertEqual(len(list(self.grid)), 500)
+        self.assertEqual(self.grid[0].sum(), sum(range(10)))
+
+    def test_modify_spilled(self):
+        self.grid.update(((x, y), 1) for x in range(50) for y in range(10))
+        self.grid[2][3] = 5
+        del self.grid[3]
+        self.grid[45][0] = 7
+
+        self.assertEqual(self.grid[2][3].value(), 5)
+        self.assertIsNone(self.grid[3][0].value())
+        self.assertEqual(self.grid[45][0].value(), 7)
+        self.assertEqual(len(list(self.grid)), 490)
+
+    def test_delete_tile(self):
+        self.grid.update(((x, 0), 1) for x in range(50))
+        for x in range(10):
+            del self.grid[x]
+
+        self.assertNotIn(0, self.storage._counts)
+        self.assertNotIn("0.tile", os.listdir(self.directory.name))
+        self.assertEqual(len(self.grid), 40)
+
+    def test_integer_coordinates(self):
+        with self.assertRaises(Exception):
+            self.grid["a"] = 1
@@ -0,0 +1,173 @@
+import threading
+import unittest
+from gridable import Grid, FlatStorage, TiledStorage
+from gridable.dense import numpy
+
+
+class TestGridTransaction(unittest.TestCase):
+    def test_commit(self):
+        grid = Grid(journal=True)
+        grid[0][0] = "unit"
+        grid[3][3] = 9
+
+        with grid.transaction() as transaction:
+            transaction[0][1] = transaction[0][0].value()
+            del transaction[0][0]
+            transaction[2] = [1, 2]
+            transaction.set((4, 4), 16)
+            transaction.update({(5, 5): 25})
+
+            self.assertEqual(grid[0][0], "unit")
+            self.assertIsNone(grid[0][1].value())
+            self.assertIsNone(transaction[0][0].value())
+            self.assertEqual(transaction[2][1].value(), 2)
+            self.assertIsNone(transaction[2].value())
+            self.assertIsNone(transaction[3].value())
+            self.assertEqual(grid.version, 2)
+
+        self.assertIsNone(grid[0][0].value())
+        self.assertEqual(grid[0][1], "unit")
+        self.assertEqual(grid[2][1], 2)
+        self.assertEqual(grid[4][4], 16)
+        self.assertEqual(grid[5][5], 25)
+        self.assertEqual(grid.version, 8)
+
+        with self.assertRaises(Exception):
+            transaction[6] = 1
+
+    def test_rollback(self):
+        grid = Grid(index=True)
+        grid[0][0] = 1
+
+        with self.assertRaises(ValueError):
+            with grid.transaction() as transaction:
+                transaction[0][0] = 2
+                raise ValueError()
+        self.assertEqual(grid[0][0], 1)
+
+        with self.assertRaises(KeyError):
+            with grid.transaction() as transaction:
+                transaction[0][0] = 3
+                transaction[0][1] = 4
+                transaction[7][1] = 5
+                del transaction[8]
+        self.assertEqual(grid[0][0], 1)
+        self.assertIsNone(grid[0][1].value())
+        self.assertIsNone(grid[7][1].value())
+        self.assertEqual(
+            [cell.coordinates() for cell in grid.query([(0, 10), (0, 10)])], [(0, 0)]
+        )
+
+        transaction = grid.transaction()
+        transaction[0][0] = 5
+        transaction.rollback()
+        self.assertEqual(grid[0][0], 1)
+
+    def test_rollback_restores_rows(self):
+        grid = Grid(journal=True)
+        grid[0] = [1, None, 3]
+        grid[1] = 5
+        grid[2][0] = None
+        received = []
+        grid.subscribe(received.extend)
+        version = grid.version
+
+        with self.assertRaises(KeyError):
+            with grid.transaction() as transaction:
+                del transaction[0][0]
+                transaction[0][0] = 7
+                transaction[0][5] = 9
+                transaction[1] = 4
+                del transaction[2]
+                transaction[3] = 1
+                del transaction[8]
+
+        self.assertEqual(str(grid), "[[1,None,3],5,[None]]")
+        self.assertEqual(len(grid[0]), 3)
+        self.assertEqual(grid.version, version)
+        self.assertEqual(received, [])
+
+        with grid.transaction() as transaction:
+            transaction[0][1] = 2
+            transaction[3] = 4
+        self.assertEqual(received, [(version + 1, (0, 1), 2), (version + 2, (3,), 4)])
+
+    def test_rollback_keeps_order(self):
+        for grid in (
+            Grid(),
+            Grid(storage=FlatStorage()),
+            Grid(dtype="int"),
+            Grid(storage=TiledStorage(tile_size=2)),
+        ):
+            grid[0] = [1, None]
+            grid[1] = [2]
+            grid[2] = [3]
+
+            with self.assertRaises(KeyError):
+                with grid.transaction() as transaction:
+                    del transaction[1]
+                    transaction[2][1] = 4
+                    del transaction[8]
+
+            self.assertEqual(str(grid), "[[1,None],[2],[3]]")
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_rollback_dense(self):
+        grid = Grid()
+        grid.dense((0, 1), (0, 1), dtype=int)
+        grid[0][1] = 5
+        grid[4] = 6
+        before = str(grid)
+
+        with self.assertRaises(Exception):
+            with grid.transaction() as transaction:
+                transaction[0][1] = 7
+                transaction[1][0] = 8
+                transaction[4] = 9
+                transaction[0][0][0] = 1
+
+        self.assertEqual(str(grid), before)
+        self.assertEqual(grid[0][1], 5)
+
+    def test_optimistic(self):
+        grid = Grid()
+        grid[0] = 10
+        grid[1] = 0
+
+        with grid.transaction(optimistic=True) as transaction:
+            transaction[1] = transaction[0].value()
+            transaction[0] = 0
+        self.assertEqual((grid[0].value(), grid[1].value()), (0, 10))
+
+        with self.assertRaises(Exception):
+            with grid.transaction(optimistic=True) as transaction:
+                transaction[0] = transaction[1].value() + 1
+                grid[1] = 20
+        self.assertEqual((grid[0].value(), grid[1].value()), (0, 20))
+
+        with grid.transaction() as transaction:
+            transaction[0] = transaction[1].value() + 1
+            grid[1] = 30
+        self.assertEqual(grid[0], 21)
+
+    def test_readers(self):
+        grid = Grid()
+        grid[0] = 1
+        results = []
+
+        with grid.transaction() as transaction:
+            transaction[0] = 2
+            reader = threading.Thread(target=lambda: results.append(grid[0].value()))
+            reader.start()
+            reader.join(5)
+
+        self.assertEqual(results, [1])
+        self.assertEqual(grid[0], 2)
+
+    def test_snapshot(self):
+        with self.assertRaises(Exception):
+            Grid().snapshot().transaction()
+
+
+if __name__ == "__main__":
+    unittest.main()
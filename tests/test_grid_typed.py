@@ -0,0 +1,146 @@
+import sys
+import threading
+import unittest
+from gridable import Grid, TypedStorage
+from gridable.dense import numpy
+
+
+class TestTypedStorage(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(dtype="int8")
+
+    def test_values(self):
+        self.grid[5][2] = 3
+        self.grid[5][0] = 1
+        self.grid[6] = [7, 8, 9]
+
+        self.assertEqual(self.grid[5][2].value(), 3)
+        self.assertIsNone(self.grid[5][1].value())
+        self.assertEqual(len(self.grid[5]), 2)
+        self.assertEqual(str(self.grid), "[[3,1],[7,8,9]]")
+        self.assertEqual([cell.value() for cell in self.grid[6][0:]], [7, 8, 9])
+        self.assertEqual(
+            [cell.coordinates() for cell in self.grid[5]], [(5, 2), (5, 0)]
+        )
+
+    def test_rows(self):
+        self.grid[1] = list(range(10))
+        row = self.grid._storage._rows[(1,)]
+
+        self.assertEqual(row.values.typecode, "b")
+        self.assertEqual(list(row.indices), list(range(10)))
+
+    def test_none_and_delete(self):
+        self.grid[1] = [1, 2, 3, 4]
+        self.grid[1][1] = None
+        del self.grid[1][2]
+
+        self.assertEqual(len(self.grid[1]), 3)
+        self.assertEqual(list(self.grid._storage._rows[(1,)].states), [1, 2, 0, 1])
+
+        del self.grid[1][0]
+        del self.grid[1][1]
+        self.assertEqual(list(self.grid._storage._rows[(1,)].indices), [3])
+        self.grid[1][0] = 5
+        self.assertEqual(self.grid._storage.keys((1,)), [3, 0])
+        del self.grid[1][3]
+        del self.grid[1][0]
+        self.assertEqual(len(self.grid), 0)
+        self.assertFalse(self.grid._storage.is_node((1,)))
+
+    def test_parity(self):
+        for grid in (Grid(), Grid(dtype="int8")):
+            grid[3] = [1, 2, None]
+            grid[0] = 5
+            grid[2][1] = 7
+            grid[2][0] = 6
+            grid[9][9] = 9
+            grid[9] = 4
+            grid[0] = None
+            grid[0][2] = 8
+            del grid[2][1]
+            grid[2][1] = 1
+            if isinstance(grid._storage, TypedStorage):
+                with self.assertRaises(OverflowError):
+                    grid[4][0] = 300
+            with self.assertRaises(Exception):
+                grid[9][1] = 1
+
+            self.assertEqual(len(grid), 4)
+            self.assertEqual(len(grid[3]), 3)
+            self.assertEqual(str(grid), "[[1,2,None],[8],[6,1],4]")
+            self.assertEqual(
+                grid._storage.content(()),
+                {
+                    3: {0: 1, 1: 2, 2: None},
+                    0: {2: 8},
+                    2: {0: 6, 1: 1},
+                    9: 4,
+                },
+            )
+            self.assertEqual(
+                [cell.coordinates() for cell in grid if cell.value() is not None],
+                [(3, 0), (3, 1), (0, 2), (2, 0), (2, 1), (9,)],
+            )
+
+    def test_replace_nested(self):
+        self.grid[1][2][3] = 4
+        self.grid[1][2] = 5
+
+        self.assertEqual(self.grid[1][2].value(), 5)
+        self.assertEqual([cell.coordinates() for cell in self.grid], [(1, 2)])
+        with self.assertRaises(Exception):
+            self.grid[1][2][0] = 1
+
+    def test_types(self):
+        grid = Grid(dtype=float)
+        grid[0][0] = 1.5
+        self.assertEqual(grid[0][0].value(), 1.5)
+
+        with self.assertRaises(OverflowError):
+            self.grid[0][1] = 1000
+        self.assertEqual(len(self.grid), 0)
+        self.assertEqual(str(self.grid), "[]")
+        with self.assertRaises(Exception):
+            self.grid["a"] = 1
+        with self.assertRaises(Exception):
+            Grid(dtype="complex")
+        with self.assertRaises(Exception):
+            Grid(storage=TypedStorage("d"), dtype="d")
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_dtype(self):
+        grid = Grid(dtype=numpy.float32)
+        grid[0] = numpy.array([0.5, 1.5])
+        self.assertEqual(grid._storage._rows[(0,)].values.typecode, "f")
+        self.assertEqual(grid[0][1].value(), 1.5)
+
+    def test_wide_indices(self):
+        self.grid[0][1] = 1
+        self.grid[0][2**40] = 2
+
+        self.assertEqual(self.grid[0][2**40].value(), 2)
+        self.assertEqual(self.grid._storage._rows[(0,)].indices.typecode, "q")
+
+    def test_striped_writers(self):
+        grid = Grid(dtype="int", stripes=8)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+        def write(thread):
+            for index in range(thread, 1600, 8):
+                grid[index][0] = index
+                grid[index + 1600][0] = index
+                del grid[index + 1600]
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(len(grid), 1600)
+        self.assertEqual(sorted(cell.value() for cell in grid), list(range(1600)))
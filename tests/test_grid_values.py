@@ -0,0 +1,64 @@
+import unittest
+from gridable import Grid
+
+
+class TestValueIndex(unittest.TestCase):
+    def build(self, **kwargs):
+        grid = Grid(**kwargs)
+        grid[1][2] = "orc"
+        grid[1][4] = "elf"
+        grid[3][0] = "orc"
+        grid[3][1][5] = "orc"
+        grid[4] = ["a", "b"]
+        return grid
+
+    def test_find(self):
+        for value_index in (False, True):
+            grid = self.build(value_index=value_index)
+
+            self.assertEqual(
+                [cell.coordinates() for cell in grid.find("orc")],
+                [(1, 2), (3, 0), (3, 1, 5)],
+            )
+            self.assertEqual(
+                [cell.coordinates() for cell in grid[3].find("orc")],
+                [(3, 0), (3, 1, 5)],
+            )
+            self.assertEqual(grid.count("orc"), 3)
+            self.assertEqual(grid[1].count("orc"), 1)
+            self.assertEqual(grid.count("dwarf"), 0)
+
+    def test_contains(self):
+        for value_index in (False, True):
+            grid = self.build(value_index=value_index)
+
+            self.assertIn("orc", grid[1])
+            self.assertIn("orc", grid[3])
+            self.assertNotIn("elf", grid[3])
+            self.assertIn(2, grid[1])
+            self.assertNotIn("orc", grid)
+
+    def test_maintained(self):
+        grid = self.build(value_index=True)
+        grid[1][2] = "elf"
+        del grid[3]
+        grid[4][1] = "orc"
+
+        self.assertEqual([cell.coordinates() for cell in grid.find("orc")], [(4, 1)])
+        self.assertEqual(grid.count("elf"), 2)
+        self.assertNotIn("orc", grid[1])
+        self.assertIn("orc", grid[4])
+        self.assertNotIn("b", grid[4])
+
+    def test_existing_values(self):
+        grid = Grid(value_index=False)
+        grid[0][0] = 5
+        indexed = Grid(storage=grid._storage, value_index=True)
+        self.assertEqual(indexed.count(5), 1)
+
+    def test_count_root(self):
+        grid = self.build(value_index=True)
+        grid._values.locations = None
+        self.assertEqual(grid.count("orc"), 3)
+        del grid[1][2]
+        self.assertEqual(grid.count("orc"), 2)
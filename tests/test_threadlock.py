@@ -1,6 +1,6 @@
 import unittest, threading, queue, time
 
-from gridable import GridModifyLock, GridReadLock
+from gridable import Grid, GridLock, GridModifyLock, GridReadLock
 
 
 class TestThreadLock(unittest.TestCase):
@@ -105,3 +105,105 @@ class TestThreadLock(unittest.TestCase):
         self.q.put((self.do_safe_reading, ()))
         self.q.put((self.do_safe_writing, ()))
         self.q.join()
+
+
+class TestGridLock(unittest.TestCase):
+    def test_grids_lock_independently(self):
+        first = Grid()
+        second = Grid()
+        second[0] = 1
+
+        first._lock.acquire_write()
+        try:
+            out = queue.Queue()
+            threading.Thread(target=lambda: out.put(second[0].value())).start()
+            self.assertEqual(out.get(timeout=1), 1)
+        finally:
+            first._lock.release_write()
+
+    def test_stripes_allow_disjoint_writers(self):
+        lock = GridLock(stripes=4)
+        lock.acquire_write(0)
+        try:
+            acquired = threading.Event()
+
+            def write():
+                lock.acquire_write(1)
+                acquired.set()
+                lock.release_write()
+
+            threading.Thread(target=write).start()
+            self.assertTrue(acquired.wait(timeout=1))
+        finally:
+            lock.release_write()
+
+    def test_stripes_serialize_same_key(self):
+        lock = GridLock(stripes=4)
+        lock.acquire_write(0)
+        acquired = threading.Event()
+
+        def write():
+            lock.acquire_write(0)
+            acquired.set()
+            lock.release_write()
+
+        threading.Thread(target=write).start()
+        self.assertFalse(acquired.wait(timeout=0.1))
+        lock.release_write()
+        self.assertTrue(acquired.wait(timeout=1))
+
+    def test_waiting_writer_blocks_new_readers(self):
+        lock = GridLock()
+        lock.acquire_read()
+        written = threading.Event()
+        read = threading.Event()
+
+        def write():
+            lock.acquire_write()
+            written.set()
+            lock.release_write()
+
+        def read_after():
+            lock.acquire_read()
+            self.assertTrue(written.is_set())
+            read.set()
+            lock.release_read()
+
+        threading.Thread(target=write).start()
+        time.sleep(0.1)
+        threading.Thread(target=read_after).start()
+        time.sleep(0.1)
+        self.assertFalse(read.is_set())
+        lock.release_read()
+        self.assertTrue(read.wait(timeout=1))
+
+    def test_reentrant(self):
+        lock = GridLock()
+        lock.acquire_write()
+        lock.acquire_write()
+        lock.acquire_read()
+        lock.release_read()
+        lock.release_write()
+        lock.release_write()
+
+        self.assertEqual(lock._writers, 0)
+        self.assertEqual(lock._readers, 0)
+
+    def test_stripe_writer_cannot_widen(self):
+        lock = GridLock(stripes=4)
+        lock.acquire_write(0)
+        try:
+            lock.acquire_write(4)
+            lock.release_write()
+            with self.assertRaises(Exception):
+                lock.acquire_write()
+            with self.assertRaises(Exception):
+                lock.acquire_write(1)
+        finally:
+            lock.release_write()
+
+        lock.acquire_write()
+        lock.acquire_write(1)
+        lock.release_write()
+        lock.release_write()
+        self.assertEqual(lock._writers, 0)